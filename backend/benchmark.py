@@ -0,0 +1,358 @@
+"""
+Backend benchmark suite.
+For each network size, generates a synthetic CSV (synthetic_data.py), times
+NetworkDataProcessor processing and saving, loads the result into the
+FastAPI app and measures latency percentiles and throughput of every
+endpoint in-process through the ASGI test client. Results are written as
+JSON and can be compared against a saved baseline to catch regressions.
+
+    python benchmark.py --sizes 1000 10000 100000 --output bench.json
+    python benchmark.py --baseline bench.json --output bench_new.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from data_processor import NetworkDataProcessor
+from synthetic_data import generate_csv
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+DEFAULT_REQUESTS = 50
+# IDs per POST /batch request (edges, then diseases)
+BATCH_EDGES = 200
+BATCH_DISEASES = 100
+
+# Above this many edges the CSV is streamed with process_csv_chunked
+# instead of process_data + save_json, as data_processor.py --chunksize does
+DEFAULT_IN_MEMORY_MAX = 1_000_000
+CHUNKSIZE = 100_000
+
+# Relative slowdown of p50 latency (or processing time) reported as a regression
+DEFAULT_MAX_REGRESSION = 0.25
+# Slowdowns smaller than this are timer noise, whatever their relative size
+MIN_REGRESSION_MS = 1.0
+SCENARIOS = ('cold', 'warm')
+
+
+def max_rss_mb() -> Optional[float]:
+    """Peak resident memory of this process in MB, where the platform reports it."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def timed(func: Callable[[], Any]) -> float:
+    """Seconds taken by one call."""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def latency_summary(durations: List[float], sizes: List[int]) -> Dict[str, Any]:
+    """Percentiles (ms), throughput and response size of a series of requests."""
+    ms = np.array(durations) * 1000
+    return {
+        'requests': len(durations),
+        'p50_ms': round(float(np.percentile(ms, 50)), 3),
+        'p90_ms': round(float(np.percentile(ms, 90)), 3),
+        'p99_ms': round(float(np.percentile(ms, 99)), 3),
+        'mean_ms': round(float(ms.mean()), 3),
+        'max_ms': round(float(ms.max()), 3),
+        'throughput_rps': round(len(durations) / max(sum(durations), 1e-9), 1),
+        'response_bytes': int(np.median(sizes))
+    }
+
+
+def benchmark_cases(snap) -> Dict[str, Dict[str, Any]]:
+    """
+    Requests to time against a loaded snapshot, keyed by case name.
+
+    Query values (diseases, genes, pathways, keywords) are taken from the
+    data, preferring well-connected diseases and common terms so that every
+    request does real work. Every endpoint of main.py has a case except
+    POST /reload, which would replace the snapshot being measured.
+    """
+    index = snap.index
+    network = snap.network
+    by_degree = np.argsort(-index.degrees, kind='stable')
+    hub = network.node_ids[int(by_degree[0])]
+    # A disease outside the hub's neighborhood where possible, for path queries
+    far = network.node_ids[int(by_degree[min(len(by_degree) - 1, len(by_degree) // 2)])]
+    edge_id = network.edge(int(snap.edge_store.select()[0]), ('id',))['data']['id'] if index.num_edges else ''
+    gene = network.gene_terms[int(np.bincount(network.gene_ids).argmax())] if len(network.gene_ids) else 'GENE0'
+    pathway = (
+        network.pathway_terms[int(np.bincount(network.pathway_ids).argmax())]
+        if len(network.pathway_ids) else 'pathway'
+    )
+    keyword = hub.split('--')[0].split('_')[0][:6] or hub[:3]
+    seeds = ','.join(network.node_ids[int(pos)] for pos in by_degree[:3].tolist())
+    batch = {
+        'edges': [
+            network.edge(int(row), ('id',))['data']['id']
+            for row in snap.edge_store.select(limit=BATCH_EDGES).tolist()
+        ],
+        'diseases': [network.node_ids[int(pos)] for pos in by_degree[:BATCH_DISEASES].tolist()],
+        'include_edges': False
+    }
+
+    return {
+        'root': {'path': '/'},
+        'health': {'path': '/health'},
+        'metrics': {'path': '/metrics'},
+        'stats': {'path': '/stats'},
+        'histogram': {'path': '/stats/histogram', 'params': {'bins': 50}},
+        'search': {'path': '/search', 'params': {'keyword': keyword, 'limit': 20}},
+        'disease': {'path': f'/disease/{hub}'},
+        'edge': {'path': f'/edge/{edge_id}'},
+        'network': {'path': '/network', 'params': {'limit': 500}},
+        'network_slim': {'path': '/network', 'params': {'limit': 500, 'view': 'slim'}},
+        'network_all': {'path': '/network', 'params': {'view': 'slim'}, 'requests': 5},
+        'network_stream': {'path': '/network/stream', 'params': {'limit': 500}},
+        'layout': {'path': '/network/layout', 'params': {'limit': 500}, 'requests': 5},
+        # Default zoom level
+        'coarse': {'path': '/network/coarse'},
+        'batch': {'path': '/batch', 'method': 'POST', 'json': batch},
+        'gene': {'path': f'/gene/{gene}', 'params': {'limit': 100}},
+        'pathway': {'path': '/pathway', 'params': {'term': pathway, 'limit': 100}},
+        'centrality': {'path': '/analytics/centrality', 'params': {'metric': 'pagerank'}},
+        'components': {'path': '/analytics/components', 'params': {'limit': 10}},
+        'communities': {'path': '/analytics/communities', 'params': {'limit': 10}},
+        'neighborhood': {'path': f'/analytics/neighborhood/{hub}', 'params': {'k': 2, 'limit': 500}},
+        'path': {'path': '/path', 'params': {'from': hub, 'to': far, 'k': 3}},
+        'similar': {'path': f'/disease/{hub}/similar', 'params': {'limit': 20}},
+        'subgraph': {'path': '/subgraph', 'params': {'seeds': seeds, 'hops': 2, 'limit': 500}},
+    }
+
+
+def run_case(client, response_cache, case: Dict[str, Any], requests: int) -> Dict[str, Any]:
+    """
+    Time one request repeatedly.
+
+    'cold' clears the response cache before every request, so each one is
+    built from the indexes (memoized analytics, path trees and similarity
+    tables built by earlier requests are kept); 'warm' repeats the request
+    against a primed cache. A case may set 'method' (default GET) and a
+    'json' body.
+    """
+    count = case.get('requests', requests)
+    method = case.get('method', 'GET')
+    params = case.get('params')
+    body = case.get('json')
+    results: Dict[str, Any] = {}
+    for scenario in SCENARIOS:
+        durations, sizes = [], []
+        # One untimed request so one-off work (lazy indexes, first-use
+        # memoization) is not counted in either scenario
+        response = client.request(method, case['path'], params=params, json=body)
+        if response.status_code != 200:
+            return {'error': f"HTTP {response.status_code}: {response.text[:200]}"}
+        for _ in range(count):
+            if scenario == 'cold':
+                response_cache.clear()
+            start = time.perf_counter()
+            response = client.request(method, case['path'], params=params, json=body)
+            durations.append(time.perf_counter() - start)
+            sizes.append(len(response.content))
+        results[scenario] = latency_summary(durations, sizes)
+    return results
+
+
+def benchmark_size(
+    num_edges: int,
+    workdir: Path,
+    requests: int,
+    output_format: str,
+    in_memory_max: int,
+    seed: int,
+    endpoints: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """Generate, process, load and query one synthetic network."""
+    # Imported on first use, so --help does not load the app
+    from fastapi.testclient import TestClient
+    import main
+
+    csv_path = workdir / f"synthetic_{num_edges}.csv"
+    output_path = workdir / (
+        f"synthetic_{num_edges}" if output_format == 'columnar' else f"synthetic_{num_edges}.json"
+    )
+    result: Dict[str, Any] = {'edges': num_edges}
+
+    start = time.perf_counter()
+    result['nodes'] = generate_csv(str(csv_path), num_edges, seed=seed)
+    result['generate_s'] = round(time.perf_counter() - start, 3)
+
+    processor = NetworkDataProcessor(str(csv_path))
+    if num_edges > in_memory_max:
+        result['process_mode'] = 'chunked'
+        result['process_s'] = round(timed(lambda: processor.process_csv_chunked(
+            str(output_path), chunksize=CHUNKSIZE, output_format=output_format
+        )), 3)
+    else:
+        result['process_mode'] = 'in_memory'
+        network_data: Dict[str, Any] = {}
+        result['process_s'] = round(timed(lambda: network_data.update(processor.process_data())), 3)
+        save = processor.save_columnar if output_format == 'columnar' else processor.save_json
+        result['save_s'] = round(timed(lambda: save(str(output_path), network_data)), 3)
+        del network_data
+    result['similarity_s'] = round(timed(lambda: processor.save_similarity(str(output_path))), 3)
+    del processor
+
+    os.environ['NETWORK_DATA_PATH'] = str(output_path)
+    start = time.perf_counter()
+    # Entering the client runs the startup event, which loads the data
+    with TestClient(main.app) as client:
+        result['load_s'] = round(time.perf_counter() - start, 3)
+        cases = benchmark_cases(main.loaded_snapshot())
+        if endpoints:
+            cases = {name: case for name, case in cases.items() if name in endpoints}
+        result['endpoints'] = {}
+        for name, case in cases.items():
+            logger.info(f"{num_edges} edges: {name}")
+            result['endpoints'][name] = run_case(client, main.response_cache, case, requests)
+    result['max_rss_mb'] = max_rss_mb()
+    return result
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], max_regression: float) -> List[str]:
+    """
+    Regressions of results against a baseline run: p50 latencies and
+    processing times more than max_regression (and MIN_REGRESSION_MS)
+    slower, for sizes and endpoints present in both.
+    """
+    regressions = []
+    previous_runs = {run['edges']: run for run in baseline.get('runs', [])}
+    for run in results['runs']:
+        previous = previous_runs.get(run['edges'])
+        if previous is None:
+            continue
+        timings = [
+            (key, run.get(key), previous.get(key), 1000)
+            for key in ('process_s', 'save_s', 'similarity_s', 'load_s')
+        ]
+        for name, scenarios in run['endpoints'].items():
+            for scenario in SCENARIOS:
+                timings.append((
+                    f"{name} {scenario} p50_ms",
+                    scenarios.get(scenario, {}).get('p50_ms'),
+                    previous['endpoints'].get(name, {}).get(scenario, {}).get('p50_ms'),
+                    1
+                ))
+        for label, now, before, to_ms in timings:
+            if now is None or not before:
+                continue
+            if now > before * (1 + max_regression) and (now - before) * to_ms >= MIN_REGRESSION_MS:
+                regressions.append(
+                    f"{run['edges']} edges, {label}: {before:g} -> {now:g} (+{(now / before - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def print_summary(results: Dict[str, Any]) -> None:
+    """Human-readable table of the p50/p99 latencies."""
+    for run in results['runs']:
+        print(f"\n=== {run['edges']} edges, {run['nodes']} diseases ===")
+        print(
+            f"generate {run['generate_s']}s, process {run['process_s']}s ({run['process_mode']}), "
+            f"save {run.get('save_s', '-')}s, similarity {run['similarity_s']}s, load {run['load_s']}s"
+        )
+        print(f"{'endpoint':<16}{'cold p50':>10}{'cold p99':>10}{'warm p50':>10}{'warm p99':>10}{'warm rps':>10}")
+        for name, scenarios in run['endpoints'].items():
+            if 'error' in scenarios:
+                print(f"{name:<16}{scenarios['error']}")
+                continue
+            cold, warm = scenarios['cold'], scenarios['warm']
+            print(
+                f"{name:<16}{cold['p50_ms']:>10}{cold['p99_ms']:>10}"
+                f"{warm['p50_ms']:>10}{warm['p99_ms']:>10}{warm['throughput_rps']:>10}"
+            )
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark data processing and API endpoints on synthetic networks")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="Network sizes in edges (e.g. 1000 10000 100000 1000000 10000000)")
+    parser.add_argument('--requests', type=int, default=DEFAULT_REQUESTS,
+                        help="Timed requests per endpoint and scenario")
+    parser.add_argument('--endpoints', nargs='+', default=None,
+                        help="Only benchmark these cases (e.g. network search disease)")
+    parser.add_argument('--format', choices=['json', 'columnar'], default='json',
+                        help="Processed output format to benchmark")
+    parser.add_argument('--in-memory-max', type=int, default=DEFAULT_IN_MEMORY_MAX,
+                        help="Largest size processed in memory; larger sizes are streamed in chunks")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed for the synthetic data")
+    parser.add_argument('--workdir', default=None,
+                        help="Directory for generated CSVs and processed data (default: a temporary directory)")
+    parser.add_argument('--output', default='bench_results.json', help="JSON results file")
+    parser.add_argument('--baseline', default=None,
+                        help="Earlier results file; exit with status 1 if anything regressed against it")
+    parser.add_argument('--max-regression', type=float, default=DEFAULT_MAX_REGRESSION,
+                        help="Relative slowdown that counts as a regression (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+    if args.requests < 1:
+        parser.error("--requests must be at least 1")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args(argv)
+
+    results: Dict[str, Any] = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'args': vars(args)
+        },
+        'runs': []
+    }
+
+    with tempfile.TemporaryDirectory(prefix='network-bench-') as tmp:
+        workdir = Path(args.workdir or tmp)
+        workdir.mkdir(parents=True, exist_ok=True)
+        for num_edges in args.sizes:
+            results['runs'].append(benchmark_size(
+                num_edges, workdir, args.requests, args.format, args.in_memory_max, args.seed, args.endpoints
+            ))
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print_summary(results)
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.max_regression)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.baseline}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -7,14 +7,31 @@ a network JSON structure with nodes and edges.
 import pandas as pd
 import json
 import numpy as np
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+import argparse
 import logging
 import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+from network_format import JsonNetworkWriter, ColumnarNetworkWriter, Vocabulary, load_network, dataset_version
+from network_stats import NetworkStatistics
+from network_delta import NetworkDelta, PatchedNetwork, RowManifest, delta_path, row_manifest_path
+from network_similarity import SimilarityTable, DEFAULT_SIMILAR_K, similarity_path
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Rows per chunk in streaming mode
+DEFAULT_CHUNKSIZE = 50_000
+
+# CSV columns that determine an edge; a row is reprocessed in incremental
+# mode when any of them changes
+FINGERPRINT_COLUMNS = [
+    'pair1', 'pair2', 'weight', 'shared_genes', 'filtered_pathways',
+    'interpretability_gpt4o', 'reason_gpt4o'
+]
+
 
 class NetworkDataProcessor:
     """Process CSV data into network JSON format."""
@@ -30,6 +47,9 @@ class NetworkDataProcessor:
         self.df = None
         self.nodes = {}
         self.edges = []
+        # Interned gene and pathway names, filled by the columnar writers
+        self.gene_vocab = Vocabulary()
+        self.pathway_vocab = Vocabulary()
     
     def load_data(self) -> pd.DataFrame:
         """Load CSV data into DataFrame."""
@@ -88,6 +108,111 @@ class NetworkDataProcessor:
         items = str(field_value).split(';')
         return [item.strip() for item in items if item.strip()]
     
+    def parse_list_column(self, column: pd.Series) -> List[List[str]]:
+        """
+        Vectorized parse_list_field over a whole column.
+        
+        Args:
+            column: Column of semicolon-separated strings (may contain NaN)
+            
+        Returns:
+            List of parsed string lists, one per row
+        """
+        text = column.fillna('').astype(str)
+        text = text.where(text != 'nan', '')
+        # Drop whitespace around separators and empty items, then split once
+        text = (
+            text.str.replace(r'\s*;\s*', ';', regex=True)
+                .str.replace(r';{2,}', ';', regex=True)
+                .str.strip()
+                .str.strip(';')
+        )
+        return [items if items != [''] else [] for items in text.str.split(';').tolist()]
+    
+    def _text_column(self, chunk: pd.DataFrame, name: str, default: str) -> List[str]:
+        """Column values as strings, matching str(row.get(name, default))."""
+        if name not in chunk:
+            return [default] * len(chunk)
+        return chunk[name].fillna('nan').astype(str).tolist()
+    
+    def edge_id_column(self, chunk: pd.DataFrame) -> pd.Series:
+        """Vectorized create_edge_id: alphabetical order of the two pairs."""
+        pair1 = chunk['pair1']
+        pair2 = chunk['pair2']
+        swap = pair1 > pair2
+        return pair1.where(~swap, pair2).astype(str) + '__' + pair2.where(~swap, pair1).astype(str)
+    
+    def fingerprint_rows(self, chunk: pd.DataFrame) -> Dict[str, int]:
+        """
+        Content hash of each CSV row, keyed by edge ID.
+        
+        Args:
+            chunk: DataFrame with the CSV columns
+            
+        Returns:
+            Edge ID -> 64-bit hash of the row's FINGERPRINT_COLUMNS values
+        """
+        columns = [column for column in FINGERPRINT_COLUMNS if column in chunk]
+        hashes = pd.util.hash_pandas_object(chunk[columns].astype(str), index=False)
+        return dict(zip(self.edge_id_column(chunk).tolist(), hashes.tolist()))
+    
+    def build_edges(self, chunk: pd.DataFrame) -> List[Dict[str, Any]]:
+        """
+        Build edge dictionaries for a block of CSV rows using column operations.
+        
+        Args:
+            chunk: DataFrame (or read_csv chunk) with the CSV columns
+            
+        Returns:
+            List of edge data dictionaries, in row order
+        """
+        pair1 = chunk['pair1']
+        pair2 = chunk['pair2']
+        edge_ids = self.edge_id_column(chunk)
+        
+        if 'weight' in chunk:
+            weights = chunk['weight'].astype(float).tolist()
+        else:
+            weights = [0.0] * len(chunk)
+        
+        empty = pd.Series([''] * len(chunk), index=chunk.index)
+        shared_genes = self.parse_list_column(chunk.get('shared_genes', empty))
+        filtered_pathways = self.parse_list_column(chunk.get('filtered_pathways', empty))
+        interpretable = self._text_column(chunk, 'interpretability_gpt4o', 'NO')
+        reasons = self._text_column(chunk, 'reason_gpt4o', '')
+        
+        return [
+            {
+                'id': edge_id,
+                'source': source,
+                'target': target,
+                'weight': weight,
+                'shared_genes': genes,
+                'filtered_pathways': pathways,
+                'interpretable': label,
+                'reason_gpt4o': reason
+            }
+            for edge_id, source, target, weight, genes, pathways, label, reason in zip(
+                edge_ids.tolist(), pair1.tolist(), pair2.tolist(), weights,
+                shared_genes, filtered_pathways, interpretable, reasons
+            )
+        ]
+    
+    def build_nodes(self, node_ids: set) -> List[Dict[str, Any]]:
+        """
+        Build sorted node dictionaries with readable labels.
+        
+        Args:
+            node_ids: Set of disease pair IDs
+            
+        Returns:
+            List of node data dictionaries
+        """
+        return [
+            {'id': node_id, 'label': self.extract_disease_name(node_id)}
+            for node_id in sorted(node_ids)
+        ]
+    
     def process_data(self) -> Dict[str, Any]:
         """
         Process DataFrame into network JSON structure.
@@ -100,44 +225,63 @@ class NetworkDataProcessor:
         
         logger.info("Processing nodes and edges...")
         
-        # Track unique nodes
-        nodes_set = set()
-        edges_list = []
+        edges_list = self.build_edges(self.df)
+        nodes_list = self.build_nodes(set(self.df['pair1']) | set(self.df['pair2']))
         
-        for idx, row in self.df.iterrows():
-            pair1 = row['pair1']
-            pair2 = row['pair2']
-            
-            # Add nodes
-            nodes_set.add(pair1)
-            nodes_set.add(pair2)
-            
-            # Parse fields
-            shared_genes = self.parse_list_field(row.get('shared_genes', ''))
-            filtered_pathways = self.parse_list_field(row.get('filtered_pathways', ''))
-            
-            # Create edge
-            edge = {
-                'id': self.create_edge_id(pair1, pair2),
-                'source': pair1,
-                'target': pair2,
-                'weight': float(row.get('weight', 0)),
-                'shared_genes': shared_genes,
-                'filtered_pathways': filtered_pathways,
-                'interpretable': str(row.get('interpretability_gpt4o', 'NO')),
-                'reason_gpt4o': str(row.get('reason_gpt4o', ''))
-            }
+        logger.info(f"Created {len(nodes_list)} nodes and {len(edges_list)} edges")
+        
+        return {
+            'nodes': [{'data': node} for node in nodes_list],
+            'edges': [{'data': edge} for edge in edges_list]
+        }
+    
+    def process_shards(self, csv_paths: List[str], workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Process several shard CSVs in parallel into one network.
+        
+        Each shard is read and turned into edges in its own worker process.
+        Edges are then merged by canonical edge ID (see create_edge_id).
+        When a disease pair appears more than once, the row with the highest
+        weight wins; equal weights go to the shard listed first, then to the
+        earlier row. The result therefore depends only on the shard contents
+        and their order, not on which worker finishes first.
+        
+        Args:
+            csv_paths: Shard CSV files, in priority order
+            workers: Worker processes (default: one per CPU, at most one per shard)
             
-            edges_list.append(edge)
+        Returns:
+            Dictionary with 'nodes' and 'edges' keys, like process_data
+        """
+        workers = min(workers or os.cpu_count() or 1, len(csv_paths))
+        logger.info(f"Processing {len(csv_paths)} shards with {workers} workers")
+        
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # map yields results in shard order regardless of completion order
+                shard_edges = list(executor.map(build_shard_edges, csv_paths))
+        else:
+            shard_edges = [build_shard_edges(path) for path in csv_paths]
         
-        # Create nodes list
-        nodes_list = []
-        for node_id in sorted(nodes_set):
-            disease_label = self.extract_disease_name(node_id)
-            nodes_list.append({
-                'id': node_id,
-                'label': disease_label
-            })
+        merged: Dict[str, Dict[str, Any]] = {}
+        duplicates = 0
+        for path, edges in zip(csv_paths, shard_edges):
+            logger.info(f"{path}: {len(edges)} edges")
+            for edge in edges:
+                current = merged.get(edge['id'])
+                if current is None:
+                    merged[edge['id']] = edge
+                    continue
+                duplicates += 1
+                # Strictly greater, so ties keep the earlier shard and row
+                if edge['weight'] > current['weight']:
+                    merged[edge['id']] = edge
+        if duplicates:
+            logger.info(f"Merged {duplicates} duplicate disease pairs")
+        
+        edges_list = list(merged.values())
+        node_ids = {edge['source'] for edge in edges_list} | {edge['target'] for edge in edges_list}
+        nodes_list = self.build_nodes(node_ids)
         
         logger.info(f"Created {len(nodes_list)} nodes and {len(edges_list)} edges")
         
@@ -146,6 +290,142 @@ class NetworkDataProcessor:
             'edges': [{'data': edge} for edge in edges_list]
         }
     
+    def process_csv_chunked(
+        self,
+        output_path: str,
+        chunksize: int = DEFAULT_CHUNKSIZE,
+        output_format: str = 'json'
+    ) -> NetworkStatistics:
+        """
+        Stream the CSV through the pipeline in chunks, writing edges as they are built.
+        
+        Peak memory is bounded by one chunk plus the node set and a few
+        numeric values per edge (kept for statistics and, in columnar mode,
+        the numeric columns). Output is written under a temporary name and
+        moved into place when complete, so readers never see partial data.
+        
+        Args:
+            output_path: JSON file or columnar directory to write
+            chunksize: Number of CSV rows per chunk
+            output_format: 'json' or 'columnar'
+            
+        Returns:
+            Statistics over the processed network
+        """
+        logger.info(f"Streaming {self.csv_path} to {output_path} in chunks of {chunksize} rows")
+        
+        if output_format == 'columnar':
+            writer = self.columnar_writer(output_path)
+        else:
+            writer = JsonNetworkWriter(output_path)
+        
+        nodes_set = set()
+        weight_chunks = []
+        interpretability_counts: Dict[str, int] = {}
+        
+        for chunk in pd.read_csv(self.csv_path, encoding='utf-8', chunksize=chunksize):
+            edges = self.build_edges(chunk)
+            if not edges:
+                continue
+            writer.add_edges(edges)
+            
+            nodes_set.update(chunk['pair1'].unique())
+            nodes_set.update(chunk['pair2'].unique())
+            weight_chunks.append(np.array([edge['weight'] for edge in edges], dtype=np.float64))
+            for edge in edges:
+                label = edge['interpretable']
+                interpretability_counts[label] = interpretability_counts.get(label, 0) + 1
+            logger.info(f"Processed {writer.num_edges} edges")
+        
+        nodes_list = self.build_nodes(nodes_set)
+        writer.finish(nodes_list)
+        
+        logger.info(f"Created {len(nodes_list)} nodes and {writer.num_edges} edges")
+        
+        weights = np.concatenate(weight_chunks) if weight_chunks else np.empty(0)
+        return NetworkStatistics(weights, interpretability_counts, num_nodes=len(nodes_list))
+    
+    def process_incremental(self, output_path: str, output_format: str = 'json') -> Optional[NetworkDelta]:
+        """
+        Reprocess only CSV rows that were added, changed or removed since
+        the last incremental run, and patch the existing output.
+        
+        Rows are fingerprinted by edge ID and content hash and compared with
+        the row manifest saved next to the output. Unchanged edges are
+        copied from the existing output, so their gene and pathway lists
+        are not parsed again. A delta file the API server can apply is
+        written next to the output. Falls back to a full rebuild when
+        there is no manifest matching the current output, or when the CSV
+        has duplicate disease pairs.
+        
+        Args:
+            output_path: JSON file or columnar directory to patch
+            output_format: 'json' or 'columnar'
+            
+        Returns:
+            The applied delta, or None after a full rebuild
+        """
+        if self.df is None:
+            self.load_data()
+        
+        rows = self.fingerprint_rows(self.df)
+        manifest = RowManifest.load(row_manifest_path(output_path))
+        base_version = dataset_version(output_path) if os.path.exists(output_path) else None
+        
+        if len(rows) < len(self.df):
+            logger.warning("CSV has duplicate disease pairs; incremental mode needs unique pairs")
+            manifest = None
+        elif manifest is None or manifest.output_version != base_version:
+            logger.info("No row manifest for the current output")
+            manifest = None
+        
+        if manifest is None:
+            logger.info("Rebuilding the full network")
+            network_data = self.process_data()
+            if output_format == 'columnar':
+                self.save_columnar(output_path, network_data)
+            else:
+                self.save_json(output_path, network_data)
+            # A previous delta no longer describes the latest change
+            if delta_path(output_path).exists():
+                delta_path(output_path).unlink()
+            RowManifest(dataset_version(output_path), rows).save(row_manifest_path(output_path))
+            return None
+        
+        added, changed, removed = manifest.diff(rows)
+        logger.info(f"{len(added)} added, {len(changed)} changed, {len(removed)} removed edges")
+        if not (added or changed or removed):
+            return NetworkDelta(base_version, base_version, [], [], [])
+        
+        # Only new and changed rows go through edge building
+        upsert_ids = set(added)
+        upsert_ids.update(changed)
+        upserted = self.build_edges(self.df[self.edge_id_column(self.df).isin(upsert_ids)])
+        
+        base = load_network(output_path)
+        known_nodes = set(base.node_ids)
+        new_nodes = {edge['source'] for edge in upserted} | {edge['target'] for edge in upserted}
+        delta = NetworkDelta(
+            base_version, '', removed, upserted, self.build_nodes(new_nodes - known_nodes)
+        )
+        patched = PatchedNetwork(base, delta)
+        
+        if output_format == 'columnar':
+            writer = self.columnar_writer(output_path)
+        else:
+            writer = JsonNetworkWriter(output_path)
+        for start in range(0, patched.num_edges, DEFAULT_CHUNKSIZE):
+            positions = range(start, min(start + DEFAULT_CHUNKSIZE, patched.num_edges))
+            writer.add_edges([edge['data'] for edge in patched.edges(positions)])
+        writer.finish([node['data'] for node in patched.nodes])
+        logger.info(f"Patched {output_path}: {len(patched.nodes)} nodes and {patched.num_edges} edges")
+        
+        # The delta is written after the output, so its target version is known
+        delta.version = dataset_version(output_path)
+        delta.save(delta_path(output_path))
+        RowManifest(delta.version, rows).save(row_manifest_path(output_path))
+        return delta
+    
     def save_json(self, output_path: str, network_data: Dict[str, Any]) -> None:
         """
         Save network data to JSON file.
@@ -159,49 +439,218 @@ class NetworkDataProcessor:
             json.dump(network_data, f, indent=2, ensure_ascii=False)
         logger.info("Data saved successfully")
     
-    def get_statistics(self) -> Dict[str, Any]:
+    def save_columnar(self, output_dir: str, network_data: Dict[str, Any]) -> None:
+        """
+        Save network data as a memory-mappable columnar directory.
+        
+        Args:
+            output_dir: Directory to write (replaced atomically)
+            network_data: Network data dictionary
+        """
+        logger.info(f"Saving columnar network data to {output_dir}")
+        writer = self.columnar_writer(output_dir)
+        writer.add_edges([edge['data'] for edge in network_data['edges']])
+        writer.finish([node['data'] for node in network_data['nodes']])
+        logger.info("Data saved successfully")
+    
+    def columnar_writer(self, output_dir: str) -> ColumnarNetworkWriter:
+        """
+        Create a columnar writer that interns genes and pathways into this
+        processor's vocabularies.
+        
+        Edges are stored as CSR offset/id arrays over the vocabularies, so
+        each distinct gene or pathway name is written once.
+        
+        Args:
+            output_dir: Directory to write
+            
+        Returns:
+            ColumnarNetworkWriter sharing gene_vocab and pathway_vocab
+        """
+        return ColumnarNetworkWriter(output_dir, self.gene_vocab, self.pathway_vocab)
+    
+    def save_similarity(self, output_path: str, k: int = DEFAULT_SIMILAR_K) -> SimilarityTable:
+        """
+        Compute the top-k most similar diseases of every disease and save
+        them next to the output for the /disease/{id}/similar endpoint.
+        
+        Reads the written output back, so it works the same after every
+        processing mode and the table is tagged with the output's version.
+        
+        Args:
+            output_path: JSON file or columnar directory just written
+            k: Neighbors kept per disease
+            
+        Returns:
+            The saved table
+        """
+        logger.info(f"Computing top-{k} disease similarity")
+        table = SimilarityTable.compute(load_network(output_path), k=k, version=dataset_version(output_path))
+        table.save(similarity_path(output_path))
+        logger.info(f"Saved similarity table to {similarity_path(output_path)}")
+        return table
+    
+    def get_statistics(self, summary: Optional[NetworkStatistics] = None) -> Dict[str, Any]:
         """
         Get statistics about the network.
         
+        Args:
+            summary: Precomputed statistics (e.g. from process_csv_chunked);
+                computed from the loaded DataFrame when omitted
+        
         Returns:
             Dictionary with statistics
         """
+        if summary is None:
+            summary = self._summarize_dataframe()
+        
+        return {
+            'total_edges': summary.num_edges,
+            'weight_min': summary.weight_min,
+            'weight_max': summary.weight_max,
+            'weight_mean': summary.weight_mean,
+            'weight_median': summary.quantile(0.5),
+            'weight_q25': summary.quantile(0.25),
+            'weight_q75': summary.quantile(0.75),
+            'interpretability_yes_count': summary.interpretable_count('YES'),
+            'interpretability_no_count': summary.interpretable_count('NO')
+        }
+    
+    def _summarize_dataframe(self) -> NetworkStatistics:
+        """Compute statistics over the loaded DataFrame."""
         if self.df is None:
             self.load_data()
         
-        stats = {
-            'total_edges': len(self.df),
-            'weight_min': float(self.df['weight'].min()),
-            'weight_max': float(self.df['weight'].max()),
-            'weight_mean': float(self.df['weight'].mean()),
-            'weight_median': float(self.df['weight'].median()),
-            'weight_q25': float(self.df['weight'].quantile(0.25)),
-            'weight_q75': float(self.df['weight'].quantile(0.75)),
-            'interpretability_yes_count': len(self.df[self.df['interpretability_gpt4o'] == 'YES']),
-            'interpretability_no_count': len(self.df[self.df['interpretability_gpt4o'] == 'NO'])
-        }
+        # Same label normalization as process_data, so the counts match the API
+        labels = self.df['interpretability_gpt4o'].map(str)
+        return NetworkStatistics(
+            self.df['weight'].to_numpy(dtype=np.float64),
+            labels.value_counts().to_dict()
+        )
+    
+    def summarize_network(self, network_data: Dict[str, Any]) -> NetworkStatistics:
+        """Compute statistics over processed network data (e.g. from process_shards)."""
+        edges = [edge['data'] for edge in network_data['edges']]
+        interpretability_counts: Dict[str, int] = {}
+        for edge in edges:
+            label = edge['interpretable']
+            interpretability_counts[label] = interpretability_counts.get(label, 0) + 1
+        return NetworkStatistics(
+            np.array([edge['weight'] for edge in edges], dtype=np.float64),
+            interpretability_counts,
+            num_nodes=len(network_data['nodes'])
+        )
+
+
+def build_shard_edges(csv_path: str) -> List[Dict[str, Any]]:
+    """
+    Read one shard CSV and build its edges.
+    
+    Module-level so ProcessPoolExecutor can pickle it for worker processes.
+    
+    Args:
+        csv_path: Shard CSV file
         
-        return stats
+    Returns:
+        List of edge data dictionaries, in row order
+    """
+    processor = NetworkDataProcessor(csv_path)
+    return processor.build_edges(processor.load_data())
 
 
-def main():
-    """Main execution function."""
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Convert the pathway similarity CSV into network data")
     # Paths - CSV is in parent directory, output in backend/data
-    csv_path = '../pathway_network_result_with_gpt4o_evaluation.csv'
-    output_path = 'data/processed_network.json'
+    parser.add_argument('--csv', nargs='+', default=['../pathway_network_result_with_gpt4o_evaluation.csv'],
+                        help="Source CSV file, or several shard CSVs to merge (highest weight wins "
+                             "for duplicate disease pairs, then the shard listed first)")
+    parser.add_argument('--output', default=None,
+                        help="Output JSON file or columnar directory "
+                             "(default: data/processed_network.json or data/processed_network)")
+    parser.add_argument('--format', choices=['json', 'columnar'], default='json',
+                        help="Output format; 'columnar' writes memory-mappable NumPy columns "
+                             "that the API server loads without JSON parsing")
+    parser.add_argument('--chunksize', type=int, default=None,
+                        help=f"Stream the CSV in chunks of this many rows (e.g. {DEFAULT_CHUNKSIZE}) "
+                             "to bound memory on large inputs")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Reprocess only rows changed since the last incremental run and "
+                             "write a delta file the API server can apply")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Worker processes for multiple shard CSVs (default: one per CPU)")
+    parser.add_argument('--similar-k', type=int, default=DEFAULT_SIMILAR_K,
+                        help="Most similar diseases saved per disease for /disease/{id}/similar "
+                             "(0 skips the similarity table)")
+    args = parser.parse_args(argv)
+    if args.incremental and args.chunksize:
+        parser.error("--incremental cannot be combined with --chunksize")
+    if len(args.csv) > 1 and (args.chunksize or args.incremental):
+        parser.error("multiple --csv shards cannot be combined with --chunksize or --incremental")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.similar_k < 0:
+        parser.error("--similar-k must not be negative")
+    return args
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main execution function."""
+    args = parse_args(argv)
+    csv_paths = args.csv
+    output_path = args.output or (
+        'data/processed_network' if args.format == 'columnar' else 'data/processed_network.json'
+    )
     
     output_dir = os.path.dirname(output_path)
     if output_dir and not os.path.exists(output_dir):
         os.makedirs(output_dir)
         logger.info(f"Created directory: {output_dir}")
     
+    processor = NetworkDataProcessor(csv_paths[0])
+    
+    if args.chunksize:
+        # Streaming mode: edges go straight to disk, no sample output
+        summary = processor.process_csv_chunked(
+            output_path, chunksize=args.chunksize, output_format=args.format
+        )
+        if args.similar_k:
+            processor.save_similarity(output_path, args.similar_k)
+        stats = processor.get_statistics(summary)
+        print("\n=== Network Statistics ===")
+        for key, value in stats.items():
+            print(f"{key}: {value}")
+        print(f"\nTotal nodes: {summary.num_nodes}")
+        return
+    
+    if args.incremental:
+        delta = processor.process_incremental(output_path, output_format=args.format)
+        if args.similar_k:
+            processor.save_similarity(output_path, args.similar_k)
+        stats = processor.get_statistics()
+        print("\n=== Network Statistics ===")
+        for key, value in stats.items():
+            print(f"{key}: {value}")
+        if delta is not None:
+            print(f"\nDelta: {len(delta.upserted)} edges added or changed, {len(delta.removed)} removed")
+        return
+    
     # Process data
-    processor = NetworkDataProcessor(csv_path)
-    network_data = processor.process_data()
-    processor.save_json(output_path, network_data)
+    if len(csv_paths) > 1:
+        network_data = processor.process_shards(csv_paths, workers=args.workers)
+        summary = processor.summarize_network(network_data)
+    else:
+        network_data = processor.process_data()
+        summary = None
+    if args.format == 'columnar':
+        processor.save_columnar(output_path, network_data)
+    else:
+        processor.save_json(output_path, network_data)
+    if args.similar_k:
+        processor.save_similarity(output_path, args.similar_k)
     
     # Print statistics
-    stats = processor.get_statistics()
+    stats = processor.get_statistics(summary)
     print("\n=== Network Statistics ===")
     for key, value in stats.items():
         print(f"{key}: {value}")
@@ -0,0 +1,227 @@
+"""
+Columnar edge store for threshold and top-k network queries.
+Edges are held as NumPy arrays sorted by weight descending (ties by edge
+ID), so a minimum weight filter is a binary search, a limit is a slice and
+a pagination cursor is a (weight, edge ID) position in the order.
+"""
+
+import base64
+import json
+from bisect import bisect_right
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from network_format import canonical_edge_id
+from network_index import NetworkIndex
+
+
+def encode_cursor(weight: float, edge_id: str) -> str:
+    """Opaque pagination cursor for the edge at (weight, edge_id)."""
+    raw = json.dumps([weight, edge_id], ensure_ascii=False).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[float, str]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        weight, edge_id = json.loads(raw)
+        return float(weight), str(edge_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor '{cursor}'") from e
+
+
+class EdgeStore:
+    """Weight-sorted columnar view of the network edges."""
+
+    # Sorted columns, which server processes attached to a shared snapshot
+    # map instead of sorting again
+    SHARED_ARRAYS = ('order', 'weight', '_neg_weight', 'interp_code', 'interp_bits', 'source', 'target')
+
+    def __init__(self, index: NetworkIndex, arrays: Optional[Dict[str, np.ndarray]] = None):
+        """
+        Build columns from an already indexed network.
+
+        Args:
+            index: NetworkIndex over the loaded network data
+            arrays: Prebuilt SHARED_ARRAYS for this network (see shared_arrays)
+        """
+        self.index = index
+        self.num_nodes = index.num_nodes
+        network = index.network
+
+        weight = np.asarray(network.weight, dtype=np.float64)
+        # Each interpretability code owns one bit, so several labels can be
+        # OR-ed into a mask
+        self.interp_codes: Dict[str, int] = {
+            label: code for code, label in enumerate(network.interp_labels)
+        }
+        if len(self.interp_codes) > 63:
+            raise ValueError("Too many distinct interpretability labels for a bitmask")
+        self.node_ids = network.node_ids
+        if arrays is not None:
+            for name in self.SHARED_ARRAYS:
+                setattr(self, name, arrays[name])
+            return
+
+        codes = np.asarray(network.interp_code, dtype=np.int64)
+        source = np.asarray(network.source, dtype=np.int64)
+        target = np.asarray(network.target, dtype=np.int64)
+        self.order = np.argsort(-weight, kind='stable')
+        self._break_ties(weight[self.order], source, target)
+        self.weight = weight[self.order]
+        self._neg_weight = -self.weight
+        self.interp_code = codes[self.order]
+        self.interp_bits = np.left_shift(np.int64(1), self.interp_code)
+        self.source = source[self.order]
+        self.target = target[self.order]
+
+    def shared_arrays(self) -> Dict[str, np.ndarray]:
+        """The SHARED_ARRAYS, for attaching other processes to this store."""
+        return {name: getattr(self, name) for name in self.SHARED_ARRAYS}
+
+    def _break_ties(self, sorted_weight: np.ndarray, source: np.ndarray, target: np.ndarray) -> None:
+        """Order runs of equal weight by edge ID, independent of file order."""
+        boundaries = np.flatnonzero(np.concatenate([
+            [True], sorted_weight[1:] != sorted_weight[:-1], [True]
+        ]))
+        sizes = np.diff(boundaries)
+        runs = np.flatnonzero(sizes > 1)
+        for start, size in zip(boundaries[runs].tolist(), sizes[runs].tolist()):
+            tied = self.order[start:start + size]
+            ids = [
+                canonical_edge_id(self.node_ids[s], self.node_ids[t])
+                for s, t in zip(source[tied].tolist(), target[tied].tolist())
+            ]
+            self.order[start:start + size] = tied[sorted(range(len(tied)), key=ids.__getitem__)]
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def edge_id(self, row: int) -> str:
+        """Edge ID at a sorted row."""
+        return canonical_edge_id(self.node_ids[self.source[row]], self.node_ids[self.target[row]])
+
+    def cursor(self, row: int) -> str:
+        """Cursor that resumes after a sorted row."""
+        return encode_cursor(float(self.weight[row]), self.edge_id(row))
+
+    def cursor_start(self, cursor: str) -> int:
+        """
+        First row after a cursor position.
+
+        The position is located by value, so a cursor stays valid across
+        reloads even if its edge was removed.
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        weight, edge_id = decode_cursor(cursor)
+        lo = int(np.searchsorted(self._neg_weight, -weight, side='left'))
+        hi = int(np.searchsorted(self._neg_weight, -weight, side='right'))
+        tied_ids = [self.edge_id(row) for row in range(lo, hi)]
+        return lo + bisect_right(tied_ids, edge_id)
+
+    def interpretability_mask(self, labels: List[str]) -> int:
+        """Bitmask selecting the given interpretability labels."""
+        mask = 0
+        for label in labels:
+            code = self.interp_codes.get(label)
+            if code is not None:
+                mask |= 1 << code
+        return mask
+
+    def weight_cutoff(self, min_weight: Optional[float]) -> int:
+        """Number of leading (heaviest) edges with weight >= min_weight."""
+        if min_weight is None:
+            return len(self.order)
+        if np.isnan(min_weight):
+            # No weight compares >= nan
+            return 0
+        return int(np.searchsorted(self._neg_weight, -min_weight, side='right'))
+
+    def _matching_rows(self, start: int, end: int, mask: Optional[int]) -> np.ndarray:
+        if mask is None:
+            return np.arange(start, end)
+        return start + np.flatnonzero(self.interp_bits[start:end] & mask)
+
+    def select(
+        self,
+        min_weight: Optional[float] = None,
+        interpretability: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        start: int = 0
+    ) -> np.ndarray:
+        """
+        Select edges matching the filters.
+
+        Args:
+            min_weight: Minimum weight threshold
+            interpretability: Accepted interpretability labels (None or
+                empty for all)
+            limit: Keep only the heaviest `limit` matches
+            start: First sorted row to consider (see cursor_start)
+
+        Returns:
+            Row numbers into the sorted columns, heaviest first
+        """
+        end = self.weight_cutoff(min_weight)
+        mask = self.interpretability_mask(interpretability) if interpretability else None
+        rows = self._matching_rows(start, end, mask)
+
+        if limit is not None and limit > 0:
+            rows = rows[:limit]
+        return rows
+
+    def iter_select(
+        self,
+        min_weight: Optional[float] = None,
+        interpretability: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        start: int = 0,
+        batch_size: int = 1000
+    ) -> Iterator[np.ndarray]:
+        """
+        Like select, but yields matching rows in batches.
+
+        Only one batch of row numbers is held at a time, so a full scan
+        runs in memory independent of the number of edges.
+        """
+        end = self.weight_cutoff(min_weight)
+        mask = self.interpretability_mask(interpretability) if interpretability else None
+        remaining = limit if limit is not None and limit > 0 else None
+
+        for lo in range(start, end, batch_size):
+            rows = self._matching_rows(lo, min(lo + batch_size, end), mask)
+            if remaining is not None:
+                rows = rows[:remaining]
+                remaining -= len(rows)
+            if len(rows):
+                yield rows
+            if remaining == 0:
+                break
+
+    def edge_positions(self, rows: np.ndarray) -> np.ndarray:
+        """Map sorted row numbers back to positions in the edge list."""
+        return self.order[rows]
+
+    def node_positions(self, rows: np.ndarray) -> np.ndarray:
+        """Positions of nodes touched by the selected edges, in node list order."""
+        member = np.zeros(self.num_nodes, dtype=bool)
+        member[self.source[rows]] = True
+        member[self.target[rows]] = True
+        return np.flatnonzero(member)
+
+    def subnetwork(self, rows: np.ndarray) -> Tuple[List[dict], List[dict]]:
+        """Materialize (nodes, edges) lists for the selected rows."""
+        nodes = self.index.nodes
+        return (
+            [nodes[pos] for pos in self.node_positions(rows).tolist()],
+            self.index.network.edges(self.edge_positions(rows).tolist())
+        )
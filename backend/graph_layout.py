@@ -0,0 +1,335 @@
+"""
+Server-side node layouts for the network view.
+Layouts are computed with NumPy over the edge arrays of a filtered
+selection, so the browser can place nodes with Cytoscape's 'preset' layout
+instead of running a layout itself.
+
+- spectral: regularized spectral embedding, by subspace iteration over the
+  normalized adjacency (O(edges) per iteration)
+- force: Fruchterman-Reingold, started from the spectral embedding; above
+  FORCE_MAX_NODES nodes it falls back to the spectral layout
+
+Nodes keep the position they had in the previous layout of the same
+algorithm (matched by node ID), so changing a filter moves the picture
+instead of redrawing it, and a warm-started layout converges in fewer
+iterations. The result therefore depends on earlier layouts, not only on
+the selection.
+"""
+
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+LAYOUT_ALGORITHMS = ('force', 'spectral')
+
+# Model coordinates per node: the layout spans about LAYOUT_SCALE * sqrt(n)
+# pixels, which leaves room for the 50px node circles at zoom 1
+LAYOUT_SCALE = 120.0
+
+SPECTRAL_MAX_ITERATIONS = 300
+SPECTRAL_TOLERANCE = 1e-5
+# Uniform weight added between all node pairs, relative to the mean degree.
+# Keeps disconnected components from collapsing onto one point.
+SPECTRAL_REGULARIZATION = 0.1
+
+FORCE_ITERATIONS = 150
+# Fewer, smaller steps when most nodes already have a position
+FORCE_WARM_ITERATIONS = 50
+FORCE_TEMPERATURE = 0.1
+FORCE_WARM_TEMPERATURE = 0.02
+FORCE_GRAVITY = 0.05
+# Rows of the pairwise repulsion computed at once (bounds memory to
+# FORCE_BLOCK * num_nodes pairs)
+FORCE_BLOCK = 256
+# Above this many nodes the O(n^2) force layout takes too long per request,
+# and 'force' falls back to the spectral layout
+FORCE_MAX_NODES = 5000
+
+
+def edge_strength(weight: np.ndarray) -> np.ndarray:
+    """Attraction per edge: log-scaled weight in (0, 1], like the edge widths drawn by the client."""
+    strength = np.log1p(np.maximum(np.asarray(weight, dtype=np.float64), 0.0))
+    peak = strength.max() if len(strength) else 0.0
+    return strength / peak if peak > 0 else np.ones_like(strength)
+
+
+def normalize_positions(positions: np.ndarray) -> np.ndarray:
+    """Center positions and scale the larger extent to [-0.5, 0.5]."""
+    if len(positions) == 0:
+        return positions
+    positions = positions - positions.mean(axis=0)
+    extent = np.abs(positions).max()
+    return positions / (2 * extent) if extent > 0 else positions
+
+
+def align_positions(positions: np.ndarray, reference: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """
+    Rotate or reflect positions to best match reference on the masked nodes
+    (orthogonal Procrustes), so a recomputed layout keeps its orientation.
+    """
+    if mask.sum() < 2:
+        return positions
+    center = positions[mask].mean(axis=0)
+    u, _, vt = np.linalg.svd((positions[mask] - center).T @ (reference[mask] - reference[mask].mean(axis=0)))
+    return normalize_positions((positions - center) @ (u @ vt))
+
+
+def spectral_layout(
+    num_nodes: int,
+    source: np.ndarray,
+    target: np.ndarray,
+    strength: np.ndarray,
+    initial: Optional[np.ndarray] = None,
+    max_iterations: int = SPECTRAL_MAX_ITERATIONS,
+    tol: float = SPECTRAL_TOLERANCE
+) -> Tuple[np.ndarray, int]:
+    """
+    Two-dimensional spectral embedding of a weighted graph.
+
+    Finds the two leading non-trivial eigenvectors of the regularized
+    normalized adjacency D^-1/2 (W + tau/n) D^-1/2 by orthogonal iteration.
+    Each step is two bincounts over the edge arrays.
+
+    Args:
+        num_nodes: Number of nodes (edge endpoints index into 0..num_nodes-1)
+        source: Source node index per edge
+        target: Target node index per edge
+        strength: Non-negative weight per edge
+        initial: Starting coordinates (num_nodes x 2); random when omitted
+        max_iterations: Upper bound on iterations
+        tol: Stop when the subspace moves less than this
+
+    Returns:
+        (positions normalized to [-0.5, 0.5], iterations run)
+    """
+    if num_nodes < 3:
+        return normalize_positions(np.eye(num_nodes, 2)), 0
+
+    degree = (
+        np.bincount(source, weights=strength, minlength=num_nodes)
+        + np.bincount(target, weights=strength, minlength=num_nodes)
+    )
+    tau = SPECTRAL_REGULARIZATION * max(degree.mean(), 1e-12)
+    inv_sqrt = 1.0 / np.sqrt(degree + tau)
+    # Leading eigenvector, projected out of the iterate each step
+    trivial = np.sqrt(degree + tau)
+    trivial /= np.linalg.norm(trivial)
+
+    def multiply(vectors: np.ndarray) -> np.ndarray:
+        scaled = vectors * inv_sqrt[:, None]
+        out = np.empty_like(vectors)
+        for col in range(vectors.shape[1]):
+            x = scaled[:, col]
+            out[:, col] = (
+                np.bincount(source, weights=strength * x[target], minlength=num_nodes)
+                + np.bincount(target, weights=strength * x[source], minlength=num_nodes)
+                + tau / num_nodes * x.sum()
+            )
+        out *= inv_sqrt[:, None]
+        # Shift to make the operator positive semidefinite: eigenvalues in [0, 1]
+        return (out + vectors) / 2
+
+    if initial is None:
+        initial = np.random.default_rng(0).standard_normal((num_nodes, 2))
+    # Coordinates are D^-1/2 times the eigenvectors, so start from D^1/2 x
+    basis = np.asarray(initial, dtype=np.float64) / inv_sqrt[:, None]
+    basis -= np.outer(trivial, trivial @ basis)
+    basis, _ = np.linalg.qr(basis)
+
+    iterations = 0
+    for iterations in range(1, max_iterations + 1):
+        product = multiply(basis)
+        product -= np.outer(trivial, trivial @ product)
+        updated, r = np.linalg.qr(product)
+        # Keep column signs stable so a warm start does not mirror the layout
+        updated *= np.where(np.diag(r) < 0, -1.0, 1.0)
+        moved = np.abs(updated - basis).max()
+        basis = updated
+        if moved < tol:
+            break
+
+    return normalize_positions(basis * inv_sqrt[:, None]), iterations
+
+
+def force_directed_layout(
+    num_nodes: int,
+    source: np.ndarray,
+    target: np.ndarray,
+    strength: np.ndarray,
+    initial: np.ndarray,
+    iterations: int = FORCE_ITERATIONS,
+    temperature: float = FORCE_TEMPERATURE
+) -> np.ndarray:
+    """
+    Fruchterman-Reingold force-directed layout.
+
+    All node pairs repel with k^2/d and linked nodes attract with
+    strength * d^2/k, where k is the ideal distance in a unit square. A weak
+    pull towards the center keeps disconnected components together. Node
+    moves are capped by a temperature that cools linearly to zero.
+
+    Args:
+        num_nodes: Number of nodes
+        source: Source node index per edge
+        target: Target node index per edge
+        strength: Attraction per edge (see edge_strength)
+        initial: Starting coordinates (num_nodes x 2)
+        iterations: Number of iterations
+        temperature: Largest move per iteration, in unit-square coordinates
+
+    Returns:
+        Positions normalized to [-0.5, 0.5]
+    """
+    positions = np.array(initial, dtype=np.float64)
+    if num_nodes < 2:
+        return normalize_positions(positions)
+
+    k = np.sqrt(1.0 / num_nodes)
+    # Softening: nodes closer than 1% of k repel as if they were that far
+    min_dist2 = np.float32((0.01 * k) ** 2)
+    cooling = temperature / (iterations + 1)
+    for _ in range(iterations):
+        displacement = np.empty_like(positions)
+        # The O(n^2) repulsion runs in float32: half the memory traffic, and
+        # the error is far below one temperature step
+        single = positions.astype(np.float32)
+        squared = np.einsum('ij,ij->i', single, single)
+        for lo in range(0, num_nodes, FORCE_BLOCK):
+            block = single[lo:lo + FORCE_BLOCK]
+            # Pairwise squared distances and the force sums as matrix
+            # products: sum_j f_ij (p_i - p_j) = p_i sum_j f_ij - (F @ P)_i
+            force = block @ single.T
+            force *= -2
+            force += squared
+            force += squared[lo:lo + FORCE_BLOCK, None]
+            # Repulsion k^2/d along the unit vector delta/d
+            np.maximum(force, min_dist2, out=force)
+            np.divide(k * k, force, out=force)
+            force[np.arange(len(block)), np.arange(lo, lo + len(block))] = 0.0
+            displacement[lo:lo + FORCE_BLOCK] = block * force.sum(axis=1)[:, None] - force @ single
+
+        delta = positions[source] - positions[target]
+        dist = np.sqrt(np.einsum('ij,ij->i', delta, delta))
+        pull = delta * (strength * dist / k)[:, None]
+        for axis in range(2):
+            displacement[:, axis] += (
+                np.bincount(target, weights=pull[:, axis], minlength=num_nodes)
+                - np.bincount(source, weights=pull[:, axis], minlength=num_nodes)
+            )
+        displacement -= FORCE_GRAVITY * num_nodes * k * (positions - positions.mean(axis=0))
+
+        length = np.maximum(np.sqrt(np.einsum('ij,ij->i', displacement, displacement)), 1e-12)
+        positions += displacement * (np.minimum(length, temperature) / length)[:, None]
+        temperature -= cooling
+
+    return normalize_positions(positions)
+
+
+class LayoutEngine:
+    """
+    Computes layouts and remembers node positions per algorithm, by node ID,
+    to warm-start the next layout.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._positions: Dict[str, Dict[str, Tuple[float, float]]] = {
+            algorithm: {} for algorithm in LAYOUT_ALGORITHMS
+        }
+
+    def _initial_positions(
+        self,
+        algorithm: str,
+        node_ids: List[str],
+        source: np.ndarray,
+        target: np.ndarray
+    ) -> Tuple[Optional[np.ndarray], np.ndarray]:
+        """
+        Previous positions of known nodes; new nodes start at the mean of
+        their known neighbors, or at random.
+
+        Returns:
+            (initial coordinates or None if no node is known, mask of known nodes)
+        """
+        with self._lock:
+            previous = self._positions[algorithm]
+            known = [previous.get(node_id) for node_id in node_ids]
+        found = np.array([pos is not None for pos in known])
+        if not found.any():
+            return None, found
+
+        rng = np.random.default_rng(len(node_ids))
+        positions = rng.uniform(-0.5, 0.5, (len(node_ids), 2))
+        positions[found] = [pos for pos in known if pos is not None]
+        # Neighbor means from known endpoints, both edge directions
+        sums = np.zeros((len(node_ids), 2))
+        counts = np.zeros(len(node_ids))
+        for a, b in ((source, target), (target, source)):
+            usable = found[b]
+            np.add.at(sums, a[usable], positions[b[usable]])
+            counts += np.bincount(a[usable], minlength=len(node_ids))
+        placed = ~found & (counts > 0)
+        jitter = rng.normal(scale=0.01, size=(int(placed.sum()), 2))
+        positions[placed] = sums[placed] / counts[placed, None] + jitter
+        return positions, found
+
+    def layout(
+        self,
+        algorithm: str,
+        node_ids: List[str],
+        source: np.ndarray,
+        target: np.ndarray,
+        weight: np.ndarray
+    ) -> Tuple[np.ndarray, Dict[str, int]]:
+        """
+        Lay out a selection of the network.
+
+        Args:
+            algorithm: One of LAYOUT_ALGORITHMS
+            node_ids: ID per node
+            source: Source node index (into node_ids) per edge
+            target: Target node index (into node_ids) per edge
+            weight: Weight per edge
+
+        Returns:
+            (num_nodes x 2 model coordinates, info with the 'algorithm'
+            used, 'iterations' and 'warm_started' node count)
+
+        Raises:
+            ValueError: For an unknown algorithm
+        """
+        if algorithm not in LAYOUT_ALGORITHMS:
+            raise ValueError(
+                f"Unknown layout '{algorithm}'. Expected one of: {', '.join(LAYOUT_ALGORITHMS)}"
+            )
+
+        num_nodes = len(node_ids)
+        if algorithm == 'force' and num_nodes > FORCE_MAX_NODES:
+            algorithm = 'spectral'
+        source = np.asarray(source, dtype=np.int64)
+        target = np.asarray(target, dtype=np.int64)
+        strength = edge_strength(weight)
+        initial, known = self._initial_positions(algorithm, node_ids, source, target)
+        warm_started = int(known.sum())
+
+        if algorithm == 'spectral':
+            positions, iterations = spectral_layout(num_nodes, source, target, strength, initial)
+        else:
+            warm = warm_started > num_nodes // 2
+            if initial is None:
+                initial, _ = spectral_layout(num_nodes, source, target, strength)
+            iterations = FORCE_WARM_ITERATIONS if warm else FORCE_ITERATIONS
+            positions = force_directed_layout(
+                num_nodes, source, target, strength, initial,
+                iterations=iterations,
+                temperature=FORCE_WARM_TEMPERATURE if warm else FORCE_TEMPERATURE
+            )
+        if warm_started:
+            positions = align_positions(positions, initial, known)
+
+        with self._lock:
+            self._positions[algorithm].update(zip(node_ids, map(tuple, positions.tolist())))
+
+        scale = LAYOUT_SCALE * np.sqrt(max(num_nodes, 1))
+        return positions * scale, {'algorithm': algorithm, 'iterations': iterations, 'warm_started': warm_started}
@@ -3,14 +3,40 @@ FastAPI backend server for disease network visualization.
 Provides endpoints for network data retrieval with filtering capabilities.
 """
 
-from fastapi import FastAPI, Query, HTTPException
+from fastapi import FastAPI, Query, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Optional, List, Dict, Any
-import json
+from fastapi.responses import StreamingResponse, JSONResponse
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field
+from typing import Optional, List, Dict, Any, Callable, Hashable, Union
 import logging
+import os
+import threading
+import time
 from pathlib import Path
 import math
 
+import numpy as np
+
+from network_format import is_columnar, edge_field_set, EDGE_VIEWS
+from edge_store import EdgeStore
+from network_stats import DEFAULT_HISTOGRAM_BINS, HISTOGRAM_SCALES
+from term_index import TermIndex, QUERY_MODES
+from network_snapshot import NetworkSnapshot, DataWatcher
+from shared_snapshot import SharedSnapshotStore, DEFAULT_FRAGMENT_VIEWS
+from response_cache import (
+    ResponseCache, CachedResponse, make_etag, etag_matches, CACHE_CONTROL, DEFAULT_MAX_BYTES
+)
+from response_encoding import FragmentEncoder, dumps, encode_object, negotiate_encoding, compress_body
+from graph_layout import LayoutEngine, LAYOUT_ALGORITHMS
+from network_analytics import CENTRALITY_METRICS, MAX_HOPS, MAX_EGO_NODES, MAX_EGO_SEEDS
+from network_paths import PATH_METRICS, MAX_PATHS, DEFAULT_BUDGET_MS, MAX_BUDGET_MS
+from network_similarity import SIMILARITY_METRICS
+from network_coarsening import COARSEN_GROUPINGS, DEFAULT_MAX_SUPERNODES, MAX_SUPERNODES
+from request_metrics import (
+    MetricsRegistry, MetricsMiddleware, phase, profiling, record_cache, record_result_items
+)
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -27,38 +53,153 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Profile-File"],
+)
+
+# Per-endpoint latency, size, phase and cache metrics, served by /metrics.
+# Setting PROFILE_DIR enables the sampling profiler for requests sent with
+# an X-Profile header (which must equal PROFILE_TOKEN when that is set).
+metrics = MetricsRegistry()
+PROFILE_DIR = os.environ.get("PROFILE_DIR")
+app.add_middleware(
+    MetricsMiddleware,
+    registry=metrics,
+    profile_dir=Path(PROFILE_DIR) if PROFILE_DIR else None,
+    profile_token=os.environ.get("PROFILE_TOKEN"),
+    profile_interval_ms=float(os.environ.get("PROFILE_INTERVAL_MS", "2"))
 )
 
-# Global variable to store network data
-network_data: Dict[str, Any] = {"nodes": [], "edges": []}
-network_loaded = False
+# Processed data locations; the columnar directory is preferred when present.
+# NETWORK_DATA_PATH overrides both (a JSON file or a columnar directory).
+JSON_DATA_PATH = Path("data/processed_network.json")
+COLUMNAR_DATA_PATH = Path("data/processed_network")
+
+# Served data and all its indexes. Handlers read this reference once per
+# request; reloads replace it with a fully built snapshot.
+snapshot = NetworkSnapshot.empty()
+
+# Set by serve.py when several worker processes serve the same data: the
+# first process to load a dataset version publishes its snapshot there and
+# the others memory-map it instead of loading and indexing it themselves
+SHARED_SNAPSHOT_DIR = os.environ.get("SHARED_SNAPSHOT_DIR")
+shared_store = SharedSnapshotStore(
+    Path(SHARED_SNAPSHOT_DIR),
+    [view for view in os.environ.get("SHARED_FRAGMENT_VIEWS", ",".join(DEFAULT_FRAGMENT_VIEWS)).split(",") if view]
+) if SHARED_SNAPSHOT_DIR else None
+
+# Serialized responses of repeated queries, keyed by data version
+response_cache = ResponseCache(int(os.environ.get("RESPONSE_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)))
+
+# Node positions of the last layout per algorithm, kept across reloads so
+# new layouts warm-start from them
+layout_engine = LayoutEngine()
+
+# Serializes reloads; the last failure is reported by /health
+reload_lock = threading.Lock()
+last_reload_error: Optional[str] = None
+
+# Seconds between checks for new processed data (0 disables the watcher)
+RELOAD_INTERVAL = float(os.environ.get("NETWORK_RELOAD_INTERVAL", "0"))
+# Seconds between checks of the shared snapshot's current version, so a
+# reload handled by one worker reaches the others
+SHARED_POLL_INTERVAL = float(os.environ.get("SHARED_POLL_INTERVAL", "1"))
+# Required in the X-Reload-Token header of POST /reload when set
+RELOAD_TOKEN = os.environ.get("RELOAD_TOKEN")
+data_watcher: Optional[DataWatcher] = None
+shared_watcher: Optional[DataWatcher] = None
+
+
+def resolve_data_path() -> Path:
+    """Pick the processed network file or directory to load."""
+    override = os.environ.get("NETWORK_DATA_PATH")
+    if override:
+        return Path(override)
+    if is_columnar(COLUMNAR_DATA_PATH):
+        return COLUMNAR_DATA_PATH
+    return JSON_DATA_PATH
 
 
 def load_network_data():
-    """Load network data from JSON file."""
-    global network_data, network_loaded
+    """
+    Load network data (JSON or memory-mapped columnar) and swap it in.
+    
+    The new snapshot, including every index, is built before the served
+    reference is replaced, so requests never see a partial reload and
+    in-flight requests finish on the snapshot they started with.
+    """
+    global snapshot, last_reload_error
     
-    data_path = Path("data/processed_network.json")
+    data_path = resolve_data_path()
     
     if not data_path.exists():
         logger.error(f"Network data file not found: {data_path}")
+        last_reload_error = f"Network data file not found: {data_path}"
         return False
     
-    try:
-        with open(data_path, 'r', encoding='utf-8') as f:
-            network_data = json.load(f)
-        network_loaded = True
-        logger.info(f"Loaded {len(network_data['nodes'])} nodes and {len(network_data['edges'])} edges")
-        return True
-    except Exception as e:
-        logger.error(f"Error loading network data: {e}")
-        return False
+    with reload_lock:
+        start = time.perf_counter()
+        try:
+            if shared_store is not None:
+                new_snapshot = shared_store.load(data_path, previous=snapshot)
+            else:
+                new_snapshot = NetworkSnapshot.load(data_path, previous=snapshot)
+        except Exception as e:
+            logger.error(f"Error loading network data: {e}")
+            last_reload_error = str(e)
+            metrics.counter("network_loads_total", "Data loads and reloads", {"result": "failure"})
+            return False
+        snapshot = new_snapshot
+        last_reload_error = None
+        metrics.counter("network_loads_total", "Data loads and reloads", {"result": "success"})
+        metrics.observe(
+            "network_load_duration_seconds", "Time to load data and build every index",
+            time.perf_counter() - start
+        )
+        metrics.gauge("network_loaded_timestamp_seconds", "When the served data was loaded", new_snapshot.loaded_at)
+        metrics.gauge("network_nodes", "Nodes in the served data", new_snapshot.index.num_nodes)
+        metrics.gauge("network_edges", "Edges in the served data", new_snapshot.index.num_edges)
+    # Entries are keyed by version, so this only releases memory early
+    response_cache.clear()
+    logger.info(
+        f"Loaded {new_snapshot.index.num_nodes} nodes and {new_snapshot.index.num_edges} edges "
+        f"from {data_path} (version {new_snapshot.version})"
+    )
+    return True
+
+
+def loaded_snapshot() -> NetworkSnapshot:
+    """The served snapshot, or 503 if no data is loaded."""
+    current = snapshot
+    if not current.loaded:
+        raise HTTPException(status_code=503, detail="Network data not loaded")
+    return current
 
 
 @app.on_event("startup")
 async def startup_event():
-    """Load data on startup."""
+    """Load data on startup and start watching for new data if configured."""
+    global data_watcher, shared_watcher
     load_network_data()
+    if RELOAD_INTERVAL > 0:
+        data_watcher = DataWatcher(
+            resolve_data_path, lambda: snapshot.version, load_network_data, RELOAD_INTERVAL
+        )
+        data_watcher.start()
+        logger.info(f"Watching processed network data every {RELOAD_INTERVAL:g}s")
+    if shared_store is not None and SHARED_POLL_INTERVAL > 0:
+        shared_watcher = DataWatcher(
+            resolve_data_path, lambda: snapshot.version, load_network_data, SHARED_POLL_INTERVAL,
+            latest_version=shared_store.current_version
+        )
+        shared_watcher.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the data watchers."""
+    for watcher in (data_watcher, shared_watcher):
+        if watcher is not None:
+            watcher.stop()
 
 
 @app.get("/")
@@ -69,11 +210,27 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "/health": "Health check",
+            "/metrics": "Request latency, size and cache metrics (Prometheus text format)",
+            "/reload": "Reload processed data (POST)",
             "/network": "Get full network with optional filters",
+            "/network/stream": "Stream filtered network as NDJSON",
+            "/network/layout": "Get precomputed node positions for a filtered network",
+            "/network/coarse": "Get the network collapsed into supernodes at a zoom level",
             "/disease/{disease_id}": "Get edges for specific disease",
+            "/disease/{disease_id}/similar": "Get diseases with the most similar gene/pathway profiles",
             "/edge/{edge_id}": "Get specific edge details",
+            "/batch": "Get details of many edges and diseases at once (POST)",
             "/search": "Search diseases by keyword",
-            "/stats": "Get network statistics"
+            "/gene/{symbol}": "Get edges sharing one or more genes",
+            "/pathway": "Get edges sharing one or more pathway terms",
+            "/stats": "Get network statistics",
+            "/stats/histogram": "Get weight distribution histogram",
+            "/path": "Get the best paths between two diseases",
+            "/analytics/centrality": "Rank diseases by degree, PageRank or eigenvector centrality",
+            "/analytics/components": "Get connected components",
+            "/analytics/communities": "Get Louvain communities",
+            "/analytics/neighborhood/{disease_id}": "Get the k-hop neighborhood of a disease",
+            "/subgraph": "Get the ego-network of one or more diseases under a node budget"
         }
     }
 
@@ -81,89 +238,545 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
+    snap = snapshot
     return {
-        "status": "healthy" if network_loaded else "no_data",
-        "nodes_count": len(network_data.get('nodes', [])),
-        "edges_count": len(network_data.get('edges', []))
+        "status": "healthy" if snap.loaded else "no_data",
+        "nodes_count": snap.index.num_nodes,
+        "edges_count": snap.index.num_edges,
+        "data_version": snap.version,
+        "data_path": str(snap.path) if snap.path is not None else None,
+        "loaded_at": snap.loaded_at,
+        "last_reload_error": last_reload_error,
+        "shared_snapshot_dir": SHARED_SNAPSHOT_DIR,
+        "pid": os.getpid(),
+        "response_cache": response_cache.stats()
     }
 
 
+@app.get("/metrics")
+async def get_metrics():
+    """
+    Metrics in the Prometheus text exposition format.
+    
+    Per-endpoint request counts, latency and response size histograms,
+    time per phase (filter, serialize, compress) and response cache
+    outcomes, plus data load durations and the response cache counters.
+    
+    Each worker process keeps its own metrics; `worker_info` carries the
+    pid and served data version of the worker that answered.
+    """
+    cache = response_cache.stats()
+    body = metrics.render(extra=[
+        ("worker_info", "gauge", "Worker process answering this scrape", {
+            (("pid", str(os.getpid())), ("data_version", snapshot.version)): 1
+        }),
+        ("response_cache_hits_total", "counter", "Response cache hits", {(): cache["hits"]}),
+        ("response_cache_misses_total", "counter", "Response cache misses", {(): cache["misses"]}),
+        ("response_cache_evictions_total", "counter", "Response cache evictions", {(): cache["evictions"]}),
+        ("response_cache_entries", "gauge", "Cached responses", {(): cache["entries"]}),
+        ("response_cache_size_bytes", "gauge", "Summed size of cached bodies", {(): cache["size_bytes"]})
+    ])
+    return Response(content=body, media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.post("/reload")
+async def reload_network(
+    request: Request,
+    wait: bool = Query(True, description="Wait for the reload to finish")
+):
+    """
+    Reload processed network data without restarting.
+    
+    The new snapshot is built in a worker thread while requests keep being
+    served from the current one, then swapped in atomically.
+    
+    Args:
+        wait: Respond after the swap (200) or immediately (202)
+        
+    Returns:
+        Reload status and the version now being served
+    """
+    if RELOAD_TOKEN and request.headers.get("x-reload-token") != RELOAD_TOKEN:
+        raise HTTPException(status_code=403, detail="Invalid reload token")
+    if reload_lock.locked():
+        raise HTTPException(status_code=409, detail="Reload already in progress")
+    
+    if not wait:
+        threading.Thread(target=load_network_data, name="network-reload", daemon=True).start()
+        return JSONResponse(status_code=202, content={"status": "reloading"})
+    
+    if not await run_in_threadpool(load_network_data):
+        raise HTTPException(status_code=500, detail=f"Reload failed: {last_reload_error}")
+    snap = snapshot
+    return {
+        "status": "reloaded",
+        "data_version": snap.version,
+        "nodes_count": snap.index.num_nodes,
+        "edges_count": snap.index.num_edges
+    }
+
+
+def encoded_response(body: bytes, encoding: Optional[str], headers: Dict[str, str]) -> Response:
+    """JSON response from an already-encoded (and possibly compressed) body."""
+    headers = {**headers, "Vary": "Accept-Encoding"}
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def compressed_response(request: Request, body: bytes) -> Response:
+    """JSON response compressed if the client accepts it."""
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    with phase("compress"):
+        body, encoding = compress_body(body, encoding)
+    return encoded_response(body, encoding, {})
+
+
+def json_response(request: Request, payload: Any) -> Response:
+    """Serialize a payload with orjson, compressed if the client accepts it."""
+    with phase("serialize"):
+        body = dumps(payload)
+    return compressed_response(request, body)
+
+
+def cached_json_response(
+    request: Request,
+    snap: NetworkSnapshot,
+    key: Hashable,
+    build: Callable[[], Union[bytes, Response]],
+    weak: bool = False
+) -> Response:
+    """
+    Serve a JSON response through the response cache.
+    
+    The ETag depends only on the data version, the query key and the
+    negotiated content coding, so a matching If-None-Match is answered with
+    304 before anything is built. Bodies are cached already compressed.
+    
+    Profiled requests (see request_metrics) skip both shortcuts and always
+    build the body, so the profile shows the work a cache miss does.
+    
+    Args:
+        request: Incoming request (for If-None-Match and Accept-Encoding)
+        snap: Snapshot the body is built from (its version keys the cache)
+        key: Hashable query key; must cover every parameter echoed in the body
+        build: Builds the encoded JSON body on a cache miss; a body that
+            must not be cached (e.g. depends on a time budget) is returned
+            as a Response instead, which is sent as is, without an ETag
+        weak: Send a weak ETag, for bodies that may differ byte-wise (but
+            not in meaning) when rebuilt after an eviction
+        
+    Returns:
+        JSON response (or 304) with ETag and Cache-Control headers
+    """
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    etag = make_etag(snap.version, (key, encoding), weak=weak)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    profiled = profiling()
+    if not profiled and etag_matches(request.headers.get("if-none-match"), etag):
+        record_cache("not_modified")
+        return Response(status_code=304, headers={**headers, "Vary": "Accept-Encoding"})
+    
+    cache_key = (snap.version, key, encoding)
+    entry = None if profiled else response_cache.get(cache_key)
+    if entry is None:
+        record_cache("miss")
+        with phase("build"):
+            body = build()
+        if isinstance(body, Response):
+            return body
+        with phase("compress"):
+            body, applied = compress_body(body, encoding)
+        entry = CachedResponse(body=body, etag=etag, encoding=applied)
+        response_cache.put(cache_key, entry)
+    else:
+        record_cache("hit")
+    return encoded_response(entry.body, entry.encoding, headers)
+
+
+def parse_interpretability(interpretability: Optional[str]) -> Optional[List[str]]:
+    """
+    Parse comma-separated interpretability labels (e.g. "YES" or "YES,NO").
+    An empty value applies no filter.
+    """
+    if interpretability is None:
+        return None
+    labels = [label.strip().upper() for label in interpretability.split(',') if label.strip()]
+    return labels or None
+
+
+def check_min_weight(min_weight: Optional[float]) -> None:
+    """Reject a non-finite weight threshold (nan matches nothing and defeats the cache key)."""
+    if min_weight is not None and not math.isfinite(min_weight):
+        raise HTTPException(status_code=400, detail=f"min_weight must be a finite number, got '{min_weight}'")
+
+
+def parse_edge_fields(view: str, fields: Optional[str]) -> tuple:
+    """Resolve the view/fields parameters to a normalized edge field tuple."""
+    if fields is not None:
+        try:
+            return edge_field_set(field.strip() for field in fields.split(',') if field.strip())
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    edge_fields = EDGE_VIEWS.get(view.lower())
+    if edge_fields is None:
+        raise HTTPException(status_code=400, detail=f"Unknown view '{view}' (use full/slim)")
+    return edge_fields
+
+
+def parse_cursor(store: EdgeStore, cursor: Optional[str]) -> int:
+    """First sorted row to return for a pagination cursor."""
+    if not cursor:
+        return 0
+    try:
+        return store.cursor_start(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @app.get("/network")
 async def get_network(
+    request: Request,
     min_weight: Optional[float] = Query(None, description="Minimum edge weight threshold"),
-    interpretability: Optional[str] = Query(None, description="Filter by interpretability (YES/NO)"),
-    limit: Optional[int] = Query(None, description="Limit number of edges returned")
+    interpretability: Optional[str] = Query(None, description="Filter by interpretability (YES/NO, comma-separated for several)"),
+    limit: Optional[int] = Query(None, ge=1, description="Limit number of edges returned (page size when paginating)"),
+    cursor: Optional[str] = Query(None, description="Resume after the page that returned this next_cursor"),
+    view: str = Query("full", description="Edge fields to return (full/slim)"),
+    fields: Optional[str] = Query(None, description="Edge fields to return, comma-separated (overrides view)")
 ):
     """
     Get network data with optional filters.
     
+    Responses are cached per filter combination and carry an ETag, so
+    repeated queries are served from memory and revalidations return 304.
+    When `limit` cuts the result short, metadata.next_cursor pages on in
+    (weight descending, edge ID) order.
+    
     Args:
         min_weight: Minimum weight threshold for edges
         interpretability: Filter by GPT-4o interpretability assessment (YES/NO)
         limit: Maximum number of edges to return
+        cursor: next_cursor of the previous page
+        view: 'full' for every edge field, 'slim' for id/source/target/weight/interpretable
+        fields: Explicit edge fields (id, source and target are always included)
         
     Returns:
-        Network data with nodes and edges
+        Network data with nodes and edges, edges ordered by weight descending
     """
-    if not network_loaded:
-        raise HTTPException(status_code=503, detail="Network data not loaded")
+    check_min_weight(min_weight)
+    snap = loaded_snapshot()
     
-    # Start with all edges
-    filtered_edges = network_data['edges'].copy()
-    
-    # Apply weight filter
-    if min_weight is not None:
-        filtered_edges = [
-            edge for edge in filtered_edges
-            if edge['data']['weight'] >= min_weight
-        ]
-    
-    # Apply interpretability filter
-    if interpretability is not None:
-        interpretability_upper = interpretability.upper()
-        filtered_edges = [
-            edge for edge in filtered_edges
-            if edge['data'].get('interpretable', 'NO') == interpretability_upper
-        ]
-    
-    # Apply limit
-    if limit is not None and limit > 0:
-        # Sort by weight descending before limiting
-        filtered_edges = sorted(
-            filtered_edges,
-            key=lambda x: x['data']['weight'],
-            reverse=True
-        )[:limit]
-    
-    # Get unique node IDs from filtered edges
-    node_ids = set()
-    for edge in filtered_edges:
-        node_ids.add(edge['data']['source'])
-        node_ids.add(edge['data']['target'])
-    
-    # Filter nodes to only include those in filtered edges
-    filtered_nodes = [
-        node for node in network_data['nodes']
-        if node['data']['id'] in node_ids
-    ]
+    edge_fields = parse_edge_fields(view, fields)
+    start = parse_cursor(snap.edge_store, cursor)
+    page_size = limit if limit is not None and limit > 0 else None
     
-    return {
-        "nodes": filtered_nodes,
-        "edges": filtered_edges,
-        "metadata": {
-            "total_nodes": len(filtered_nodes),
-            "total_edges": len(filtered_edges),
-            "filters_applied": {
-                "min_weight": min_weight,
-                "interpretability": interpretability,
-                "limit": limit
+    def build() -> bytes:
+        with phase("filter"):
+            # Threshold is a binary search and limit a slice over the weight-sorted store;
+            # one extra row tells whether another page follows
+            rows = snap.edge_store.select(
+                min_weight=min_weight,
+                interpretability=parse_interpretability(interpretability),
+                limit=page_size + 1 if page_size is not None else None,
+                start=start
+            )
+            next_cursor = None
+            if page_size is not None and len(rows) > page_size:
+                rows = rows[:page_size]
+                next_cursor = snap.edge_store.cursor(int(rows[-1]))
+            node_positions = snap.edge_store.node_positions(rows)
+        record_result_items(len(rows))
+        
+        with phase("serialize"):
+            # Assembled from per-node/per-edge fragments encoded on first use
+            return encode_object([
+                ("nodes", snap.fragments.nodes(node_positions)),
+                ("edges", snap.fragments.edges(snap.edge_store.edge_positions(rows), edge_fields)),
+                ("metadata", dumps({
+                    "total_nodes": len(node_positions),
+                    "total_edges": len(rows),
+                    "edge_fields": edge_fields,
+                    "next_cursor": next_cursor,
+                    "filters_applied": {
+                        "min_weight": min_weight,
+                        "interpretability": interpretability,
+                        "limit": limit
+                    }
+                }))
+            ])
+    
+    # An uncached build serializes every selected edge; keep it off the event loop
+    return await run_in_threadpool(
+        cached_json_response, request, snap, ("network", min_weight, interpretability, limit, cursor, edge_fields), build
+    )
+
+
+def network_ndjson_lines(
+    store: EdgeStore,
+    encoder: FragmentEncoder,
+    min_weight: Optional[float],
+    interpretability: Optional[List[str]],
+    limit: Optional[int],
+    start: int,
+    edge_fields: tuple,
+    batch_size: int
+):
+    """
+    Yield a filtered network as NDJSON, one batch of lines at a time.
+    
+    Lines are Cytoscape elements ({"group": "nodes"|"edges", "data": ...}),
+    nodes first, followed by one {"group": "metadata", ...} line. The store
+    and encoder are passed in so a reload mid-stream cannot mix datasets.
+    """
+    selection = dict(min_weight=min_weight, interpretability=interpretability, limit=limit)
+    
+    # First pass: nodes touched by the selected edges
+    member = np.zeros(store.num_nodes, dtype=bool)
+    for rows in store.iter_select(**selection, start=start, batch_size=batch_size):
+        member[store.source[rows]] = True
+        member[store.target[rows]] = True
+    node_positions = np.flatnonzero(member).tolist()
+    for lo in range(0, len(node_positions), batch_size):
+        yield b''.join(
+            b'{"group":"nodes",' + encoder.node(pos)[1:] + b'\n'
+            for pos in node_positions[lo:lo + batch_size]
+        )
+    
+    # Second pass: edges, encoded without pinning fragments in memory
+    total_edges = 0
+    last_row = None
+    for rows in store.iter_select(**selection, start=start, batch_size=batch_size):
+        yield b''.join(
+            b'{"group":"edges",' + encoder.edge(pos, edge_fields, memoize=False)[1:] + b'\n'
+            for pos in store.edge_positions(rows).tolist()
+        )
+        total_edges += len(rows)
+        last_row = int(rows[-1])
+    
+    next_cursor = None
+    if limit is not None and limit > 0 and last_row is not None:
+        more = store.iter_select(min_weight, interpretability, limit=1, start=last_row + 1)
+        if next(more, None) is not None:
+            next_cursor = store.cursor(last_row)
+    yield dumps({
+        "group": "metadata",
+        "data": {
+            "total_nodes": len(node_positions),
+            "total_edges": total_edges,
+            "edge_fields": edge_fields,
+            "next_cursor": next_cursor
+        }
+    }) + b'\n'
+
+
+@app.get("/network/stream")
+async def stream_network(
+    min_weight: Optional[float] = Query(None, description="Minimum edge weight threshold"),
+    interpretability: Optional[str] = Query(None, description="Filter by interpretability (YES/NO, comma-separated for several)"),
+    limit: Optional[int] = Query(None, ge=1, description="Limit number of edges returned"),
+    cursor: Optional[str] = Query(None, description="Resume after this next_cursor"),
+    view: str = Query("full", description="Edge fields to return (full/slim)"),
+    fields: Optional[str] = Query(None, description="Edge fields to return, comma-separated (overrides view)"),
+    batch_size: int = Query(1000, ge=1, le=100000, description="Elements per streamed chunk")
+):
+    """
+    Stream network data as NDJSON.
+    
+    Takes the same filters as /network but sends elements in batches as
+    they are encoded, so exports of the full network run in bounded
+    server memory.
+    
+    Args:
+        min_weight: Minimum weight threshold for edges
+        interpretability: Filter by GPT-4o interpretability assessment (YES/NO)
+        limit: Maximum number of edges to return
+        cursor: next_cursor of a previous page or stream
+        view: 'full' or 'slim' edge fields
+        fields: Explicit edge fields
+        batch_size: Number of nodes or edges per chunk
+        
+    Returns:
+        application/x-ndjson stream of nodes, edges and a final metadata line
+    """
+    check_min_weight(min_weight)
+    snap = loaded_snapshot()
+    
+    edge_fields = parse_edge_fields(view, fields)
+    start = parse_cursor(snap.edge_store, cursor)
+    lines = network_ndjson_lines(
+        snap.edge_store, snap.fragments, min_weight, parse_interpretability(interpretability),
+        limit, start, edge_fields, batch_size
+    )
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
+
+@app.get("/network/layout")
+async def get_network_layout(
+    request: Request,
+    algorithm: str = Query("force", description=f"Layout algorithm ({'/'.join(LAYOUT_ALGORITHMS)})"),
+    min_weight: Optional[float] = Query(None, description="Minimum edge weight threshold"),
+    interpretability: Optional[str] = Query(None, description="Filter by interpretability (YES/NO, comma-separated for several)"),
+    limit: Optional[int] = Query(None, ge=1, description="Limit number of edges laid out")
+):
+    """
+    Get node coordinates for a filtered network.
+    
+    Takes the same filters as /network, so the client can place the
+    returned nodes with Cytoscape's 'preset' layout. Layouts are cached per
+    filter combination and algorithm; a new layout starts from the
+    positions of the previous one, so nodes stay where they were when the
+    filters change. Because of that, a layout rebuilt after a cache eviction
+    can differ slightly, so it is sent with a weak ETag. Force layouts of
+    more than FORCE_MAX_NODES nodes fall back to the spectral layout.
+    
+    Args:
+        algorithm: 'force' (force-directed) or 'spectral'
+        min_weight: Minimum weight threshold for edges
+        interpretability: Filter by GPT-4o interpretability assessment (YES/NO)
+        limit: Maximum number of edges to lay out
+        
+    Returns:
+        Map of node ID to {x, y} and layout metadata
+    """
+    check_min_weight(min_weight)
+    snap = loaded_snapshot()
+    
+    algorithm = algorithm.lower()
+    if algorithm not in LAYOUT_ALGORITHMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown algorithm '{algorithm}' (use {'/'.join(LAYOUT_ALGORITHMS)})"
+        )
+    
+    def build() -> bytes:
+        store = snap.edge_store
+        rows = store.select(
+            min_weight=min_weight,
+            interpretability=parse_interpretability(interpretability),
+            limit=limit if limit is not None and limit > 0 else None
+        )
+        node_positions = store.node_positions(rows)
+        # Endpoints renumbered into the selection (node_positions is sorted)
+        source = np.searchsorted(node_positions, store.source[rows])
+        target = np.searchsorted(node_positions, store.target[rows])
+        node_ids = [store.node_ids[pos] for pos in node_positions.tolist()]
+        
+        with phase("layout"):
+            coordinates, info = layout_engine.layout(algorithm, node_ids, source, target, store.weight[rows])
+        return dumps({
+            "positions": {
+                node_id: {"x": round(x, 2), "y": round(y, 2)}
+                for node_id, (x, y) in zip(node_ids, coordinates.tolist())
+            },
+            "metadata": {
+                "total_nodes": len(node_ids),
+                "total_edges": len(rows),
+                **info,
+                "filters_applied": {
+                    "min_weight": min_weight,
+                    "interpretability": interpretability,
+                    "limit": limit
+                }
             }
+        })
+    
+    # Layouts take up to seconds on large selections; keep them off the event loop
+    return await run_in_threadpool(
+        cached_json_response, request, snap, ("layout", algorithm, min_weight, interpretability, limit), build,
+        weak=True
+    )
+
+
+@app.get("/network/coarse")
+async def get_coarse_network(
+    request: Request,
+    grouping: str = Query("community", description=f"Supernode grouping ({'/'.join(COARSEN_GROUPINGS)})"),
+    level: Optional[int] = Query(None, ge=0, description="Zoom level, 0 being the coarsest"),
+    expand: Optional[str] = Query(None, description="Comma-separated supernode IDs to show as their members"),
+    min_weight: Optional[float] = Query(None, description="Only aggregate edges of at least this weight"),
+    interpretability: Optional[str] = Query(None, description="Only aggregate edges with these labels (comma-separated)"),
+    max_nodes: int = Query(DEFAULT_MAX_SUPERNODES, ge=1, le=MAX_SUPERNODES, description="Maximum number of supernodes"),
+    limit: Optional[int] = Query(None, ge=1, description="Limit number of aggregated edges returned")
+):
+    """
+    Get the network collapsed into supernodes, for rendering large networks.
+    
+    Diseases are grouped by Louvain community (one level per Louvain level)
+    or by disease name, and the edges between two supernodes are merged
+    into one carrying their summed weight. The last level shows single
+    diseases.
+    
+    Args:
+        grouping: "community" or "disease"
+        level: Zoom level (default: the finest with at most
+            DEFAULT_TARGET_SUPERNODES supernodes)
+        expand: Supernodes to replace with their members at a finer level
+        min_weight: Minimum weight of the aggregated edges
+        interpretability: Interpretability labels of the aggregated edges
+        max_nodes: Maximum number of supernodes (the largest are kept)
+        limit: Maximum number of aggregated edges (heaviest first)
+        
+    Returns:
+        Supernodes, aggregated edges and the view's level
+    """
+    check_min_weight(min_weight)
+    snap = loaded_snapshot()
+    
+    if grouping not in COARSEN_GROUPINGS:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown grouping '{grouping}' (use {'/'.join(COARSEN_GROUPINGS)})"
+        )
+    expand_ids = [supernode.strip() for supernode in expand.split(',') if supernode.strip()] if expand else []
+    interp_filter = parse_interpretability(interpretability)
+    
+    def build() -> bytes:
+        with phase("filter"):
+            try:
+                view = snap.level_of_detail.view(
+                    grouping, level, expand_ids, min_weight, interp_filter, max_nodes, limit
+                )
+            except KeyError as e:
+                raise HTTPException(status_code=404, detail=f"Supernode {e} not found")
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        record_result_items(len(view["nodes"]) + len(view["edges"]))
+        view["metadata"]["filters_applied"] = {
+            "expand": expand_ids,
+            "min_weight": min_weight,
+            "interpretability": interp_filter,
+            "max_nodes": max_nodes,
+            "limit": limit
         }
-    }
+        with phase("serialize"):
+            return dumps(view)
+    
+    return await run_in_threadpool(
+        cached_json_response, request, snap,
+        ("coarse", grouping, level, tuple(expand_ids), min_weight, interpretability, max_nodes, limit), build
+    )
+
+
+def disease_detail(snap: NetworkSnapshot, disease_id: str, include_edges: bool = True) -> Optional[bytes]:
+    """Encoded /disease/{id} body, or None for an unknown disease (or one without edges)."""
+    # Edges where disease is source or target, from the adjacency index
+    connected_edges = snap.index.incident_positions(disease_id)
+    
+    if not len(connected_edges):
+        return None
+    
+    return encode_object([
+        ("disease", dumps(snap.index.get_node(disease_id))),
+        *([("edges", snap.fragments.edges(connected_edges))] if include_edges else []),
+        ("connected_diseases_count", dumps(len(snap.index.neighbor_positions(disease_id)))),
+        ("metadata", dumps({
+            "total_edges": len(connected_edges),
+            "avg_weight": snap.index.weight_sum(disease_id) / len(connected_edges)
+        }))
+    ])
 
 
 @app.get("/disease/{disease_id}")
-async def get_disease_edges(disease_id: str):
+async def get_disease_edges(request: Request, disease_id: str):
     """
     Get all edges connected to a specific disease.
     
@@ -173,75 +786,81 @@ async def get_disease_edges(disease_id: str):
     Returns:
         List of edges and connected diseases
     """
-    if not network_loaded:
-        raise HTTPException(status_code=503, detail="Network data not loaded")
+    snap = loaded_snapshot()
     
-    # Find edges where disease is source or target
-    connected_edges = [
-        edge for edge in network_data['edges']
-        if edge['data']['source'] == disease_id or edge['data']['target'] == disease_id
-    ]
+    body = disease_detail(snap, disease_id)
     
-    if not connected_edges:
+    if body is None:
         raise HTTPException(status_code=404, detail=f"Disease '{disease_id}' not found")
     
-    # Get connected disease IDs
-    connected_disease_ids = set()
-    for edge in connected_edges:
-        if edge['data']['source'] == disease_id:
-            connected_disease_ids.add(edge['data']['target'])
-        else:
-            connected_disease_ids.add(edge['data']['source'])
-    
-    # Get node info
-    disease_node = next(
-        (node for node in network_data['nodes'] if node['data']['id'] == disease_id),
-        None
-    )
-    
-    return {
-        "disease": disease_node,
-        "edges": connected_edges,
-        "connected_diseases_count": len(connected_disease_ids),
-        "metadata": {
-            "total_edges": len(connected_edges),
-            "avg_weight": sum(e['data']['weight'] for e in connected_edges) / len(connected_edges)
-        }
-    }
+    return compressed_response(request, body)
 
 
-@app.get("/edge/{edge_id}")
-async def get_edge_detail(edge_id: str):
+@app.get("/disease/{disease_id}/similar")
+async def get_similar_diseases(
+    request: Request,
+    disease_id: str,
+    metric: str = Query("jaccard", description=f"Similarity measure ({'/'.join(SIMILARITY_METRICS)})"),
+    limit: Optional[int] = Query(10, ge=1, description="Maximum number of results")
+):
     """
-    Get detailed information about a specific edge.
+    Get the diseases whose gene and pathway profiles are most similar.
+    
+    A disease's profile is the union of the shared genes and pathway terms
+    on its edges, so diseases can be similar without a direct edge. The
+    top neighbors are precomputed by data_processor.py.
     
     Args:
-        edge_id: Edge ID (e.g., "Anxiety_disorder--None__Asthma--None")
+        disease_id: Disease ID
+        metric: 'jaccard' (|A & B| / |A | B|) or 'overlap' (|A & B| / min(|A|, |B|))
+        limit: Maximum number of results (at most the precomputed k)
         
     Returns:
-        Edge details including shared genes and pathways
+        Similar diseases, most similar first
     """
-    if not network_loaded:
-        raise HTTPException(status_code=503, detail="Network data not loaded")
+    snap = loaded_snapshot()
     
-    # Find edge
-    edge = next(
-        (e for e in network_data['edges'] if e['data']['id'] == edge_id),
-        None
-    )
+    metric = metric.lower()
+    if metric not in SIMILARITY_METRICS:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown metric '{metric}' (use {'/'.join(SIMILARITY_METRICS)})"
+        )
+    pos = snap.index.node_pos.get(disease_id)
+    if pos is None:
+        raise HTTPException(status_code=404, detail=f"Disease '{disease_id}' not found")
     
-    if edge is None:
-        raise HTTPException(status_code=404, detail=f"Edge '{edge_id}' not found")
+    def build() -> bytes:
+        table = snap.similarity.table()
+        neighbors, scores, shared = table.similar(pos, metric, limit)
+        connected = set(snap.index.neighbor_positions(disease_id).tolist())
+        nodes = snap.index.nodes
+        return dumps({
+            "disease": nodes[pos],
+            "results": [
+                {
+                    "id": nodes[neighbor]['data']['id'],
+                    "label": nodes[neighbor]['data'].get('label'),
+                    "score": round(score, 6),
+                    "shared_terms": count,
+                    "directly_connected": neighbor in connected
+                }
+                for neighbor, score, count in zip(neighbors.tolist(), scores.tolist(), shared.tolist())
+            ],
+            "metadata": {"metric": metric, "limit": limit, "k": table.k}
+        })
     
-    # Get source and target node info
-    source_node = next(
-        (n for n in network_data['nodes'] if n['data']['id'] == edge['data']['source']),
-        None
-    )
-    target_node = next(
-        (n for n in network_data['nodes'] if n['data']['id'] == edge['data']['target']),
-        None
+    return await run_in_threadpool(
+        cached_json_response, request, snap, ("similar", disease_id, metric, limit), build
     )
+
+
+def edge_detail(snap: NetworkSnapshot, pos: int) -> Dict[str, Any]:
+    """/edge/{id} body for the edge at a position."""
+    edge = snap.network.edge(pos)
+    
+    # Get source and target node info
+    source_node = snap.index.get_node(edge['data']['source'])
+    target_node = snap.index.get_node(edge['data']['target'])
     
     return {
         "edge": edge,
@@ -255,102 +874,636 @@ async def get_edge_detail(edge_id: str):
     }
 
 
-@app.get("/search")
-async def search_diseases(keyword: str = Query(..., min_length=1)):
+@app.get("/edge/{edge_id}")
+async def get_edge_detail(request: Request, edge_id: str):
     """
-    Search for diseases by keyword (fuzzy search).
+    Get detailed information about a specific edge.
     
     Args:
-        keyword: Search keyword
+        edge_id: Edge ID (e.g., "Anxiety_disorder--None__Asthma--None")
         
     Returns:
-        List of matching diseases
+        Edge details including shared genes and pathways
     """
-    if not network_loaded:
-        raise HTTPException(status_code=503, detail="Network data not loaded")
+    snap = loaded_snapshot()
     
-    keyword_lower = keyword.lower()
+    pos = snap.index.edge_position(edge_id)
     
-    # Find matching nodes
-    matching_nodes = [
-        node for node in network_data['nodes']
-        if keyword_lower in node['data']['label'].lower() or
-           keyword_lower in node['data']['id'].lower()
-    ]
+    if pos is None:
+        raise HTTPException(status_code=404, detail=f"Edge '{edge_id}' not found")
     
-    # Get edge counts for each disease
-    results = []
-    for node in matching_nodes:
-        disease_id = node['data']['id']
-        edge_count = sum(
-            1 for edge in network_data['edges']
-            if edge['data']['source'] == disease_id or edge['data']['target'] == disease_id
-        )
-        results.append({
-            **node['data'],
-            'edge_count': edge_count
-        })
+    return json_response(request, edge_detail(snap, pos))
+
+
+# Edge and disease IDs accepted by one POST /batch
+MAX_BATCH_ITEMS = 1000
+
+
+class BatchRequest(BaseModel):
+    """Body of POST /batch."""
+    edges: List[str] = Field(default_factory=list, description="Edge IDs")
+    diseases: List[str] = Field(default_factory=list, description="Disease IDs")
+    include_edges: bool = Field(True, description="Include each disease's edges (as /disease/{id} does)")
+
+
+@app.post("/batch")
+async def get_batch_details(request: Request, batch: BatchRequest):
+    """
+    Look up many edges and diseases in one request.
     
-    return {
+    Each found item has the same body as /edge/{id} or /disease/{id}; items
+    that cannot be resolved are reported under `errors` instead of failing
+    the whole request.
+    
+    Args:
+        batch: Edge IDs, disease IDs, and whether to include disease edges
+        
+    Returns:
+        Details keyed by ID, an error message per unresolved ID, and counts
+    """
+    snap = loaded_snapshot()
+    
+    # Repeated IDs are looked up once
+    edge_ids = list(dict.fromkeys(batch.edges))
+    disease_ids = list(dict.fromkeys(batch.diseases))
+    if not edge_ids and not disease_ids:
+        raise HTTPException(status_code=400, detail="No edge or disease IDs given")
+    if len(edge_ids) + len(disease_ids) > MAX_BATCH_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_ITEMS} IDs per batch are allowed")
+    
+    def respond() -> Response:
+        errors: Dict[str, Dict[str, str]] = {"edges": {}, "diseases": {}}
+        with phase("filter"):
+            positions = snap.index.resolve_edge_ids(edge_ids).tolist()
+        with phase("serialize"):
+            edges = []
+            for edge_id, pos in zip(edge_ids, positions):
+                if pos < 0:
+                    errors["edges"][edge_id] = f"Edge '{edge_id}' not found"
+                else:
+                    edges.append((edge_id, dumps(edge_detail(snap, pos))))
+            diseases = []
+            for disease_id in disease_ids:
+                body = disease_detail(snap, disease_id, batch.include_edges)
+                if body is None:
+                    errors["diseases"][disease_id] = f"Disease '{disease_id}' not found"
+                else:
+                    diseases.append((disease_id, body))
+            record_result_items(len(edges) + len(diseases))
+            body = encode_object([
+                ("edges", encode_object(edges)),
+                ("diseases", encode_object(diseases)),
+                ("errors", dumps(errors)),
+                ("metadata", dumps({
+                    "requested_edges": len(edge_ids),
+                    "found_edges": len(edges),
+                    "requested_diseases": len(disease_ids),
+                    "found_diseases": len(diseases)
+                }))
+            ])
+        return compressed_response(request, body)
+    
+    return await run_in_threadpool(respond)
+
+
+@app.get("/search")
+async def search_diseases(
+    request: Request,
+    keyword: str = Query(..., min_length=1),
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of results"),
+    fuzzy: bool = Query(True, description="Include similar spellings when substring matches run short")
+):
+    """
+    Search for diseases by keyword (ranked, fuzzy search).
+    
+    Args:
+        keyword: Search keyword
+        limit: Maximum number of results
+        fuzzy: Add trigram-similarity matches for misspelled keywords
+        
+    Returns:
+        List of matching diseases, best match first
+    """
+    snap = loaded_snapshot()
+    
+    # Trigram index lookup; edge counts come from the precomputed degree
+    results, total = snap.search_index.search(keyword, limit=limit, fuzzy=fuzzy)
+    
+    return json_response(request, {
         "results": results,
         "count": len(results),
+        "total_matches": total,
         "query": keyword
+    })
+
+
+# Edge fields reported for every hop of a path
+PATH_EDGE_FIELDS = ('weight', 'shared_genes', 'filtered_pathways', 'interpretable')
+
+
+def describe_path(snap: NetworkSnapshot, path) -> Dict[str, Any]:
+    """A path with the shared genes and pathways of every hop."""
+    nodes = snap.index.nodes
+    node_ids = [nodes[pos]['data']['id'] for pos in path.nodes]
+    hops = []
+    for (a, b), pos in zip(zip(node_ids[:-1], node_ids[1:]), path.edges):
+        data = snap.network.edge(pos, ('id',) + PATH_EDGE_FIELDS)['data']
+        hops.append({"from": a, "to": b, "edge_id": data['id'], **{field: data[field] for field in PATH_EDGE_FIELDS}})
+    genes = [set(hop['shared_genes']) for hop in hops]
+    pathways = [set(hop['filtered_pathways']) for hop in hops]
+    return {
+        "nodes": node_ids,
+        "labels": [nodes[pos]['data'].get('label') for pos in path.nodes],
+        "cost": path.cost,
+        "length": len(hops),
+        "min_weight": min((hop['weight'] for hop in hops), default=None),
+        "hops": hops,
+        # Genes and pathways shared along the whole chain
+        "common_genes": sorted(set.intersection(*genes)) if genes else [],
+        "common_pathways": sorted(set.intersection(*pathways)) if pathways else []
     }
 
 
+@app.get("/path")
+async def get_paths(
+    request: Request,
+    source: str = Query(..., alias="from", description="Disease ID the paths start at"),
+    to: str = Query(..., description="Disease ID the paths end at"),
+    k: int = Query(1, ge=1, le=MAX_PATHS, description="Number of paths"),
+    metric: str = Query("strength", description=f"Path cost ({'/'.join(PATH_METRICS)})"),
+    budget_ms: int = Query(DEFAULT_BUDGET_MS, ge=1, le=MAX_BUDGET_MS, description="Search time budget in milliseconds")
+):
+    """
+    Get the k best paths between two diseases.
+    
+    With metric=strength an edge costs log1p(max weight) / log1p(weight),
+    so paths prefer few, strong links; with metric=hops every edge costs 1.
+    Paths are loopless and ordered by cost. If the time budget runs out,
+    the paths found so far are returned with metadata.truncated set.
+    
+    Args:
+        from: Start disease ID
+        to: End disease ID
+        k: Number of paths
+        metric: 'strength' or 'hops'
+        budget_ms: Time budget for the search
+        
+    Returns:
+        Paths with the edge weight, shared genes and pathways of every hop
+    """
+    snap = loaded_snapshot()
+    
+    metric = metric.lower()
+    if metric not in PATH_METRICS:
+        raise HTTPException(status_code=400, detail=f"Unknown metric '{metric}' (use {'/'.join(PATH_METRICS)})")
+    positions = []
+    for disease_id in (source, to):
+        pos = snap.index.node_pos.get(disease_id)
+        if pos is None:
+            raise HTTPException(status_code=404, detail=f"Disease '{disease_id}' not found")
+        positions.append(pos)
+    
+    def build() -> Union[bytes, Response]:
+        paths, truncated = snap.paths.k_shortest(positions[0], positions[1], k=k, metric=metric, budget_ms=budget_ms)
+        body = dumps({
+            "from": source,
+            "to": to,
+            "paths": [describe_path(snap, path) for path in paths],
+            "metadata": {
+                "metric": metric,
+                "k": k,
+                "total_paths": len(paths),
+                "truncated": truncated,
+                "directly_connected": bool(np.isin(positions[1], snap.index.neighbor_positions(source)))
+            }
+        })
+        # A search cut short by the clock may complete on a retry: neither
+        # cache it nor give it an ETag
+        return compressed_response(request, body) if truncated else body
+    
+    # Equal-cost paths may be found in a different order after an eviction,
+    # hence the weak ETag
+    return await run_in_threadpool(
+        cached_json_response, request, snap, ("path", source, to, k, metric, budget_ms), build,
+        weak=True
+    )
+
+
+def term_query_response(
+    snap: NetworkSnapshot,
+    term_index: TermIndex,
+    kind: str,
+    terms: List[str],
+    mode: str,
+    min_weight: Optional[float],
+    limit: Optional[int]
+) -> bytes:
+    """
+    Answer a gene or pathway query from an inverted index.
+    
+    Args:
+        snap: Snapshot to answer from
+        term_index: Gene or pathway TermIndex of the snapshot
+        kind: "Gene" or "Pathway", for error messages
+        terms: Query terms
+        mode: 'and' (edges carrying every term) or 'or' (any term)
+        min_weight: Minimum edge weight threshold
+        limit: Maximum number of edges to return
+        
+    Returns:
+        Encoded JSON body: matching edges (heaviest first) with their nodes
+    """
+    mode = mode.lower()
+    if mode not in QUERY_MODES:
+        raise HTTPException(status_code=400, detail=f"Unknown mode '{mode}' (use and/or)")
+    terms = [term.strip() for term in terms if term.strip()]
+    if not terms:
+        raise HTTPException(status_code=400, detail=f"No {kind.lower()} terms given")
+    
+    positions = term_index.query(terms, mode)
+    if positions is None:
+        raise HTTPException(status_code=404, detail=f"{kind} '{', '.join(terms)}' not found")
+    
+    matched = snap.index.filter_by_weight(positions, min_weight=min_weight)
+    selected = matched[:limit] if limit is not None and limit > 0 else matched
+    node_positions = snap.index.node_positions(selected)
+    
+    return encode_object([
+        ("query", dumps({
+            "terms": terms,
+            "mode": mode,
+            "min_weight": min_weight,
+            "limit": limit
+        })),
+        ("nodes", snap.fragments.nodes(node_positions)),
+        ("edges", snap.fragments.edges(selected)),
+        ("metadata", dumps({
+            "total_nodes": len(node_positions),
+            "total_edges": len(selected),
+            "matched_edges": len(matched),
+            "term_frequencies": {
+                term: sum(term_index.frequency(i) for i in term_index.resolve(term))
+                for term in terms
+            },
+            "unknown_terms": [term for term in terms if not term_index.resolve(term)]
+        }))
+    ])
+
+
+@app.get("/gene/{symbol}")
+async def get_gene_edges(
+    request: Request,
+    symbol: str,
+    mode: str = Query("and", description="Combine several symbols with and/or"),
+    min_weight: Optional[float] = Query(None, description="Minimum edge weight threshold"),
+    limit: Optional[int] = Query(None, ge=1, description="Limit number of edges returned")
+):
+    """
+    Get disease pairs sharing a gene.
+    
+    Args:
+        symbol: Gene symbol, or several comma-separated symbols (e.g. "TP53,BRCA1")
+        mode: 'and' for pairs sharing every gene, 'or' for any of them
+        min_weight: Minimum weight threshold for edges
+        limit: Maximum number of edges to return
+        
+    Returns:
+        Matching edges (heaviest first) and their diseases
+    """
+    check_min_weight(min_weight)
+    snap = loaded_snapshot()
+    
+    return await run_in_threadpool(
+        cached_json_response,
+        request,
+        snap,
+        ("gene", symbol, mode, min_weight, limit),
+        lambda: term_query_response(snap, snap.gene_index, "Gene", symbol.split(','), mode, min_weight, limit)
+    )
+
+
+@app.get("/pathway")
+async def get_pathway_edges(
+    request: Request,
+    term: List[str] = Query(..., description="Pathway term; repeat for several"),
+    mode: str = Query("and", description="Combine several terms with and/or"),
+    min_weight: Optional[float] = Query(None, description="Minimum edge weight threshold"),
+    limit: Optional[int] = Query(None, ge=1, description="Limit number of edges returned")
+):
+    """
+    Get disease pairs sharing a pathway term.
+    
+    Args:
+        term: Pathway term(s), e.g. ?term=cellular localization&term=hsa-mir-671-5p
+        mode: 'and' for pairs sharing every term, 'or' for any of them
+        min_weight: Minimum weight threshold for edges
+        limit: Maximum number of edges to return
+        
+    Returns:
+        Matching edges (heaviest first) and their diseases
+    """
+    check_min_weight(min_weight)
+    snap = loaded_snapshot()
+    
+    return await run_in_threadpool(
+        cached_json_response,
+        request,
+        snap,
+        ("pathway", tuple(term), mode, min_weight, limit),
+        lambda: term_query_response(snap, snap.pathway_index, "Pathway", term, mode, min_weight, limit)
+    )
+
+
 @app.get("/stats")
-async def get_statistics():
+async def get_statistics(
+    request: Request,
+    quantiles: Optional[str] = Query(None, description="Extra weight quantiles, comma-separated (e.g. 0.25,0.99)")
+):
     """
     Get network statistics.
     
+    Args:
+        quantiles: Additional weight quantiles in [0, 1] to report
+    
     Returns:
         Statistics about the network
     """
-    if not network_loaded:
-        raise HTTPException(status_code=503, detail="Network data not loaded")
+    snap = loaded_snapshot()
     
-    weights = [edge['data']['weight'] for edge in network_data['edges']]
-    weights_sorted = sorted(weights) if weights else []
+    extra_quantiles = None
+    if quantiles:
+        try:
+            extra_quantiles = [float(q) for q in quantiles.split(',') if q.strip()]
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid quantiles: '{quantiles}'")
+        if any(not 0 <= q <= 1 for q in extra_quantiles):
+            raise HTTPException(status_code=400, detail="Quantiles must be between 0 and 1")
     
-    interpretability_yes = sum(
-        1 for edge in network_data['edges']
-        if edge['data'].get('interpretable', 'NO') == 'YES'
+    # Computed once per load; only extra quantiles are evaluated per request
+    return await run_in_threadpool(
+        cached_json_response, request, snap, ("stats", quantiles), lambda: dumps(snap.stats.summary(extra_quantiles))
     )
-    interpretability_no = sum(
-        1 for edge in network_data['edges']
-        if edge['data'].get('interpretable', 'NO') == 'NO'
+
+
+@app.get("/stats/histogram")
+async def get_weight_histogram(
+    request: Request,
+    bins: int = Query(DEFAULT_HISTOGRAM_BINS, ge=1, le=1000, description="Number of bins"),
+    scale: str = Query("linear", description="Bin spacing (linear/log)")
+):
+    """
+    Get a fixed-bin histogram of edge weights.
+    
+    Args:
+        bins: Number of bins
+        scale: 'linear' for equal-width bins, 'log' for equal width in log10(weight)
+    
+    Returns:
+        Bin edges and edge counts per bin
+    """
+    snap = loaded_snapshot()
+    
+    scale = scale.lower()
+    if scale not in HISTOGRAM_SCALES:
+        raise HTTPException(status_code=400, detail=f"Unknown scale '{scale}'")
+    
+    return await run_in_threadpool(
+        cached_json_response, request, snap, ("histogram", bins, scale), lambda: dumps(snap.stats.histogram(bins, scale))
     )
+
+
+def node_groups(snap: NetworkSnapshot, labels: np.ndarray, limit: Optional[int]) -> List[Dict[str, Any]]:
+    """Groups of a node labeling (largest first) with their members' IDs."""
+    groups = snap.analytics.groups(labels)
+    if limit is not None and limit > 0:
+        groups = groups[:limit]
+    nodes = snap.index.nodes
+    return [
+        {"id": label, "size": len(members), "nodes": [nodes[pos]['data']['id'] for pos in members.tolist()]}
+        for label, members in enumerate(groups)
+    ]
+
+
+@app.get("/analytics/centrality")
+async def get_centrality(
+    request: Request,
+    metric: str = Query("pagerank", description=f"Ranking metric ({'/'.join(CENTRALITY_METRICS)})"),
+    limit: Optional[int] = Query(20, ge=1, description="Number of diseases to return")
+):
+    """
+    Rank diseases by centrality.
     
-    total_edges = len(network_data['edges'])
-    yes_percentage = f"{(interpretability_yes / total_edges * 100):.1f}%" if total_edges else "0%"
-    no_percentage = f"{(interpretability_no / total_edges * 100):.1f}%" if total_edges else "0%"
+    Scores are computed over the whole network once per loaded dataset.
     
-    # 计算百分位数
-    def percentile(data, p):
-        if not data:
-            return 0
-        k = (len(data) - 1) * p / 100
-        f = int(k)
-        c = f + 1 if f < len(data) - 1 else f
-        return data[f] + (data[c] - data[f]) * (k - f) if c < len(data) else data[f]
+    Args:
+        metric: 'degree', 'weighted_degree' (sum of edge weights),
+            'pagerank' (weighted) or 'eigenvector'
+        limit: Number of top diseases to return
+        
+    Returns:
+        Diseases, highest score first, with every metric, component and community
+    """
+    snap = loaded_snapshot()
     
-    return {
-        "total_nodes": len(network_data['nodes']),
-        "total_edges": total_edges,
-        "weight_range": {
-            "min": min(weights) if weights else 0,
-            "max": max(weights) if weights else 0
-        },
-        "weight_percentiles": {
-            "50th": percentile(weights_sorted, 50),
-            "75th": percentile(weights_sorted, 75),
-            "90th": percentile(weights_sorted, 90)
-        },
-        "interpretable_count": interpretability_yes,
-        "uninterpretable_count": interpretability_no,
-        "interpretable_percentage": yes_percentage,
-        "uninterpretable_percentage": no_percentage
-    }
+    metric = metric.lower()
+    if metric not in CENTRALITY_METRICS:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown metric '{metric}' (use {'/'.join(CENTRALITY_METRICS)})"
+        )
+    
+    return await run_in_threadpool(
+        cached_json_response, request, snap, ("centrality", metric, limit),
+        lambda: dumps({
+            "metric": metric,
+            "nodes": snap.analytics.ranking(metric, limit),
+            "total_nodes": snap.index.num_nodes
+        })
+    )
+
+
+@app.get("/analytics/components")
+async def get_components(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, description="Number of components to return")
+):
+    """
+    Get connected components, largest first.
+    
+    Args:
+        limit: Number of components to return
+        
+    Returns:
+        Components with their size and member disease IDs
+    """
+    snap = loaded_snapshot()
+    
+    def build() -> bytes:
+        labels = snap.analytics.components()
+        return dumps({
+            "components": node_groups(snap, labels, limit),
+            "total_components": int(labels.max()) + 1 if len(labels) else 0
+        })
+    
+    return await run_in_threadpool(cached_json_response, request, snap, ("components", limit), build)
+
+
+@app.get("/analytics/communities")
+async def get_communities(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, description="Number of communities to return")
+):
+    """
+    Get communities of diseases with similar gene/pathway profiles.
+    
+    Communities are found with the Louvain method on the weighted network
+    and numbered from the largest.
+    
+    Args:
+        limit: Number of communities to return
+        
+    Returns:
+        Communities with their size and member disease IDs, and the modularity
+    """
+    snap = loaded_snapshot()
+    
+    def build() -> bytes:
+        labels, score = snap.analytics.communities()
+        return dumps({
+            "communities": node_groups(snap, labels, limit),
+            "total_communities": int(labels.max()) + 1 if len(labels) else 0,
+            "modularity": score
+        })
+    
+    return await run_in_threadpool(cached_json_response, request, snap, ("communities", limit), build)
+
+
+@app.get("/analytics/neighborhood/{disease_id}")
+async def get_neighborhood(
+    request: Request,
+    disease_id: str,
+    k: int = Query(2, ge=1, le=MAX_HOPS, description="Number of hops"),
+    min_weight: Optional[float] = Query(None, description="Only follow and return edges of at least this weight"),
+    limit: Optional[int] = Query(None, ge=1, description="Limit number of edges returned")
+):
+    """
+    Get the diseases within k hops of a disease and the edges among them.
+    
+    Args:
+        disease_id: Disease ID at the center
+        k: Number of hops
+        min_weight: Minimum weight of the edges followed and returned
+        limit: Maximum number of edges to return (heaviest first)
+        
+    Returns:
+        Nodes (with their hop distance) and edges of the neighborhood
+    """
+    check_min_weight(min_weight)
+    snap = loaded_snapshot()
+    
+    pos = snap.index.node_pos.get(disease_id)
+    if pos is None:
+        raise HTTPException(status_code=404, detail=f"Disease '{disease_id}' not found")
+    
+    def build() -> bytes:
+        node_positions, distances = snap.analytics.k_hop(pos, k, min_weight)
+        edges = snap.analytics.induced_edges(node_positions, min_weight)
+        selected = edges[:limit] if limit is not None and limit > 0 else edges
+        return encode_object([
+            ("nodes", snap.fragments.nodes(node_positions.tolist())),
+            ("edges", snap.fragments.edges(selected)),
+            ("metadata", dumps({
+                "center": disease_id,
+                "hops": {
+                    snap.index.nodes[node]['data']['id']: hop
+                    for node, hop in zip(node_positions.tolist(), distances.tolist())
+                },
+                "total_nodes": len(node_positions),
+                "total_edges": len(selected),
+                "matched_edges": len(edges),
+                "filters_applied": {"k": k, "min_weight": min_weight, "limit": limit}
+            }))
+        ])
+    
+    return await run_in_threadpool(
+        cached_json_response, request, snap, ("neighborhood", disease_id, k, min_weight, limit), build
+    )
+
+
+@app.get("/subgraph")
+async def get_subgraph(
+    request: Request,
+    seeds: str = Query(..., description="Comma-separated disease IDs to start from"),
+    hops: int = Query(1, ge=1, le=MAX_HOPS, description="Maximum hops from the nearest seed"),
+    min_weight: Optional[float] = Query(None, description="Only follow and return edges of at least this weight"),
+    max_nodes: int = Query(100, ge=1, le=MAX_EGO_NODES, description="Maximum number of diseases, seeds included"),
+    limit: Optional[int] = Query(None, ge=1, description="Limit number of edges returned")
+):
+    """
+    Get the ego-network of one or more diseases: the diseases within a few
+    hops and every edge among them, in one response.
+    
+    The neighborhood is expanded hop by hop; when `max_nodes` runs out,
+    the diseases most strongly connected to those already included are kept.
+    
+    Args:
+        seeds: Disease IDs at the center (e.g., "Anxiety_disorder--None")
+        hops: Number of hops to expand
+        min_weight: Minimum weight of the edges followed and returned
+        max_nodes: Node budget
+        limit: Maximum number of edges to return (heaviest first)
+        
+    Returns:
+        Nodes (with their hop distance) and the induced edges among them
+    """
+    check_min_weight(min_weight)
+    snap = loaded_snapshot()
+    
+    seed_ids = list(dict.fromkeys(seed.strip() for seed in seeds.split(',') if seed.strip()))
+    if not seed_ids:
+        raise HTTPException(status_code=400, detail="No seed diseases given")
+    if len(seed_ids) > MAX_EGO_SEEDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_EGO_SEEDS} seed diseases are allowed")
+    if len(seed_ids) > max_nodes:
+        raise HTTPException(status_code=400, detail=f"max_nodes ({max_nodes}) is smaller than the number of seeds")
+    seed_positions = []
+    for seed_id in seed_ids:
+        pos = snap.index.node_pos.get(seed_id)
+        if pos is None:
+            raise HTTPException(status_code=404, detail=f"Disease '{seed_id}' not found")
+        seed_positions.append(pos)
+    
+    def build() -> bytes:
+        with phase("filter"):
+            node_positions, distances, truncated = snap.analytics.ego_network(
+                seed_positions, hops, max_nodes, min_weight
+            )
+            edges = snap.analytics.induced_edges(node_positions, min_weight)
+            selected = edges[:limit] if limit is not None and limit > 0 else edges
+        record_result_items(len(node_positions) + len(selected))
+        with phase("serialize"):
+            return encode_object([
+                ("nodes", snap.fragments.nodes(node_positions.tolist())),
+                ("edges", snap.fragments.edges(selected)),
+                ("metadata", dumps({
+                    "seeds": seed_ids,
+                    "hops": {
+                        snap.index.nodes[node]['data']['id']: hop
+                        for node, hop in zip(node_positions.tolist(), distances.tolist())
+                    },
+                    "total_nodes": len(node_positions),
+                    "total_edges": len(selected),
+                    "matched_edges": len(edges),
+                    "truncated": truncated,
+                    "filters_applied": {
+                        "hops": hops, "min_weight": min_weight, "max_nodes": max_nodes, "limit": limit
+                    }
+                }))
+            ])
+    
+    return await run_in_threadpool(
+        cached_json_response, request, snap,
+        ("subgraph", tuple(seed_ids), hops, min_weight, max_nodes, limit), build
+    )
 
 
 if __name__ == "__main__":
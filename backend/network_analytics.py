@@ -0,0 +1,454 @@
+"""
+Graph analytics over the loaded network.
+Built on a symmetric SciPy CSR adjacency matrix (weights summed per node
+pair) derived from the edge columns. Whole-graph results (centralities,
+components, communities) are computed on first use and kept for the
+lifetime of the snapshot; k-hop neighborhoods are a few sparse row
+selections per hop (reading the adjacency index and testing edge weights
+per entry under a weight threshold), and budgeted ego-networks read the
+adjacency index directly, so they cost O(edges around the result) however
+large the graph.
+"""
+
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+from network_index import NetworkIndex
+
+CENTRALITY_METRICS = ('degree', 'weighted_degree', 'pagerank', 'eigenvector')
+
+PAGERANK_DAMPING = 0.85
+POWER_MAX_ITERATIONS = 1000
+POWER_TOLERANCE = 1e-10
+
+# Louvain stops when a level improves modularity by less than this
+LOUVAIN_MIN_GAIN = 1e-7
+LOUVAIN_MAX_LEVELS = 32
+
+MAX_HOPS = 5
+# Node budget and seed count limits of ego-network queries
+MAX_EGO_NODES = 5000
+MAX_EGO_SEEDS = 100
+
+
+def symmetric_adjacency(num_nodes: int, source: np.ndarray, target: np.ndarray, weight: np.ndarray) -> sparse.csr_matrix:
+    """Undirected weighted adjacency; a self-loop is stored once on the diagonal."""
+    source = np.asarray(source, dtype=np.int64)
+    target = np.asarray(target, dtype=np.int64)
+    weight = np.asarray(weight, dtype=np.float64)
+    not_loop = source != target
+    rows = np.concatenate([source, target[not_loop]])
+    cols = np.concatenate([target, source[not_loop]])
+    data = np.concatenate([weight, weight[not_loop]])
+    adjacency = sparse.csr_matrix((data, (rows, cols)), shape=(num_nodes, num_nodes))
+    adjacency.sum_duplicates()
+    adjacency.sort_indices()
+    return adjacency
+
+
+def pagerank(
+    adjacency: sparse.csr_matrix,
+    damping: float = PAGERANK_DAMPING,
+    max_iterations: int = POWER_MAX_ITERATIONS,
+    tol: float = POWER_TOLERANCE
+) -> np.ndarray:
+    """
+    Weighted PageRank by power iteration.
+
+    A walker follows an edge with probability proportional to its weight;
+    nodes without edges teleport uniformly.
+
+    Returns:
+        Score per node, summing to 1
+    """
+    n = adjacency.shape[0]
+    if n == 0:
+        return np.zeros(0)
+    out_weight = np.asarray(adjacency.sum(axis=1)).ravel()
+    dangling = out_weight == 0
+    inv_out = np.divide(1.0, out_weight, out=np.zeros(n), where=~dangling)
+    transposed = adjacency.T.tocsr()
+    rank = np.full(n, 1.0 / n)
+    for _ in range(max_iterations):
+        updated = damping * (transposed @ (rank * inv_out))
+        updated += (damping * rank[dangling].sum() + 1.0 - damping) / n
+        moved = np.abs(updated - rank).sum()
+        rank = updated
+        if moved < n * tol:
+            break
+    return rank / rank.sum()
+
+
+def eigenvector_centrality(
+    adjacency: sparse.csr_matrix,
+    max_iterations: int = POWER_MAX_ITERATIONS,
+    tol: float = POWER_TOLERANCE
+) -> np.ndarray:
+    """
+    Leading eigenvector of the weighted adjacency, by power iteration on
+    A + I (the shift keeps bipartite graphs from oscillating).
+
+    Returns:
+        Non-negative score per node with unit Euclidean norm. On a
+        disconnected graph, components other than the dominant one go to 0.
+    """
+    n = adjacency.shape[0]
+    if n == 0 or adjacency.nnz == 0:
+        return np.zeros(n)
+    # Weights are rescaled so the sums stay in a comfortable float range
+    scaled = adjacency / adjacency.data.max()
+    vector = np.full(n, 1.0 / np.sqrt(n))
+    for _ in range(max_iterations):
+        updated = scaled @ vector + vector
+        updated /= np.linalg.norm(updated)
+        moved = np.abs(updated - vector).max()
+        vector = updated
+        if moved < tol:
+            break
+    return vector
+
+
+def modularity(adjacency: sparse.csr_matrix, labels: np.ndarray, resolution: float = 1.0) -> float:
+    """Newman modularity of a partition of a weighted undirected graph."""
+    total = adjacency.sum()
+    if total == 0:
+        return 0.0
+    coo = adjacency.tocoo()
+    same = labels[coo.row] == labels[coo.col]
+    internal = np.bincount(labels[coo.row[same]], weights=coo.data[same], minlength=labels.max() + 1)
+    strength = np.bincount(labels, weights=np.asarray(adjacency.sum(axis=1)).ravel(), minlength=labels.max() + 1)
+    return float(internal.sum() / total - resolution * np.sum((strength / total) ** 2))
+
+
+def _louvain_local_moving(adjacency: sparse.csr_matrix, resolution: float) -> np.ndarray:
+    """
+    Move single nodes to the neighboring community with the best
+    modularity gain until no move helps. Nodes are visited in index order,
+    so the result is deterministic.
+
+    Returns:
+        Community label per node (not necessarily contiguous)
+    """
+    n = adjacency.shape[0]
+    indptr, indices, data = adjacency.indptr, adjacency.indices, adjacency.data
+    strength = np.asarray(adjacency.sum(axis=1)).ravel()
+    total = strength.sum()
+    labels = np.arange(n)
+    community_strength = strength.copy()
+
+    moved = True
+    while moved:
+        moved = False
+        for node in range(n):
+            lo, hi = indptr[node], indptr[node + 1]
+            neighbors = indices[lo:hi]
+            weights = data[lo:hi]
+            not_self = neighbors != node
+            neighbors, weights = neighbors[not_self], weights[not_self]
+            if not len(neighbors):
+                continue
+            current = labels[node]
+            community_strength[current] -= strength[node]
+
+            candidates, inverse = np.unique(labels[neighbors], return_inverse=True)
+            links = np.bincount(inverse, weights=weights)
+            gains = links - resolution * community_strength[candidates] * strength[node] / total
+            # Staying put scores the links back into the node's own community
+            stay = np.flatnonzero(candidates == current)
+            stay_gain = gains[stay[0]] if len(stay) else -resolution * community_strength[current] * strength[node] / total
+            best = int(np.argmax(gains))
+            if gains[best] > stay_gain + 1e-12:
+                labels[node] = candidates[best]
+                moved = True
+            community_strength[labels[node]] += strength[node]
+    return labels
+
+
+def louvain_levels(adjacency: sparse.csr_matrix, resolution: float = 1.0) -> List[np.ndarray]:
+    """
+    Louvain community detection: local moving, then aggregation of each
+    community into one node, repeated while modularity improves.
+
+    Returns:
+        Community label per node after each level, finest first (each
+        numbered from the largest community); every community of a level is
+        a union of communities of the level before. Empty when no level
+        improves on single-node communities.
+    """
+    n = adjacency.shape[0]
+    levels: List[np.ndarray] = []
+    if n == 0 or adjacency.nnz == 0:
+        return levels
+
+    labels = np.arange(n)
+    graph = adjacency
+    best_modularity = modularity(adjacency, labels, resolution)
+    for _ in range(LOUVAIN_MAX_LEVELS):
+        level = _louvain_local_moving(graph, resolution)
+        _, level = np.unique(level, return_inverse=True)
+        candidate = level[labels]
+        score = modularity(adjacency, candidate, resolution)
+        if score - best_modularity < LOUVAIN_MIN_GAIN:
+            break
+        labels, best_modularity = candidate, score
+        levels.append(relabel_by_size(labels))
+        # Collapse communities: (P^T A P)_cd sums the weights between them
+        membership = sparse.csr_matrix(
+            (np.ones(len(level)), (np.arange(len(level)), level)),
+            shape=(len(level), level.max() + 1)
+        )
+        graph = (membership.T @ graph @ membership).tocsr()
+        if graph.shape[0] == 1:
+            break
+    return levels
+
+
+def louvain_communities(adjacency: sparse.csr_matrix, resolution: float = 1.0) -> np.ndarray:
+    """
+    Final level of louvain_levels.
+
+    Returns:
+        Community label per node, 0 being the largest community
+    """
+    levels = louvain_levels(adjacency, resolution)
+    return levels[-1] if levels else np.arange(adjacency.shape[0])
+
+
+def relabel_by_size(labels: np.ndarray) -> np.ndarray:
+    """Renumber groups by size descending (ties by first member)."""
+    _, first, inverse, counts = np.unique(labels, return_index=True, return_inverse=True, return_counts=True)
+    order = np.lexsort((first, -counts))
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    return rank[inverse]
+
+
+class NetworkAnalytics:
+    """Centrality, clustering and neighborhood queries over one snapshot."""
+
+    def __init__(self, index: NetworkIndex):
+        """
+        Args:
+            index: NetworkIndex of the snapshot; its columns are read lazily
+        """
+        self.index = index
+        self.num_nodes = index.num_nodes
+        # Reentrant: results are built from other cached results
+        self._lock = threading.RLock()
+        self._results: Dict[str, Any] = {}
+
+    def _cached(self, name: str, compute: Callable[[], Any]) -> Any:
+        """Compute a whole-graph result once; concurrent callers wait for it."""
+        with self._lock:
+            if name not in self._results:
+                self._results[name] = compute()
+            return self._results[name]
+
+    @property
+    def adjacency(self) -> sparse.csr_matrix:
+        network = self.index.network
+        return self._cached(
+            'adjacency',
+            lambda: symmetric_adjacency(self.num_nodes, network.source, network.target, network.weight)
+        )
+
+    def centrality(self, metric: str) -> np.ndarray:
+        """
+        Score per node for one of CENTRALITY_METRICS.
+
+        Raises:
+            ValueError: For an unknown metric
+        """
+        if metric == 'degree':
+            return self.index.degrees
+        if metric == 'weighted_degree':
+            return self.index.weight_sums
+        if metric == 'pagerank':
+            return self._cached('pagerank', lambda: pagerank(self.adjacency))
+        if metric == 'eigenvector':
+            return self._cached('eigenvector', lambda: eigenvector_centrality(self.adjacency))
+        raise ValueError(f"Unknown metric '{metric}'. Expected one of: {', '.join(CENTRALITY_METRICS)}")
+
+    def components(self) -> np.ndarray:
+        """Connected component per node, 0 being the largest."""
+        def compute():
+            _, labels = connected_components(self.adjacency, directed=False)
+            return relabel_by_size(labels)
+        return self._cached('components', compute)
+
+    def community_levels(self) -> List[np.ndarray]:
+        """Louvain community per node at every level, finest first (see louvain_levels)."""
+        return self._cached('community_levels', lambda: louvain_levels(self.adjacency))
+
+    def communities(self) -> Tuple[np.ndarray, float]:
+        """(Louvain community per node, 0 being the largest; modularity)."""
+        def compute():
+            levels = self.community_levels()
+            labels = levels[-1] if levels else np.arange(self.num_nodes)
+            return labels, modularity(self.adjacency, labels)
+        return self._cached('communities', compute)
+
+    def node_scores(self, positions: List[int]) -> List[Dict[str, Any]]:
+        """Every centrality, component and community of the given nodes."""
+        scores = {metric: self.centrality(metric) for metric in CENTRALITY_METRICS}
+        components = self.components()
+        communities, _ = self.communities()
+        nodes = self.index.nodes
+        return [
+            {
+                "id": nodes[pos]['data']['id'],
+                "label": nodes[pos]['data'].get('label'),
+                **{metric: values[pos].item() for metric, values in scores.items()},
+                "component": int(components[pos]),
+                "community": int(communities[pos])
+            }
+            for pos in positions
+        ]
+
+    def ranking(self, metric: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Nodes by a centrality metric, highest first (ties in node order)."""
+        order = np.argsort(-np.asarray(self.centrality(metric), dtype=np.float64), kind='stable')
+        if limit is not None and limit > 0:
+            order = order[:limit]
+        return self.node_scores(order.tolist())
+
+    @staticmethod
+    def groups(labels: np.ndarray) -> List[np.ndarray]:
+        """Node positions per label, for labels numbered 0..k-1."""
+        order = np.argsort(labels, kind='stable')
+        bounds = np.cumsum(np.bincount(labels))[:-1] if len(labels) else []
+        return np.split(order, bounds)
+
+    def k_hop(
+        self,
+        node_pos: int,
+        hops: int,
+        min_weight: Optional[float] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Nodes within `hops` edges of a node, following only edges of at
+        least `min_weight`.
+
+        Returns:
+            (reached node positions in node order, hop distance of each)
+        """
+        distance = np.full(self.num_nodes, -1, dtype=np.int64)
+        distance[node_pos] = 0
+        frontier = np.array([node_pos])
+        for hop in range(1, hops + 1):
+            if min_weight is None:
+                reached = self.adjacency[frontier].indices
+            else:
+                # Weight test per visited adjacency entry, so a threshold
+                # costs O(edges around the result) instead of a rebuild
+                reached = self.neighbors(frontier, min_weight)
+            reached = np.unique(reached)
+            frontier = reached[distance[reached] < 0]
+            if not len(frontier):
+                break
+            distance[frontier] = hop
+        positions = np.flatnonzero(distance >= 0)
+        return positions, distance[positions]
+
+    def incident(self, node_positions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Adjacency entries of several nodes, read from the index in one pass.
+
+        Returns:
+            (edge positions, the node each was listed under); an edge between
+            two of the nodes appears once per endpoint
+        """
+        index = self.index
+        node_positions = np.asarray(node_positions, dtype=np.int64)
+        starts = np.asarray(index.adj_offsets[node_positions], dtype=np.int64)
+        counts = np.asarray(index.adj_offsets[node_positions + 1], dtype=np.int64) - starts
+        # Index of every entry: its node's start plus its offset within the node
+        entry = np.arange(int(counts.sum()), dtype=np.int64)
+        entry += np.repeat(starts - (np.cumsum(counts) - counts), counts)
+        return np.asarray(index.adj_edges[entry], dtype=np.int64), np.repeat(node_positions, counts)
+
+    def neighbors(self, node_positions: np.ndarray, min_weight: Optional[float] = None) -> np.ndarray:
+        """Other endpoint of every edge of the given nodes of at least `min_weight` (with repeats)."""
+        network = self.index.network
+        edges, ends = self.incident(node_positions)
+        if min_weight is not None:
+            keep = np.asarray(network.weight)[edges] >= min_weight
+            edges, ends = edges[keep], ends[keep]
+        source = np.asarray(network.source)[edges]
+        return np.where(source == ends, np.asarray(network.target)[edges], source)
+
+    def induced_edges(self, node_positions: np.ndarray, min_weight: Optional[float] = None) -> np.ndarray:
+        """Edge positions with both endpoints among the given nodes, heaviest first."""
+        index = self.index
+        member = np.zeros(self.num_nodes, dtype=bool)
+        member[node_positions] = True
+        incident = np.unique(self.incident(node_positions)[0])
+        source = np.asarray(index.network.source)[incident]
+        target = np.asarray(index.network.target)[incident]
+        return index.filter_by_weight(incident[member[source] & member[target]], min_weight=min_weight)
+
+    def ego_network(
+        self,
+        seeds: List[int],
+        hops: int,
+        max_nodes: int,
+        min_weight: Optional[float] = None
+    ) -> Tuple[np.ndarray, np.ndarray, bool]:
+        """
+        Nodes around one or more seeds, expanded breadth-first under a node
+        budget.
+
+        Each hop reads the frontier's adjacency lists from the index and
+        ranks the newly reached nodes by their strongest edge to the nodes
+        already taken; when the budget runs out within a hop, the most
+        strongly connected ones are kept.
+
+        Args:
+            seeds: Node positions to start from (always included)
+            hops: Maximum hop distance from the nearest seed
+            max_nodes: Maximum number of nodes, seeds included
+            min_weight: Only follow edges of at least this weight
+
+        Returns:
+            (node positions in node order, hop distance of each, whether
+            nodes were left out because of the budget)
+        """
+        network = self.index.network
+        distance = np.full(self.num_nodes, -1, dtype=np.int64)
+        frontier = np.unique(np.asarray(seeds, dtype=np.int64))
+        distance[frontier] = 0
+        taken = len(frontier)
+        truncated = False
+        for hop in range(1, hops + 1):
+            if not len(frontier):
+                break
+            edges, ends = self.incident(frontier)
+            weight = np.asarray(network.weight, dtype=np.float64)[edges]
+            source = np.asarray(network.source)[edges]
+            other = np.where(source == ends, np.asarray(network.target)[edges], source)
+            keep = distance[other] < 0
+            if min_weight is not None:
+                keep &= weight >= min_weight
+            other, weight = other[keep], weight[keep]
+            if not len(other):
+                break
+            # Strongest edge per reached node: sort by weight descending
+            # (ties by node) and keep each node's first entry
+            order = np.lexsort((other, -weight))
+            other = other[order]
+            _, first = np.unique(other, return_index=True)
+            candidates = other[np.sort(first)]
+            if len(candidates) > max_nodes - taken:
+                candidates = candidates[:max_nodes - taken]
+                truncated = True
+                if not len(candidates):
+                    break
+            distance[candidates] = hop
+            taken += len(candidates)
+            frontier = candidates
+        positions = np.flatnonzero(distance >= 0)
+        return positions, distance[positions], truncated
@@ -0,0 +1,329 @@
+"""
+Level-of-detail views of the network for rendering large graphs.
+Diseases are collapsed into supernodes, either by Louvain community (one
+zoom level per Louvain level, coarsest first) or by the disease name before
+"--" in the pair ID, and the edges between two supernodes are aggregated
+into one. The finest level is the diseases themselves. A view can expand
+chosen supernodes into their members at a finer level, and holds at most a
+fixed number of supernodes, so the payload size does not depend on the
+size of the network.
+
+The edges are aggregated once per level and interpretability label when a
+level is first viewed, so a view without a weight threshold (and above the
+single-disease level) reads the level's small edge table instead of every
+edge of the network.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from edge_store import EdgeStore
+from network_analytics import NetworkAnalytics
+from network_format import canonical_edge_id
+
+COARSEN_GROUPINGS = ('community', 'disease')
+
+DEFAULT_MAX_SUPERNODES = 200
+MAX_SUPERNODES = 5000
+# Supernodes the default zoom level aims for: few enough to take in at a
+# glance, so a network is shown coarsened unless it is about this small
+DEFAULT_TARGET_SUPERNODES = 50
+
+
+class LevelOfDetail:
+    """Supernode hierarchies per grouping, built on first use, and views over them."""
+
+    def __init__(self, edge_store: EdgeStore, analytics: NetworkAnalytics):
+        """
+        Args:
+            edge_store: Weight-sorted edge columns of the snapshot
+            analytics: Analytics of the same snapshot (for Louvain levels)
+        """
+        self.edge_store = edge_store
+        self.index = edge_store.index
+        self.analytics = analytics
+        self.num_nodes = self.index.num_nodes
+        self._lock = threading.Lock()
+        self._levels: Dict[str, List[np.ndarray]] = {}
+        self._disease_groups: Dict[str, int] = {}
+        self._edge_tables: Dict[Tuple[str, int], Dict[str, np.ndarray]] = {}
+
+    def levels(self, grouping: str) -> List[np.ndarray]:
+        """
+        Supernode per node at every zoom level, coarsest first; the last
+        level has one supernode per disease.
+
+        Raises:
+            ValueError: For an unknown grouping
+        """
+        if grouping not in COARSEN_GROUPINGS:
+            raise ValueError(f"Unknown grouping '{grouping}'. Expected one of: {', '.join(COARSEN_GROUPINGS)}")
+        with self._lock:
+            if grouping not in self._levels:
+                if grouping == 'community':
+                    coarse = self.analytics.community_levels()[::-1]
+                else:
+                    names = [node_id.split('--')[0] for node_id in self.index.network.node_ids]
+                    unique, prefixes = np.unique(np.array(names, dtype=object), return_inverse=True)
+                    self._disease_groups = {name: group for group, name in enumerate(unique.tolist())}
+                    coarse = [prefixes]
+                self._levels[grouping] = [*coarse, np.arange(self.num_nodes)]
+            return self._levels[grouping]
+
+    def supernode_id(self, grouping: str, level: int, group: int, member: int) -> str:
+        """ID of a supernode; at the finest level, the disease ID itself."""
+        node_ids = self.index.network.node_ids
+        if level == len(self.levels(grouping)) - 1:
+            return node_ids[member]
+        if grouping == 'disease':
+            return f"disease:{node_ids[member].split('--')[0]}"
+        return f"community:{level}:{group}"
+
+    def parse_supernode(self, grouping: str, supernode_id: str) -> Tuple[int, int]:
+        """
+        (level, group) of a supernode ID returned by supernode_id.
+
+        Raises:
+            KeyError: If no supernode of the grouping has that ID
+        """
+        levels = self.levels(grouping)
+        prefix, _, rest = supernode_id.partition(':')
+        if grouping == 'community' and prefix == 'community':
+            level, _, group = rest.partition(':')
+            if level.isdigit() and group.isdigit():
+                level, group = int(level), int(group)
+                if level < len(levels) - 1 and group <= levels[level].max():
+                    return level, group
+        if grouping == 'disease' and prefix == 'disease' and rest in self._disease_groups:
+            return 0, self._disease_groups[rest]
+        pos = self.index.node_pos.get(supernode_id)
+        if pos is not None:
+            return len(levels) - 1, pos
+        raise KeyError(supernode_id)
+
+    def default_level(self, grouping: str, max_nodes: int, target: int = DEFAULT_TARGET_SUPERNODES) -> int:
+        """
+        Finest level with at most `target` supernodes (and no more than
+        max_nodes); the coarsest level if none is that small.
+        """
+        levels = self.levels(grouping)
+        budget = min(target, max_nodes)
+        fitting = [level for level, labels in enumerate(levels) if labels.max() + 1 <= budget]
+        return fitting[-1] if fitting else 0
+
+    def edge_table(self, grouping: str, level: int) -> Dict[str, np.ndarray]:
+        """
+        Edges of the network aggregated per supernode pair and
+        interpretability label at one level, computed on first use.
+
+        Returns:
+            Columns "low" and "high" (groups of the pair, low <= high),
+            "bits" (interpretability bit, see EdgeStore.interp_bits),
+            "count", "weight" (summed) and "max_weight"
+        """
+        labels = self.levels(grouping)[level]
+        with self._lock:
+            table = self._edge_tables.get((grouping, level))
+            if table is None:
+                store = self.edge_store
+                num_groups = int(labels.max()) + 1
+                source, target = labels[store.source], labels[store.target]
+                low, high = np.minimum(source, target), np.maximum(source, target)
+                num_codes = int(store.interp_code.max()) + 1 if len(store.interp_code) else 1
+                key = (low * num_groups + high) * num_codes + store.interp_code
+                _, first, slot, count = np.unique(key, return_index=True, return_inverse=True, return_counts=True)
+                table = self._edge_tables[(grouping, level)] = {
+                    "low": low[first],
+                    "high": high[first],
+                    "bits": store.interp_bits[first],
+                    "count": count,
+                    "weight": np.bincount(slot, weights=store.weight, minlength=len(first)),
+                    # Rows are sorted by weight, so each key's first row is its heaviest edge
+                    "max_weight": store.weight[first]
+                }
+            return table
+
+    def assignment(self, grouping: str, level: int, expand: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Supernode of every disease in a view.
+
+        A disease belongs to its supernode at `level`, or, when that
+        supernode is expanded, to its supernode at the next level that
+        splits it, and so on.
+
+        Args:
+            grouping: One of COARSEN_GROUPINGS
+            level: Zoom level of the view
+            expand: IDs of supernodes to replace with their members
+
+        Returns:
+            (level per disease, group per disease at that level, numeric
+            supernode key per disease)
+
+        Raises:
+            KeyError: For an unknown supernode ID
+            ValueError: For a supernode that cannot be expanded in this view
+        """
+        levels = self.levels(grouping)
+        finest = len(levels) - 1
+        expanded: Dict[int, List[int]] = {}
+        for supernode_id in expand:
+            at, group = self.parse_supernode(grouping, supernode_id)
+            if at < level or at == finest:
+                raise ValueError(f"Supernode '{supernode_id}' cannot be expanded at level {level}")
+            expanded.setdefault(at, []).append(group)
+
+        node_level = np.full(self.num_nodes, level, dtype=np.int64)
+        for at in range(level, finest):
+            for group in expanded.get(at, []):
+                members = (node_level == at) & (levels[at] == group)
+                if not members.any():
+                    continue
+                # Skip levels where the supernode is still one group, so
+                # expanding it always shows more than one member
+                below = at + 1
+                while below < finest and len(np.unique(levels[below][members])) == 1:
+                    below += 1
+                node_level[members] = below
+        node_group = np.empty(self.num_nodes, dtype=np.int64)
+        for at in np.unique(node_level).tolist():
+            members = node_level == at
+            node_group[members] = levels[at][members]
+        # Groups of a level are numbered below num_nodes, so this is
+        # distinct per (level, group)
+        return node_level, node_group, node_level * self.num_nodes + node_group
+
+    def view(
+        self,
+        grouping: str,
+        level: Optional[int] = None,
+        expand: Optional[List[str]] = None,
+        min_weight: Optional[float] = None,
+        interpretability: Optional[List[str]] = None,
+        max_nodes: int = DEFAULT_MAX_SUPERNODES,
+        limit: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Supernodes and aggregated edges of one view.
+
+        Args:
+            grouping: One of COARSEN_GROUPINGS
+            level: Zoom level, 0 being the coarsest (default: default_level)
+            expand: IDs of supernodes to show as their members at a finer level
+            min_weight: Only aggregate edges of at least this weight
+            interpretability: Only aggregate edges with these labels
+            max_nodes: Maximum number of supernodes; the largest are kept
+            limit: Maximum number of aggregated edges (heaviest first)
+
+        Returns:
+            Dict with Cytoscape-style "nodes" and "edges" and view metadata
+
+        Raises:
+            KeyError: For an unknown supernode ID
+            ValueError: For an unknown grouping, level or unexpandable supernode
+        """
+        levels = self.levels(grouping)
+        if level is None:
+            level = self.default_level(grouping, max_nodes)
+        if not 0 <= level < len(levels):
+            raise ValueError(f"Level must be between 0 and {len(levels) - 1}")
+        node_level, node_group, node_key = self.assignment(grouping, level, expand or [])
+
+        # Compact supernode numbering, largest supernode first
+        keys, first, slot, size = np.unique(node_key, return_index=True, return_inverse=True, return_counts=True)
+        strength = np.asarray(self.index.weight_sums, dtype=np.float64)
+        order = np.lexsort((first, -size))
+        kept = order[:max_nodes]
+        truncated = len(order) > len(kept)
+
+        # Edges matching the filters mapped to supernodes, as (source,
+        # target, edge count, summed weight, max weight) per entry
+        store = self.edge_store
+        finest_used = int(node_level.max())
+        if min_weight is None and finest_used < len(levels) - 1:
+            # Aggregated edges of the finest level in the view; every group
+            # there lies inside one supernode, since levels are nested. (At
+            # the single-disease level such a table would be as large as
+            # the edges themselves, so those views read the edges.)
+            table = self.edge_table(grouping, finest_used)
+            group_slot = np.zeros(int(levels[finest_used].max()) + 1, dtype=np.int64)
+            group_slot[levels[finest_used]] = slot
+            matching = slice(None)
+            if interpretability:
+                matching = (table["bits"] & store.interpretability_mask(interpretability)) != 0
+            source, target = group_slot[table["low"][matching]], group_slot[table["high"][matching]]
+            count = table["count"][matching]
+            weight, peak = table["weight"][matching], table["max_weight"][matching]
+        else:
+            rows = store.select(min_weight=min_weight, interpretability=interpretability)
+            source, target = slot[store.source[rows]], slot[store.target[rows]]
+            count = np.ones(len(rows), dtype=np.int64)
+            weight = peak = store.weight[rows]
+        network_edges = int(count.sum())
+
+        keep = np.zeros(len(keys), dtype=bool)
+        keep[kept] = True
+        inside = (source == target) & keep[source]
+        internal_edges = np.bincount(source[inside], weights=count[inside], minlength=len(keys)).astype(np.int64)
+        internal_weight = np.bincount(source[inside], weights=weight[inside], minlength=len(keys))
+        between = (source != target) & keep[source] & keep[target]
+        low = np.minimum(source[between], target[between])
+        high = np.maximum(source[between], target[between])
+        pair_key = low * len(keys) + high
+        by_pair = np.argsort(pair_key, kind='stable')
+        pair, start, pair_slot = np.unique(pair_key[by_pair], return_index=True, return_inverse=True)
+        pair_weight = np.bincount(pair_slot, weights=weight[between][by_pair], minlength=len(pair))
+        edge_count = np.bincount(pair_slot, weights=count[between][by_pair], minlength=len(pair)).astype(np.int64)
+        max_weight = np.maximum.reduceat(peak[between][by_pair], start) if len(pair) else peak[:0]
+        edge_order = np.argsort(-pair_weight, kind='stable')
+        if limit is not None and limit > 0:
+            edge_order = edge_order[:limit]
+
+        # Hub of each supernode: the member with the highest weighted degree
+        by_strength = np.lexsort((-strength, slot))
+        hub = by_strength[np.searchsorted(slot[by_strength], np.arange(len(keys)))]
+        finest = len(levels) - 1
+        nodes = self.index.nodes
+        ids = [
+            self.supernode_id(grouping, int(node_level[hub[s]]), int(node_group[hub[s]]), int(hub[s]))
+            for s in range(len(keys))
+        ]
+        return {
+            "nodes": [
+                {"data": {
+                    "id": ids[s],
+                    "label": nodes[hub[s]]['data'].get('label'),
+                    "level": int(node_level[hub[s]]),
+                    "size": int(size[s]),
+                    "hub": nodes[hub[s]]['data']['id'],
+                    "internal_edges": int(internal_edges[s]),
+                    "internal_weight": float(internal_weight[s]),
+                    "expandable": bool(node_level[hub[s]] < finest)
+                }}
+                for s in kept.tolist()
+            ],
+            "edges": [
+                {"data": {
+                    "id": canonical_edge_id(ids[pair[e] // len(keys)], ids[pair[e] % len(keys)]),
+                    "source": ids[pair[e] // len(keys)],
+                    "target": ids[pair[e] % len(keys)],
+                    "weight": float(pair_weight[e]),
+                    "max_weight": float(max_weight[e]),
+                    "edge_count": int(edge_count[e])
+                }}
+                for e in edge_order.tolist()
+            ],
+            "metadata": {
+                "grouping": grouping,
+                "level": level,
+                "levels": len(levels),
+                "total_supernodes": len(kept),
+                "matched_supernodes": len(keys),
+                "total_edges": len(edge_order),
+                "matched_edges": len(pair),
+                "network_edges": network_edges,
+                "truncated": truncated
+            }
+        }
@@ -0,0 +1,320 @@
+"""
+Incremental updates to processed network data.
+
+data_processor.py --incremental fingerprints CSV rows by edge ID and
+content hash, compares them with the row manifest of its previous run and
+rebuilds only added and changed edges. It writes the patched network and a
+delta file next to the output. The server applies the delta file to the
+snapshot it is serving instead of reloading everything, when the delta's
+base version matches that snapshot.
+
+Patching appends changed and added edges after the unchanged ones, so the
+edge order can differ from a full rebuild; the edge and node sets are the
+same.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+
+import numpy as np
+
+from network_format import LoadedNetwork, Vocabulary, lengths_to_offsets
+
+DELTA_FORMAT = 'daviz-network-delta'
+ROW_MANIFEST_FORMAT = 'daviz-row-manifest'
+FORMAT_VERSION = 1
+
+
+def delta_path(output_path: Path) -> Path:
+    """Delta file written next to a processed output."""
+    return Path(f"{output_path}.delta.json")
+
+
+def row_manifest_path(output_path: Path) -> Path:
+    """Row fingerprint manifest written next to a processed output."""
+    return Path(f"{output_path}.rows.json")
+
+
+def _read_json(path: Path, expected_format: str) -> Optional[Dict[str, Any]]:
+    """Parse a JSON sidecar file, or None if missing or of another format."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            document = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if document.get('format') != expected_format or document.get('version') != FORMAT_VERSION:
+        return None
+    return document
+
+
+def _write_json(path: Path, document: Dict[str, Any]) -> None:
+    """Write a JSON sidecar file atomically."""
+    tmp_path = Path(f"{path}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+class RowManifest:
+    """Content hash per edge ID of the CSV rows behind a processed output."""
+
+    def __init__(self, output_version: str, rows: Dict[str, int]):
+        """
+        Args:
+            output_version: dataset_version of the output these rows produced
+            rows: Edge ID -> row content hash
+        """
+        self.output_version = output_version
+        self.rows = rows
+
+    @classmethod
+    def load(cls, path: Path) -> Optional['RowManifest']:
+        document = _read_json(path, ROW_MANIFEST_FORMAT)
+        if document is None:
+            return None
+        return cls(document['output_version'], document['rows'])
+
+    def save(self, path: Path) -> None:
+        _write_json(path, {
+            'format': ROW_MANIFEST_FORMAT,
+            'version': FORMAT_VERSION,
+            'output_version': self.output_version,
+            'rows': self.rows
+        })
+
+    def diff(self, rows: Dict[str, int]) -> Tuple[List[str], List[str], List[str]]:
+        """
+        Compare with the fingerprints of a new CSV.
+
+        Returns:
+            (added, changed, removed) edge IDs
+        """
+        added = [edge_id for edge_id in rows if edge_id not in self.rows]
+        changed = [
+            edge_id for edge_id, digest in rows.items()
+            if edge_id in self.rows and self.rows[edge_id] != digest
+        ]
+        removed = [edge_id for edge_id in self.rows if edge_id not in rows]
+        return added, changed, removed
+
+
+class NetworkDelta:
+    """Edges to remove and to add or replace, between two dataset versions."""
+
+    def __init__(
+        self,
+        base_version: str,
+        version: str,
+        removed: List[str],
+        upserted: List[Dict[str, Any]],
+        nodes: List[Dict[str, Any]]
+    ):
+        """
+        Args:
+            base_version: dataset_version of the output the delta applies to
+            version: dataset_version of the output after patching
+            removed: IDs of edges that no longer exist
+            upserted: Edge data dicts that are new or replace an edge
+            nodes: Node data dicts ({'id', 'label'}) for upserted endpoints
+        """
+        self.base_version = base_version
+        self.version = version
+        self.removed = removed
+        self.upserted = upserted
+        self.nodes = nodes
+
+    @classmethod
+    def load(cls, path: Path) -> Optional['NetworkDelta']:
+        document = _read_json(path, DELTA_FORMAT)
+        if document is None:
+            return None
+        return cls(
+            document['base_version'], document['target_version'],
+            document['removed'], document['upserted'], document['nodes']
+        )
+
+    def save(self, path: Path) -> None:
+        _write_json(path, {
+            'format': DELTA_FORMAT,
+            'version': FORMAT_VERSION,
+            'base_version': self.base_version,
+            'target_version': self.version,
+            'removed': self.removed,
+            'upserted': self.upserted,
+            'nodes': self.nodes
+        })
+
+
+def gather_csr(offsets: np.ndarray, ids: np.ndarray, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Select rows of a CSR list column.
+
+    Returns:
+        (lengths, ids) of the selected rows, in the given order
+    """
+    offsets = np.asarray(offsets, dtype=np.int64)
+    starts = offsets[rows]
+    lengths = offsets[rows + 1] - starts
+    # Position of each output item in the source id column
+    item_starts = np.repeat(starts - lengths_to_offsets(lengths)[:-1], lengths)
+    return lengths, np.asarray(ids)[item_starts + np.arange(int(lengths.sum()))]
+
+
+def _compact_terms(lengths: np.ndarray, ids: np.ndarray, terms: List[str]) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    """Drop terms no longer used by any edge and renumber the rest."""
+    used = np.unique(ids)
+    remap = np.zeros(len(terms), dtype=np.int32)
+    remap[used] = np.arange(len(used), dtype=np.int32)
+    return lengths_to_offsets(lengths), remap[ids], [terms[i] for i in used.tolist()]
+
+
+def edge_pair_keys(edge_ids: List[str], node_pos: Dict[str, int], num_nodes: int) -> np.ndarray:
+    """
+    Order-independent endpoint keys (min * num_nodes + max) of edge IDs.
+
+    Node IDs may themselves contain "__", so every split point with two
+    known endpoints yields a key.
+    """
+    keys: List[int] = []
+    for edge_id in edge_ids:
+        split = edge_id.find('__')
+        while split >= 0:
+            first, second = edge_id[:split], edge_id[split + 2:]
+            a = node_pos.get(first)
+            b = node_pos.get(second)
+            if a is not None and b is not None and first <= second:
+                keys.append(min(a, b) * num_nodes + max(a, b))
+            split = edge_id.find('__', split + 1)
+    return np.array(keys, dtype=np.int64)
+
+
+class PatchedStrings(Sequence):
+    """
+    String column of a patched network, as positions into the base
+    network's column (e.g. a memory-mapped StringTable) plus the strings of
+    upserted edges. Base strings are only decoded when an edge is read.
+    """
+
+    def __init__(self, base: Sequence[str], kept: np.ndarray, added: List[str]):
+        """
+        Args:
+            base: Column of the network the delta was applied to
+            kept: Positions in base of the kept edges, in order
+            added: Strings of the edges that follow the kept ones
+        """
+        kept = np.asarray(kept, dtype=np.int64)
+        if isinstance(base, PatchedStrings):
+            # Resolve through the earlier patch, keeping only its added
+            # strings that are still referenced
+            rows = base.rows[kept]
+            overlay = -rows[rows < 0] - 1
+            used = np.unique(overlay)
+            remap = np.zeros(len(base.added), dtype=np.int64)
+            remap[used] = np.arange(len(used))
+            rows[rows < 0] = -remap[overlay] - 1
+            self.base = base.base
+            self.added = [base.added[i] for i in used.tolist()]
+        else:
+            rows = kept
+            self.base = base
+            self.added = []
+        # Non-negative rows index base; row -1 - i is added[i]
+        new_rows = -np.arange(len(self.added), len(self.added) + len(added), dtype=np.int64) - 1
+        self.rows = np.concatenate([rows, new_rows])
+        self.added.extend(added)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, pos: int) -> str:
+        row = int(self.rows[pos])
+        return self.base[row] if row >= 0 else self.added[-row - 1]
+
+
+class PatchedNetwork(LoadedNetwork):
+    """A loaded network with a delta applied, built column by column in memory."""
+
+    def __init__(self, base: LoadedNetwork, delta: NetworkDelta):
+        """
+        Args:
+            base: Network the delta was computed against
+            delta: Edges to remove and upsert
+        """
+        upserted = delta.upserted
+        base_source = np.asarray(base.source, dtype=np.int64)
+        base_target = np.asarray(base.target, dtype=np.int64)
+
+        # Unchanged edges keep their relative order; upserted edges follow.
+        # Removed and replaced edges are matched by endpoint pair
+        base_pos: Dict[str, int] = {}
+        for pos, node_id in enumerate(base.node_ids):
+            base_pos.setdefault(node_id, pos)
+        num_base_nodes = len(base.node_ids)
+        dropped = edge_pair_keys(
+            list(delta.removed) + [edge['id'] for edge in upserted], base_pos, num_base_nodes
+        )
+        base_keys = np.minimum(base_source, base_target) * num_base_nodes + np.maximum(base_source, base_target)
+        kept = np.flatnonzero(~np.isin(base_keys, dropped))
+
+        # Nodes: every endpoint of the patched edges, sorted by ID
+        labels = {node['data']['id']: node['data']['label'] for node in base.nodes}
+        labels.update((node['id'], node['label']) for node in delta.nodes)
+        kept_nodes = np.unique(np.concatenate([base_source[kept], base_target[kept]]))
+        node_ids = {base.node_ids[pos] for pos in kept_nodes.tolist()}
+        node_ids.update(edge['source'] for edge in upserted)
+        node_ids.update(edge['target'] for edge in upserted)
+        self.node_ids = sorted(node_ids)
+        self.nodes = [{'data': {'id': node_id, 'label': labels[node_id]}} for node_id in self.node_ids]
+        node_pos = {node_id: pos for pos, node_id in enumerate(self.node_ids)}
+        remap = np.fromiter(
+            (node_pos.get(node_id, -1) for node_id in base.node_ids),
+            dtype=np.int32, count=len(base.node_ids)
+        )
+
+        count = len(upserted)
+        self.source = np.concatenate([
+            remap[base_source[kept]],
+            np.fromiter((node_pos[edge['source']] for edge in upserted), dtype=np.int32, count=count)
+        ])
+        self.target = np.concatenate([
+            remap[base_target[kept]],
+            np.fromiter((node_pos[edge['target']] for edge in upserted), dtype=np.int32, count=count)
+        ])
+        self.weight = np.concatenate([
+            np.asarray(base.weight, dtype=np.float64)[kept],
+            np.fromiter((edge['weight'] for edge in upserted), dtype=np.float64, count=count)
+        ])
+
+        # Existing label codes stay valid; new labels are appended
+        codes = {label: code for code, label in enumerate(base.interp_labels)}
+        new_codes = np.fromiter(
+            (codes.setdefault(edge['interpretable'], len(codes)) for edge in upserted),
+            dtype=np.uint8, count=count
+        )
+        self.interp_code = np.concatenate([np.asarray(base.interp_code, dtype=np.uint8)[kept], new_codes])
+        self.interp_labels = list(codes)
+
+        # Term lists: kept rows are gathered as ids, upserted rows interned
+        # into the base vocabulary, then unused terms are dropped
+        gene_vocab = Vocabulary(base.gene_terms)
+        kept_lengths, kept_ids = gather_csr(base.gene_offsets, base.gene_ids, kept)
+        new_lengths, new_ids = gene_vocab.encode_lists([edge['shared_genes'] for edge in upserted])
+        self.gene_offsets, self.gene_ids, self.gene_terms = _compact_terms(
+            np.concatenate([kept_lengths, new_lengths]),
+            np.concatenate([kept_ids, new_ids]).astype(np.int32),
+            gene_vocab.terms
+        )
+        pathway_vocab = Vocabulary(base.pathway_terms)
+        kept_lengths, kept_ids = gather_csr(base.pathway_offsets, base.pathway_ids, kept)
+        new_lengths, new_ids = pathway_vocab.encode_lists([edge['filtered_pathways'] for edge in upserted])
+        self.pathway_offsets, self.pathway_ids, self.pathway_terms = _compact_terms(
+            np.concatenate([kept_lengths, new_lengths]),
+            np.concatenate([kept_ids, new_ids]).astype(np.int32),
+            pathway_vocab.terms
+        )
+
+        # Only row positions are copied, so a memory-mapped base column
+        # stays mapped (and shared between workers)
+        self.reasons = PatchedStrings(base.reasons, kept, [edge['reason_gpt4o'] for edge in upserted])
@@ -0,0 +1,605 @@
+"""
+On-disk formats for processed network data.
+Writers used by data_processor.py and loaders used by the API server.
+
+Two formats are supported:
+- JSON: the Cytoscape-style processed_network.json document
+- Columnar: a directory of NumPy .npy columns plus string tables that the
+  server memory-maps, so startup does not parse JSON and workers share pages.
+  Genes and pathways are interned into vocabularies and stored per edge as
+  CSR offset/id arrays; GPT-4o reasons are only decoded when an edge is
+  materialized.
+
+Both loaders expose the same columns, so the server indexes and response
+code do not depend on the on-disk format.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, List, Any, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+COLUMNAR_FORMAT = 'daviz-columnar'
+COLUMNAR_VERSION = 2
+MANIFEST_FILE = 'manifest.json'
+
+# Edge data fields, in response order. The slim view leaves out the term
+# lists and GPT-4o reason, which clients load per edge from /edge/{id}.
+EDGE_FIELDS = (
+    'id', 'source', 'target', 'weight',
+    'shared_genes', 'filtered_pathways', 'interpretable', 'reason_gpt4o'
+)
+REQUIRED_EDGE_FIELDS = ('id', 'source', 'target')
+EDGE_VIEWS = {
+    'full': EDGE_FIELDS,
+    'slim': ('id', 'source', 'target', 'weight', 'interpretable')
+}
+
+
+def canonical_edge_id(pair1: str, pair2: str) -> str:
+    """Edge ID as produced by NetworkDataProcessor.create_edge_id."""
+    if pair2 < pair1:
+        pair1, pair2 = pair2, pair1
+    return f"{pair1}__{pair2}"
+
+
+def edge_field_set(fields: Iterable[str]) -> Tuple[str, ...]:
+    """
+    Normalize requested edge fields.
+
+    Adds the fields Cytoscape needs (id, source, target) and returns them in
+    EDGE_FIELDS order, so equal requests share cached fragments.
+
+    Raises:
+        ValueError: For unknown field names
+    """
+    requested = set(fields)
+    unknown = requested.difference(EDGE_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown edge fields: {', '.join(sorted(unknown))}")
+    requested.update(REQUIRED_EDGE_FIELDS)
+    return tuple(field for field in EDGE_FIELDS if field in requested)
+
+
+def lengths_to_offsets(lengths: np.ndarray) -> np.ndarray:
+    """CSR offsets (n + 1 values) from per-row lengths."""
+    return np.concatenate([np.zeros(1, dtype=np.int64), np.cumsum(lengths, dtype=np.int64)])
+
+
+class Vocabulary:
+    """Interns strings into dense integer ids, in order of first appearance."""
+
+    def __init__(self, terms: Iterable[str] = ()):
+        self.terms: List[str] = []
+        self.ids: Dict[str, int] = {}
+        for term in terms:
+            self.intern(term)
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def intern(self, term: str) -> int:
+        """ID of a term, adding it if new."""
+        term_id = self.ids.get(term)
+        if term_id is None:
+            term_id = len(self.terms)
+            self.ids[term] = term_id
+            self.terms.append(term)
+        return term_id
+
+    def lookup(self, term: str) -> Optional[int]:
+        """ID of a known term, or None."""
+        return self.ids.get(term)
+
+    def encode_lists(self, lists: Sequence[List[str]]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Intern a sequence of string lists.
+
+        Args:
+            lists: One list of terms per row
+
+        Returns:
+            (lengths, ids): items per row and the concatenated term ids
+        """
+        lengths = np.fromiter((len(items) for items in lists), dtype=np.int64, count=len(lists))
+        ids = np.fromiter(
+            (self.intern(term) for items in lists for term in items),
+            dtype=np.int32, count=int(lengths.sum())
+        )
+        return lengths, ids
+
+
+class StringTableWriter:
+    """Append-only writer for a string table (UTF-8 blob + offsets)."""
+
+    def __init__(self, directory: Path, name: str):
+        self.directory = directory
+        self.name = name
+        self._blob = open(directory / f"{name}.bin", 'wb')
+        self._offsets = [np.zeros(1, dtype=np.int64)]
+        self._end = 0
+
+    def append(self, values: Iterable[str]) -> None:
+        """Append strings in order."""
+        self.append_encoded([value.encode('utf-8') for value in values])
+
+    def append_encoded(self, encoded: List[bytes]) -> None:
+        """Append already-encoded entries in order."""
+        if not encoded:
+            return
+        self._blob.write(b''.join(encoded))
+        lengths = np.fromiter((len(item) for item in encoded), dtype=np.int64, count=len(encoded))
+        ends = np.cumsum(lengths) + self._end
+        self._offsets.append(ends)
+        self._end = int(ends[-1])
+
+    def close(self) -> None:
+        """Flush the blob and write the offsets column."""
+        self._blob.close()
+        np.save(self.directory / f"{self.name}.offsets.npy", np.concatenate(self._offsets))
+
+
+class StringTable:
+    """Read-only, memory-mapped string table."""
+
+    def __init__(self, directory: Path, name: str):
+        self.offsets = np.load(directory / f"{name}.offsets.npy", mmap_mode='r')
+        blob_path = directory / f"{name}.bin"
+        if blob_path.stat().st_size:
+            with open(blob_path, 'rb') as f:
+                self._blob = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            # Empty files cannot be mapped
+            self._blob = b''
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, pos: int) -> str:
+        return self.raw(pos).decode('utf-8')
+
+    def raw(self, pos: int) -> bytes:
+        """Encoded entry at a position."""
+        return self._blob[int(self.offsets[pos]):int(self.offsets[pos + 1])]
+
+    def tolist(self) -> List[str]:
+        """Decode every entry."""
+        return [self[pos] for pos in range(len(self))]
+
+
+class JsonNetworkWriter:
+    """Incremental writer for the JSON network document."""
+
+    def __init__(self, output_path: str):
+        self.output_path = output_path
+        self._tmp_path = f"{output_path}.tmp"
+        self._file = open(self._tmp_path, 'w', encoding='utf-8')
+        self._file.write('{"edges": [')
+        self.num_edges = 0
+
+    def add_edges(self, edges: List[Dict[str, Any]]) -> None:
+        """Append edge data dictionaries."""
+        if not edges:
+            return
+        self._file.write(',\n' if self.num_edges else '\n')
+        self._file.write(',\n'.join(json.dumps({'data': edge}, ensure_ascii=False) for edge in edges))
+        self.num_edges += len(edges)
+
+    def finish(self, nodes: List[Dict[str, Any]]) -> None:
+        """
+        Write the node list and move the file into place.
+
+        Edges come before nodes, since nodes are only known at the end;
+        key order does not matter to JSON readers.
+        """
+        self._file.write('\n],\n"nodes": [\n')
+        self._file.write(',\n'.join(json.dumps({'data': node}, ensure_ascii=False) for node in nodes))
+        self._file.write('\n]}\n')
+        self._file.close()
+        os.replace(self._tmp_path, self.output_path)
+
+
+class ColumnarNetworkWriter:
+    """
+    Incremental writer for the columnar network directory.
+
+    The directory is built under a temporary name and swapped in by
+    finish(), so readers never see a partially written dataset.
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        gene_vocab: Optional[Vocabulary] = None,
+        pathway_vocab: Optional[Vocabulary] = None
+    ):
+        """
+        Args:
+            output_dir: Directory to write
+            gene_vocab: Gene vocabulary to intern into (shared with the caller)
+            pathway_vocab: Pathway vocabulary to intern into
+        """
+        self.output_dir = Path(output_dir)
+        self._tmp_dir = self.output_dir.with_name(self.output_dir.name + '.tmp')
+        if self._tmp_dir.exists():
+            shutil.rmtree(self._tmp_dir)
+        self._tmp_dir.mkdir(parents=True)
+
+        # Endpoints get provisional ids in order of appearance and are
+        # remapped to positions in the sorted node list by finish()
+        self._endpoint_ids: Dict[str, int] = {}
+        self._interp_codes: Dict[str, int] = {}
+        self._source: List[np.ndarray] = []
+        self._target: List[np.ndarray] = []
+        self._weight: List[np.ndarray] = []
+        self._interp: List[np.ndarray] = []
+        self._reason = StringTableWriter(self._tmp_dir, 'edge_reason')
+        self.gene_vocab = gene_vocab if gene_vocab is not None else Vocabulary()
+        self.pathway_vocab = pathway_vocab if pathway_vocab is not None else Vocabulary()
+        self._gene_lengths: List[np.ndarray] = []
+        self._gene_ids: List[np.ndarray] = []
+        self._pathway_lengths: List[np.ndarray] = []
+        self._pathway_ids: List[np.ndarray] = []
+        self.num_edges = 0
+
+    def _endpoint(self, node_id: str) -> int:
+        return self._endpoint_ids.setdefault(node_id, len(self._endpoint_ids))
+
+    def _interp_code(self, label: str) -> int:
+        return self._interp_codes.setdefault(label, len(self._interp_codes))
+
+    def add_edges(self, edges: List[Dict[str, Any]]) -> None:
+        """Append edge data dictionaries."""
+        if not edges:
+            return
+        count = len(edges)
+        self._source.append(np.fromiter(
+            (self._endpoint(edge['source']) for edge in edges), dtype=np.int32, count=count))
+        self._target.append(np.fromiter(
+            (self._endpoint(edge['target']) for edge in edges), dtype=np.int32, count=count))
+        self._weight.append(np.fromiter(
+            (edge['weight'] for edge in edges), dtype=np.float64, count=count))
+        self._interp.append(np.fromiter(
+            (self._interp_code(edge['interpretable']) for edge in edges), dtype=np.uint8, count=count))
+        self._reason.append(edge['reason_gpt4o'] for edge in edges)
+
+        lengths, ids = self.gene_vocab.encode_lists([edge['shared_genes'] for edge in edges])
+        self._gene_lengths.append(lengths)
+        self._gene_ids.append(ids)
+        lengths, ids = self.pathway_vocab.encode_lists([edge['filtered_pathways'] for edge in edges])
+        self._pathway_lengths.append(lengths)
+        self._pathway_ids.append(ids)
+        self.num_edges += count
+
+    def finish(self, nodes: List[Dict[str, Any]]) -> None:
+        """
+        Write node tables, numeric columns and the manifest, then swap the
+        directory into place.
+
+        Args:
+            nodes: Node data dictionaries; must cover every edge endpoint
+        """
+        node_pos = {node['id']: pos for pos, node in enumerate(nodes)}
+        missing = [node_id for node_id in self._endpoint_ids if node_id not in node_pos]
+        if missing:
+            raise ValueError(f"Edge endpoints missing from node list: {missing[:5]}")
+        remap = np.fromiter(
+            (node_pos[node_id] for node_id in self._endpoint_ids),
+            dtype=np.int32, count=len(self._endpoint_ids)
+        )
+
+        def column(chunks: List[np.ndarray], dtype) -> np.ndarray:
+            return np.concatenate(chunks) if chunks else np.empty(0, dtype=dtype)
+
+        np.save(self._tmp_dir / 'edge_source.npy', remap[column(self._source, np.int32)])
+        np.save(self._tmp_dir / 'edge_target.npy', remap[column(self._target, np.int32)])
+        np.save(self._tmp_dir / 'edge_weight.npy', column(self._weight, np.float64))
+        np.save(self._tmp_dir / 'edge_interp.npy', column(self._interp, np.uint8))
+        self._reason.close()
+
+        # Gene and pathway lists as CSR: per-edge offsets into an id column
+        np.save(self._tmp_dir / 'edge_genes.offsets.npy',
+                lengths_to_offsets(column(self._gene_lengths, np.int64)))
+        np.save(self._tmp_dir / 'edge_genes.ids.npy', column(self._gene_ids, np.int32))
+        np.save(self._tmp_dir / 'edge_pathways.offsets.npy',
+                lengths_to_offsets(column(self._pathway_lengths, np.int64)))
+        np.save(self._tmp_dir / 'edge_pathways.ids.npy', column(self._pathway_ids, np.int32))
+        for name, vocab in (('gene_vocab', self.gene_vocab), ('pathway_vocab', self.pathway_vocab)):
+            table = StringTableWriter(self._tmp_dir, name)
+            table.append(vocab.terms)
+            table.close()
+
+        node_ids = StringTableWriter(self._tmp_dir, 'node_id')
+        node_ids.append(node['id'] for node in nodes)
+        node_ids.close()
+        node_labels = StringTableWriter(self._tmp_dir, 'node_label')
+        node_labels.append(node['label'] for node in nodes)
+        node_labels.close()
+
+        manifest = {
+            'format': COLUMNAR_FORMAT,
+            'version': COLUMNAR_VERSION,
+            'num_nodes': len(nodes),
+            'num_edges': self.num_edges,
+            'num_genes': len(self.gene_vocab),
+            'num_pathways': len(self.pathway_vocab),
+            'interpretability_labels': list(self._interp_codes)
+        }
+        with open(self._tmp_dir / MANIFEST_FILE, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+        # Swap directories; open memory maps keep the old files alive
+        old_dir = self.output_dir.with_name(self.output_dir.name + '.old')
+        if old_dir.exists():
+            shutil.rmtree(old_dir)
+        if self.output_dir.exists():
+            os.replace(self.output_dir, old_dir)
+        os.replace(self._tmp_dir, self.output_dir)
+        if old_dir.exists():
+            shutil.rmtree(old_dir)
+
+
+class LoadedNetwork:
+    """
+    Network data as seen by the server indexes, stored column-wise.
+
+    Attributes:
+        nodes: Node dicts ({'data': {'id', 'label'}}), in node position order
+        node_ids: Node ID per position
+        source, target: Node positions of each edge's endpoints
+        weight: Edge weights
+        interp_code: Index into interp_labels per edge
+        gene_terms, pathway_terms: Vocabularies (term per id)
+        gene_offsets, gene_ids: CSR lists of gene ids per edge
+        pathway_offsets, pathway_ids: CSR lists of pathway ids per edge
+        reasons: GPT-4o reason text per edge
+    """
+
+    nodes: List[Dict[str, Any]]
+    node_ids: List[str]
+    source: np.ndarray
+    target: np.ndarray
+    weight: np.ndarray
+    interp_code: np.ndarray
+    interp_labels: List[str]
+    gene_terms: List[str]
+    gene_offsets: np.ndarray
+    gene_ids: np.ndarray
+    pathway_terms: List[str]
+    pathway_offsets: np.ndarray
+    pathway_ids: np.ndarray
+    reasons: Sequence[str]
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.weight)
+
+    def edge_gene_ids(self, pos: int) -> np.ndarray:
+        """Gene ids shared by an edge."""
+        return self.gene_ids[self.gene_offsets[pos]:self.gene_offsets[pos + 1]]
+
+    def edge_pathway_ids(self, pos: int) -> np.ndarray:
+        """Pathway ids of an edge."""
+        return self.pathway_ids[self.pathway_offsets[pos]:self.pathway_offsets[pos + 1]]
+
+    def edge(self, pos: int, fields: Sequence[str] = EDGE_FIELDS) -> Dict[str, Any]:
+        """
+        Cytoscape edge dict ({'data': {...}}) at a position.
+
+        Only the requested fields are decoded, so slim projections never
+        touch the term lists or reason strings.
+
+        Args:
+            pos: Edge position
+            fields: Data fields to include, normalized by edge_field_set
+        """
+        source = self.node_ids[self.source[pos]]
+        target = self.node_ids[self.target[pos]]
+        data = {}
+        for field in fields:
+            if field == 'id':
+                data['id'] = canonical_edge_id(source, target)
+            elif field == 'source':
+                data['source'] = source
+            elif field == 'target':
+                data['target'] = target
+            elif field == 'weight':
+                data['weight'] = float(self.weight[pos])
+            elif field == 'shared_genes':
+                gene_terms = self.gene_terms
+                data['shared_genes'] = [gene_terms[i] for i in self.edge_gene_ids(pos).tolist()]
+            elif field == 'filtered_pathways':
+                pathway_terms = self.pathway_terms
+                data['filtered_pathways'] = [pathway_terms[i] for i in self.edge_pathway_ids(pos).tolist()]
+            elif field == 'interpretable':
+                data['interpretable'] = self.interp_labels[self.interp_code[pos]]
+            elif field == 'reason_gpt4o':
+                data['reason_gpt4o'] = self.reasons[pos]
+        return {'data': data}
+
+    def edges(self, positions: Iterable[int], fields: Sequence[str] = EDGE_FIELDS) -> List[Dict[str, Any]]:
+        """Cytoscape edge dicts at several positions."""
+        return [self.edge(pos, fields) for pos in positions]
+
+
+class JsonNetwork(LoadedNetwork):
+    """
+    Network parsed from a processed_network.json document.
+
+    The parsed edge dicts are converted to columns and then dropped; gene and
+    pathway names are interned, so each distinct term is held once.
+    """
+
+    def __init__(self, network_data: Dict[str, Any]):
+        self.nodes = network_data.get('nodes', [])
+        self.node_ids = [node['data']['id'] for node in self.nodes]
+        edges = [edge['data'] for edge in network_data.get('edges', [])]
+        num_edges = len(edges)
+
+        node_pos: Dict[str, int] = {}
+        for pos, node_id in enumerate(self.node_ids):
+            node_pos.setdefault(node_id, pos)
+
+        def endpoint(node_id: str) -> int:
+            pos = node_pos.get(node_id)
+            if pos is None:
+                raise ValueError(f"Edge endpoint '{node_id}' is missing from the node list")
+            return pos
+
+        self.source = np.fromiter((endpoint(edge['source']) for edge in edges),
+                                  dtype=np.int32, count=num_edges)
+        self.target = np.fromiter((endpoint(edge['target']) for edge in edges),
+                                  dtype=np.int32, count=num_edges)
+        self.weight = np.fromiter((edge['weight'] for edge in edges),
+                                  dtype=np.float64, count=num_edges)
+
+        # Labels are coded in order of first appearance
+        codes: Dict[str, int] = {}
+        self.interp_code = np.fromiter(
+            (codes.setdefault(edge.get('interpretable', 'NO'), len(codes)) for edge in edges),
+            dtype=np.uint8, count=num_edges
+        )
+        self.interp_labels = list(codes)
+
+        gene_vocab = Vocabulary()
+        lengths, self.gene_ids = gene_vocab.encode_lists([edge['shared_genes'] for edge in edges])
+        self.gene_offsets = lengths_to_offsets(lengths)
+        self.gene_terms = gene_vocab.terms
+
+        pathway_vocab = Vocabulary()
+        lengths, self.pathway_ids = pathway_vocab.encode_lists(
+            [edge['filtered_pathways'] for edge in edges]
+        )
+        self.pathway_offsets = lengths_to_offsets(lengths)
+        self.pathway_terms = pathway_vocab.terms
+
+        self.reasons = [edge.get('reason_gpt4o', '') for edge in edges]
+
+    @classmethod
+    def load(cls, path: Path) -> 'JsonNetwork':
+        """Parse a JSON network file."""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+
+class ColumnarNetwork(LoadedNetwork):
+    """Memory-mapped network from a columnar directory."""
+
+    def __init__(self, directory: Path):
+        directory = Path(directory)
+        with open(directory / MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('format') != COLUMNAR_FORMAT or manifest.get('version') != COLUMNAR_VERSION:
+            raise ValueError(
+                f"Unsupported columnar network format: {manifest.get('format')} "
+                f"v{manifest.get('version')}; re-run data_processor.py --format columnar"
+            )
+        self.manifest = manifest
+        self.directory = directory
+
+        # Nodes and vocabularies are small and always needed, so they are
+        # decoded up front
+        self.node_ids = StringTable(directory, 'node_id').tolist()
+        node_labels = StringTable(directory, 'node_label').tolist()
+        self.nodes = [
+            {'data': {'id': node_id, 'label': label}}
+            for node_id, label in zip(self.node_ids, node_labels)
+        ]
+        self.gene_terms = StringTable(directory, 'gene_vocab').tolist()
+        self.pathway_terms = StringTable(directory, 'pathway_vocab').tolist()
+
+        def column(name: str) -> np.ndarray:
+            return np.load(directory / f"{name}.npy", mmap_mode='r')
+
+        self.source = column('edge_source')
+        self.target = column('edge_target')
+        self.weight = column('edge_weight')
+        self.interp_code = column('edge_interp')
+        self.interp_labels = manifest['interpretability_labels']
+        self.gene_offsets = column('edge_genes.offsets')
+        self.gene_ids = column('edge_genes.ids')
+        self.pathway_offsets = column('edge_pathways.offsets')
+        self.pathway_ids = column('edge_pathways.ids')
+        self.reasons = StringTable(directory, 'edge_reason')
+
+
+def write_columnar_network(network: LoadedNetwork, directory: Path, batch_size: int = 100_000) -> None:
+    """
+    Write any loaded network (JSON, columnar or patched) as a columnar
+    directory, e.g. to share one copy between server processes.
+
+    Args:
+        network: Network to write
+        directory: New, empty directory
+        batch_size: Reasons encoded per write
+    """
+    directory = Path(directory)
+    np.save(directory / 'edge_source.npy', np.asarray(network.source, dtype=np.int32))
+    np.save(directory / 'edge_target.npy', np.asarray(network.target, dtype=np.int32))
+    np.save(directory / 'edge_weight.npy', np.asarray(network.weight, dtype=np.float64))
+    np.save(directory / 'edge_interp.npy', np.asarray(network.interp_code, dtype=np.uint8))
+    np.save(directory / 'edge_genes.offsets.npy', np.asarray(network.gene_offsets, dtype=np.int64))
+    np.save(directory / 'edge_genes.ids.npy', np.asarray(network.gene_ids, dtype=np.int32))
+    np.save(directory / 'edge_pathways.offsets.npy', np.asarray(network.pathway_offsets, dtype=np.int64))
+    np.save(directory / 'edge_pathways.ids.npy', np.asarray(network.pathway_ids, dtype=np.int32))
+
+    tables = (
+        ('gene_vocab', network.gene_terms),
+        ('pathway_vocab', network.pathway_terms),
+        ('node_id', network.node_ids),
+        ('node_label', [node['data']['label'] for node in network.nodes])
+    )
+    for name, values in tables:
+        table = StringTableWriter(directory, name)
+        table.append(values)
+        table.close()
+    reasons = StringTableWriter(directory, 'edge_reason')
+    for lo in range(0, network.num_edges, batch_size):
+        reasons.append(network.reasons[pos] for pos in range(lo, min(lo + batch_size, network.num_edges)))
+    reasons.close()
+
+    manifest = {
+        'format': COLUMNAR_FORMAT,
+        'version': COLUMNAR_VERSION,
+        'num_nodes': len(network.nodes),
+        'num_edges': network.num_edges,
+        'num_genes': len(network.gene_terms),
+        'num_pathways': len(network.pathway_terms),
+        'interpretability_labels': list(network.interp_labels)
+    }
+    with open(directory / MANIFEST_FILE, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+
+def is_columnar(path: Path) -> bool:
+    """Whether a path is a columnar network directory."""
+    return (Path(path) / MANIFEST_FILE).is_file()
+
+
+def load_network(path: Path) -> LoadedNetwork:
+    """Load a network from a JSON file or a columnar directory."""
+    if is_columnar(path):
+        return ColumnarNetwork(path)
+    return JsonNetwork.load(path)
+
+
+def dataset_version(path: Path) -> str:
+    """
+    Cheap fingerprint of processed data on disk.
+
+    Hashes the name, size and modification time of the JSON file or of every
+    file in a columnar directory, so it changes whenever the processor
+    rewrites the data and is identical across workers serving the same files.
+    """
+    path = Path(path)
+    files = sorted(path.iterdir()) if path.is_dir() else [path]
+    digest = hashlib.blake2b(digest_size=8)
+    for file in files:
+        stat = file.stat()
+        digest.update(f"{file.name}:{stat.st_size}:{stat.st_mtime_ns};".encode('utf-8'))
+    return digest.hexdigest()
@@ -0,0 +1,209 @@
+"""
+In-memory lookup index for the disease network.
+Built once when network data is loaded so that disease, edge and search
+endpoints resolve in O(1)/O(degree) instead of scanning every edge.
+"""
+
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+
+from network_format import LoadedNetwork
+
+
+class NetworkIndex:
+    """Hash and adjacency index over a loaded network's edge columns."""
+
+    # Arrays that grow with the number of edges; server processes attached
+    # to a shared snapshot map these instead of building them
+    SHARED_ARRAYS = ('adj_edges', 'adj_offsets', 'degrees', 'weight_sums', '_pair_order', '_sorted_pair_keys')
+
+    def __init__(self, network: LoadedNetwork, arrays: Optional[Dict[str, np.ndarray]] = None):
+        """
+        Build the index from loaded network data.
+
+        Args:
+            network: Loaded network (JSON or columnar)
+            arrays: Prebuilt SHARED_ARRAYS for this network (see shared_arrays)
+        """
+        self.network = network
+        self.nodes: List[Dict[str, Any]] = network.nodes
+        self.num_nodes = len(self.nodes)
+        self.num_edges = network.num_edges
+
+        # node-id -> position in self.nodes
+        self.node_pos: Dict[str, int] = {}
+        for pos, node in enumerate(self.nodes):
+            self.node_pos.setdefault(node['data']['id'], pos)
+
+        if arrays is not None:
+            for name in self.SHARED_ARRAYS:
+                setattr(self, name, arrays[name])
+            return
+
+        source = np.asarray(network.source, dtype=np.int64)
+        target = np.asarray(network.target, dtype=np.int64)
+        weight = np.asarray(network.weight, dtype=np.float64)
+        edge_positions = np.arange(self.num_edges, dtype=np.int64)
+
+        # CSR adjacency: incident edge positions per node, in file order.
+        # Self-loops are listed once.
+        not_loop = source != target
+        ends = np.concatenate([source, target[not_loop]])
+        incident = np.concatenate([edge_positions, edge_positions[not_loop]])
+        order = np.lexsort((incident, ends))
+        self.adj_edges = incident[order]
+        counts = np.bincount(ends, minlength=self.num_nodes)
+        self.adj_offsets = np.concatenate([[0], np.cumsum(counts)])
+        self.degrees = counts
+        # Summed along the adjacency so each node adds its weights in file order
+        self.weight_sums = np.bincount(
+            ends[order], weights=weight[self.adj_edges], minlength=self.num_nodes
+        )
+
+        # Edge lookup by unordered endpoint pair; the stable sort keeps the
+        # first occurrence first, matching a linear scan
+        pair_keys = self._pair_key(source, target)
+        self._pair_order = np.argsort(pair_keys, kind='stable')
+        self._sorted_pair_keys = pair_keys[self._pair_order]
+
+    def shared_arrays(self) -> Dict[str, np.ndarray]:
+        """The SHARED_ARRAYS, for attaching other processes to this index."""
+        return {name: getattr(self, name) for name in self.SHARED_ARRAYS}
+
+    def _pair_key(self, a, b):
+        """Order-independent integer key for a pair of node positions."""
+        return np.minimum(a, b) * self.num_nodes + np.maximum(a, b)
+
+    def get_node(self, node_id: str) -> Optional[Dict[str, Any]]:
+        """Return the node with the given ID, or None."""
+        pos = self.node_pos.get(node_id)
+        return self.nodes[pos] if pos is not None else None
+
+    def edge_position(self, edge_id: str) -> Optional[int]:
+        """
+        Resolve an edge ID ("<pair1>__<pair2>", alphabetical) to its position.
+
+        Node IDs may themselves contain "__", so every split point is tried.
+        """
+        pos = int(self.resolve_edge_ids([edge_id])[0])
+        return pos if pos >= 0 else None
+
+    def resolve_edge_ids(self, edge_ids: List[str]) -> np.ndarray:
+        """
+        Resolve many edge IDs with one search of the pair keys.
+
+        Returns:
+            Edge position per ID, -1 where no edge has that ID
+        """
+        items: List[int] = []
+        keys: List[int] = []
+        for item, edge_id in enumerate(edge_ids):
+            split = edge_id.find('__')
+            while split >= 0:
+                first, second = edge_id[:split], edge_id[split + 2:]
+                a = self.node_pos.get(first)
+                b = self.node_pos.get(second)
+                if a is not None and b is not None and first <= second:
+                    items.append(item)
+                    keys.append(min(a, b) * self.num_nodes + max(a, b))
+                split = edge_id.find('__', split + 1)
+
+        positions = np.full(len(edge_ids), -1, dtype=np.int64)
+        if not keys:
+            return positions
+        keys = np.array(keys, dtype=np.int64)
+        items = np.array(items, dtype=np.int64)
+        found = np.searchsorted(self._sorted_pair_keys, keys)
+        hit = found < len(self._sorted_pair_keys)
+        hit[hit] = self._sorted_pair_keys[found[hit]] == keys[hit]
+        # Candidates are in split order, so the first hit per ID wins
+        resolved, first = np.unique(items[hit], return_index=True)
+        positions[resolved] = self._pair_order[found[hit][first]]
+        return positions
+
+    def get_edge(self, edge_id: str) -> Optional[Dict[str, Any]]:
+        """Return the edge with the given ID, or None."""
+        pos = self.edge_position(edge_id)
+        return self.network.edge(pos) if pos is not None else None
+
+    def incident_positions(self, node_id: str) -> np.ndarray:
+        """Positions of edges where the node is source or target, in file order."""
+        pos = self.node_pos.get(node_id)
+        if pos is None:
+            return self.adj_edges[:0]
+        return self.adj_edges[self.adj_offsets[pos]:self.adj_offsets[pos + 1]]
+
+    def degree(self, node_id: str) -> int:
+        """Number of edges incident to a node."""
+        return len(self.incident_positions(node_id))
+
+    def weight_sum(self, node_id: str) -> float:
+        """Sum of the weights of edges incident to a node."""
+        pos = self.node_pos.get(node_id)
+        return float(self.weight_sums[pos]) if pos is not None else 0.0
+
+    def incident_edges(self, node_id: str) -> List[Dict[str, Any]]:
+        """Edges where the node is source or target, in file order."""
+        return self.network.edges(self.incident_positions(node_id).tolist())
+
+    def neighbor_positions(self, node_id: str) -> np.ndarray:
+        """Positions of nodes directly connected to a node."""
+        pos = self.node_pos.get(node_id)
+        incident = self.incident_positions(node_id)
+        source = np.asarray(self.network.source)[incident]
+        target = np.asarray(self.network.target)[incident]
+        return np.unique(np.where(source == pos, target, source))
+
+    def filter_by_weight(
+        self,
+        edge_positions: np.ndarray,
+        min_weight: Optional[float] = None,
+        limit: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Apply a weight threshold and order edges by weight descending.
+
+        Args:
+            edge_positions: Edge positions to filter
+            min_weight: Minimum weight threshold
+            limit: Keep only the heaviest `limit` edges
+
+        Returns:
+            Edge positions, heaviest first (ties in file order)
+        """
+        edge_positions = np.asarray(edge_positions, dtype=np.int64)
+        weights = np.asarray(self.network.weight)[edge_positions]
+        if min_weight is not None:
+            keep = weights >= min_weight
+            edge_positions = edge_positions[keep]
+            weights = weights[keep]
+        order = np.argsort(-weights, kind='stable')
+        if limit is not None and limit > 0:
+            order = order[:limit]
+        return edge_positions[order]
+
+    def node_positions(self, edge_positions: np.ndarray) -> np.ndarray:
+        """Positions of nodes touched by the given edges, in node list order."""
+        edge_positions = np.asarray(edge_positions, dtype=np.int64)
+        member = np.zeros(self.num_nodes, dtype=bool)
+        member[np.asarray(self.network.source)[edge_positions]] = True
+        member[np.asarray(self.network.target)[edge_positions]] = True
+        return np.flatnonzero(member)
+
+    def subnetwork(self, edge_positions: np.ndarray) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Materialize the given edges and the nodes they touch.
+
+        Args:
+            edge_positions: Edge positions, in the order to return them
+
+        Returns:
+            (nodes in node list order, edges)
+        """
+        edge_positions = np.asarray(edge_positions, dtype=np.int64)
+        nodes = self.nodes
+        return (
+            [nodes[pos] for pos in self.node_positions(edge_positions).tolist()],
+            self.network.edges(edge_positions.tolist())
+        )
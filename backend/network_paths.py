@@ -0,0 +1,318 @@
+"""
+Path queries between diseases.
+Paths run over a compact undirected adjacency (one entry per node pair,
+keeping the cheapest edge) built from the edge columns. The k best paths
+are found with Yen's algorithm on top of a bidirectional Dijkstra search,
+under a per-request time budget. Diseases that are queried repeatedly get
+their full single-source shortest-path tree computed once and memoized,
+which answers later single-path queries from either endpoint directly.
+"""
+
+import heapq
+import threading
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import dijkstra
+
+from network_index import NetworkIndex
+
+# 'strength': cost log1p(max weight) / log1p(weight), 1 for the heaviest edge
+# and growing as edges get weaker; 'hops': every edge costs 1
+PATH_METRICS = ('strength', 'hops')
+
+MAX_PATHS = 20
+DEFAULT_BUDGET_MS = 2000
+MAX_BUDGET_MS = 10000
+
+# A disease becomes "popular" once this many queries started or ended at it
+TREE_THRESHOLD = 3
+TREE_CACHE_SIZE = 64
+
+# Heap pops between deadline checks
+_DEADLINE_CHECK = 256
+
+
+class BudgetExceeded(Exception):
+    """A path search ran past its deadline."""
+
+
+@dataclass
+class Path:
+    """A path as node positions, with the edge position of every hop."""
+    nodes: List[int]
+    edges: List[int]
+    cost: float
+
+
+def edge_costs(weight: np.ndarray, metric: str) -> np.ndarray:
+    """
+    Cost per edge for a path metric. Edges without a positive weight get
+    infinite cost and are never followed.
+
+    Raises:
+        ValueError: For an unknown metric
+    """
+    weight = np.asarray(weight, dtype=np.float64)
+    positive = weight > 0
+    if metric == 'hops':
+        return np.where(positive, 1.0, np.inf)
+    if metric == 'strength':
+        peak = np.log1p(weight[positive].max()) if positive.any() else 1.0
+        cost = np.full_like(weight, np.inf)
+        cost[positive] = peak / np.log1p(weight[positive])
+        return cost
+    raise ValueError(f"Unknown metric '{metric}'. Expected one of: {', '.join(PATH_METRICS)}")
+
+
+class PathGraph:
+    """Undirected adjacency with one (cheapest) edge per node pair for a metric."""
+
+    def __init__(self, num_nodes: int, source: np.ndarray, target: np.ndarray, cost: np.ndarray):
+        """
+        Args:
+            num_nodes: Number of nodes
+            source: Source node position per edge
+            target: Target node position per edge
+            cost: Cost per edge (inf for edges not to follow)
+        """
+        source = np.asarray(source, dtype=np.int64)
+        target = np.asarray(target, dtype=np.int64)
+        positions = np.arange(len(source), dtype=np.int64)
+        usable = np.isfinite(cost) & (source != target)
+        rows = np.concatenate([source[usable], target[usable]])
+        cols = np.concatenate([target[usable], source[usable]])
+        costs = np.concatenate([cost[usable], cost[usable]])
+        edges = np.concatenate([positions[usable], positions[usable]])
+
+        # Cheapest edge per (row, col); lexsort is stable, so equal costs keep file order
+        order = np.lexsort((edges, costs, cols, rows))
+        rows, cols, costs, edges = rows[order], cols[order], costs[order], edges[order]
+        first = np.ones(len(rows), dtype=bool)
+        first[1:] = (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])
+        rows, cols, costs, edges = rows[first], cols[first], costs[first], edges[first]
+
+        self.num_nodes = num_nodes
+        self.matrix = sparse.csr_matrix((costs, (rows, cols)), shape=(num_nodes, num_nodes))
+        # Python lists for the heap-driven searches
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=num_nodes))]).tolist()
+        cols, costs, edges = cols.tolist(), costs.tolist(), edges.tolist()
+        self.adjacency: List[List[Tuple[int, float, int]]] = [
+            list(zip(cols[lo:hi], costs[lo:hi], edges[lo:hi]))
+            for lo, hi in zip(offsets[:-1], offsets[1:])
+        ]
+        self._links = {
+            (row, col): (edge, cost) for row, col, cost, edge in zip(rows.tolist(), cols, costs, edges)
+        }
+
+    def path_from_nodes(self, nodes: List[int]) -> Path:
+        """Path through a node sequence of adjacent nodes, with its edges and total cost."""
+        links = [self._links[(a, b)] for a, b in zip(nodes[:-1], nodes[1:])]
+        return Path(nodes=list(nodes), edges=[edge for edge, _ in links], cost=sum(cost for _, cost in links))
+
+    def bidirectional_dijkstra(
+        self,
+        start: int,
+        goal: int,
+        deadline: float,
+        banned_nodes: Set[int] = frozenset(),
+        banned_edges: Set[Tuple[int, int]] = frozenset()
+    ) -> Optional[Path]:
+        """
+        Cheapest path between two nodes, searching from both ends.
+
+        Args:
+            start: Start node position
+            goal: Goal node position
+            deadline: time.monotonic() value after which the search gives up
+            banned_nodes: Nodes the path may not visit
+            banned_edges: Node pairs (either direction) the path may not use
+
+        Returns:
+            The path, or None if the nodes are not connected
+
+        Raises:
+            BudgetExceeded: When the deadline passes
+        """
+        if start == goal:
+            return Path(nodes=[start], edges=[], cost=0.0)
+        dist = ({start: 0.0}, {goal: 0.0})
+        pred: Tuple[Dict[int, int], Dict[int, int]] = ({start: -1}, {goal: -1})
+        settled: Tuple[Set[int], Set[int]] = (set(), set())
+        heaps = ([(0.0, start)], [(0.0, goal)])
+        # Cheapest complete path so far: its cost and the edge joining the two searches
+        best, bridge = float('inf'), None
+        pops = 0
+
+        while heaps[0] and heaps[1]:
+            if heaps[0][0][0] + heaps[1][0][0] >= best:
+                break
+            side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+            d, node = heapq.heappop(heaps[side])
+            pops += 1
+            if pops % _DEADLINE_CHECK == 0 and time.monotonic() > deadline:
+                raise BudgetExceeded()
+            if node in settled[side]:
+                continue
+            settled[side].add(node)
+            own, other = dist[side], dist[1 - side]
+            for neighbor, cost, _ in self.adjacency[node]:
+                if neighbor in banned_nodes or (node, neighbor) in banned_edges or (neighbor, node) in banned_edges:
+                    continue
+                candidate = d + cost
+                if candidate < own.get(neighbor, float('inf')):
+                    own[neighbor] = candidate
+                    pred[side][neighbor] = node
+                    heapq.heappush(heaps[side], (candidate, neighbor))
+                if neighbor in other and candidate + other[neighbor] < best:
+                    best = candidate + other[neighbor]
+                    bridge = (node, neighbor) if side == 0 else (neighbor, node)
+
+        if bridge is None:
+            return None
+        nodes = []
+        node = bridge[0]
+        while node != -1:
+            nodes.append(node)
+            node = pred[0][node]
+        nodes.reverse()
+        node = bridge[1]
+        while node != -1:
+            nodes.append(node)
+            node = pred[1][node]
+        return self.path_from_nodes(nodes)
+
+
+class PathFinder:
+    """Path queries over one snapshot, with memoized single-source trees."""
+
+    def __init__(self, index: NetworkIndex):
+        """
+        Args:
+            index: NetworkIndex of the snapshot; graphs are built on first use
+        """
+        self.index = index
+        self._lock = threading.RLock()
+        self._graphs: Dict[str, PathGraph] = {}
+        self._trees: "OrderedDict[Tuple[str, int], np.ndarray]" = OrderedDict()
+        self._queries: Counter = Counter()
+
+    def graph(self, metric: str) -> PathGraph:
+        """Adjacency for a metric, built once."""
+        with self._lock:
+            if metric not in self._graphs:
+                network = self.index.network
+                self._graphs[metric] = PathGraph(
+                    self.index.num_nodes, network.source, network.target, edge_costs(network.weight, metric)
+                )
+            return self._graphs[metric]
+
+    def _tree(self, metric: str, node: int) -> Optional[np.ndarray]:
+        """
+        Shortest-path predecessors from a node, if it is popular enough to
+        have (or now deserve) a memoized tree.
+        """
+        key = (metric, node)
+        with self._lock:
+            tree = self._trees.get(key)
+            if tree is not None:
+                self._trees.move_to_end(key)
+                return tree
+            self._queries[key] += 1
+            if self._queries[key] < TREE_THRESHOLD:
+                return None
+        _, predecessors = dijkstra(self.graph(metric).matrix, indices=node, return_predecessors=True)
+        with self._lock:
+            self._trees[key] = predecessors
+            while len(self._trees) > TREE_CACHE_SIZE:
+                self._trees.popitem(last=False)
+        return predecessors
+
+    def _first_path(self, graph: PathGraph, metric: str, start: int, goal: int, deadline: float) -> Optional[Path]:
+        """Cheapest path, read from a memoized tree of either endpoint when there is one."""
+        for root, leaf in ((start, goal), (goal, start)):
+            predecessors = self._tree(metric, root)
+            if predecessors is None:
+                continue
+            # The root's own predecessor is negative too (scipy marks it -9999)
+            if leaf != root and predecessors[leaf] < 0:
+                return None
+            nodes = [leaf]
+            while nodes[-1] != root:
+                nodes.append(int(predecessors[nodes[-1]]))
+            # Walked from leaf to root; orient from start to goal
+            return graph.path_from_nodes(nodes if leaf == start else nodes[::-1])
+        return graph.bidirectional_dijkstra(start, goal, deadline)
+
+    def k_shortest(
+        self,
+        start: int,
+        goal: int,
+        k: int = 1,
+        metric: str = 'strength',
+        budget_ms: float = DEFAULT_BUDGET_MS
+    ) -> Tuple[List[Path], bool]:
+        """
+        Up to k loopless paths from start to goal, cheapest first (Yen's
+        algorithm).
+
+        Args:
+            start: Start node position
+            goal: Goal node position
+            k: Number of paths
+            metric: One of PATH_METRICS
+            budget_ms: Time budget; paths found before it runs out are returned
+
+        Returns:
+            (paths, whether the budget ran out before k paths were found)
+
+        Raises:
+            ValueError: For an unknown metric
+        """
+        deadline = time.monotonic() + budget_ms / 1000
+        graph = self.graph(metric)
+        if start == goal:
+            # The only loopless path is the node itself
+            return [graph.path_from_nodes([start])], False
+        try:
+            first = self._first_path(graph, metric, start, goal, deadline)
+        except BudgetExceeded:
+            return [], True
+        if first is None:
+            return [], False
+
+        paths = [first]
+        seen = {tuple(first.nodes)}
+        candidates: List[Tuple[float, int, Path]] = []
+        counter = 0
+        try:
+            while len(paths) < k:
+                previous = paths[-1]
+                for j in range(len(previous.nodes) - 1):
+                    root = previous.nodes[:j + 1]
+                    banned_edges = {
+                        (path.nodes[j], path.nodes[j + 1])
+                        for path in paths if len(path.nodes) > j + 1 and path.nodes[:j + 1] == root
+                    }
+                    spur = graph.bidirectional_dijkstra(
+                        root[-1], goal, deadline, banned_nodes=set(root[:-1]), banned_edges=banned_edges
+                    )
+                    if spur is None:
+                        continue
+                    nodes = tuple(root[:-1] + spur.nodes)
+                    if nodes in seen:
+                        continue
+                    seen.add(nodes)
+                    counter += 1
+                    candidate = graph.path_from_nodes(list(nodes))
+                    heapq.heappush(candidates, (candidate.cost, counter, candidate))
+                if not candidates:
+                    break
+                paths.append(heapq.heappop(candidates)[2])
+        except BudgetExceeded:
+            return paths, True
+        return paths, False
@@ -0,0 +1,252 @@
+"""
+Disease-to-disease similarity from gene and pathway profiles.
+Each disease's profile is the union of the shared genes and pathway terms
+on its edges. Profiles are sparse binary incidence rows, pairwise
+intersections are one sparse matrix product per block of rows, and only
+the top-k neighbors of each disease are kept. data_processor.py saves the
+table next to its output; the server loads it, or computes it on first use
+when it is missing or stale.
+"""
+
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from network_format import LoadedNetwork
+
+logger = logging.getLogger(__name__)
+
+SIMILARITY_METRICS = ('jaccard', 'overlap')
+DEFAULT_SIMILAR_K = 20
+
+# Upper bound on block_rows * num_nodes, i.e. on the pairwise intersections
+# held at once (even if every pair of diseases overlaps)
+BLOCK_ENTRIES = 1 << 24
+
+
+def similarity_path(output_path: Path) -> Path:
+    """Top-k similarity table written next to a processed output."""
+    return Path(f"{output_path}.similar.npz")
+
+
+def edge_term_matrix(offsets: np.ndarray, ids: np.ndarray, num_terms: int) -> sparse.csr_matrix:
+    """Binary edges x terms matrix from CSR term lists."""
+    offsets = np.asarray(offsets, dtype=np.int64)
+    ids = np.asarray(ids, dtype=np.int64)
+    return sparse.csr_matrix(
+        (np.ones(len(ids), dtype=np.float32), ids, offsets),
+        shape=(len(offsets) - 1, num_terms)
+    )
+
+
+def disease_profiles(network: LoadedNetwork) -> sparse.csr_matrix:
+    """
+    Binary diseases x (genes + pathways) incidence matrix: a disease has a
+    term when any of its edges lists it.
+    """
+    num_nodes = len(network.node_ids)
+    num_edges = network.num_edges
+    edge_terms = sparse.hstack([
+        edge_term_matrix(network.gene_offsets, network.gene_ids, len(network.gene_terms)),
+        edge_term_matrix(network.pathway_offsets, network.pathway_ids, len(network.pathway_terms))
+    ], format='csr')
+    # Diseases x edges: one entry for each endpoint of each edge
+    endpoints = sparse.csr_matrix(
+        (
+            np.ones(2 * num_edges, dtype=np.float32),
+            (
+                np.concatenate([network.source, network.target]).astype(np.int64),
+                np.tile(np.arange(num_edges), 2)
+            )
+        ),
+        shape=(num_nodes, num_edges)
+    )
+    profiles = (endpoints @ edge_terms).tocsr()
+    profiles.data[:] = 1.0
+    return profiles
+
+
+class SimilarityTable:
+    """Top-k most similar diseases per disease, for every metric."""
+
+    def __init__(
+        self,
+        neighbors: Dict[str, np.ndarray],
+        scores: Dict[str, np.ndarray],
+        shared: Dict[str, np.ndarray],
+        version: str = ''
+    ):
+        """
+        Args:
+            neighbors: Metric -> num_nodes x k neighbor positions, -1 padded
+            scores: Metric -> num_nodes x k similarity scores
+            shared: Metric -> num_nodes x k shared term counts
+            version: Dataset version the table was computed for
+        """
+        self.neighbors = neighbors
+        self.scores = scores
+        self.shared = shared
+        self.version = version
+
+    @property
+    def k(self) -> int:
+        return self.neighbors[SIMILARITY_METRICS[0]].shape[1]
+
+    @classmethod
+    def compute(
+        cls,
+        network: LoadedNetwork,
+        k: int = DEFAULT_SIMILAR_K,
+        version: str = '',
+        block_entries: int = BLOCK_ENTRIES
+    ) -> 'SimilarityTable':
+        """
+        Compute the top-k neighbors of every disease.
+
+        Rows are processed in blocks of about block_entries / num_nodes
+        diseases. For each block, X_block @ X.T gives the shared term counts
+        with every other disease as a dense block, from which Jaccard
+        (|A & B| / |A | B|) and overlap (|A & B| / min(|A|, |B|)) follow from
+        the profile sizes; a partial sort per row picks the top k. Ties are
+        broken by node position.
+
+        Args:
+            network: Loaded network
+            k: Neighbors kept per disease
+            version: Dataset version to record
+            block_entries: Bound on the intersections computed at once
+        """
+        profiles = disease_profiles(network)
+        num_nodes = profiles.shape[0]
+        sizes = np.asarray(profiles.sum(axis=1), dtype=np.float32).ravel()
+        transposed = profiles.T.tocsc()
+        block_rows = max(1, block_entries // max(num_nodes, 1))
+
+        neighbors = {metric: np.full((num_nodes, k), -1, dtype=np.int32) for metric in SIMILARITY_METRICS}
+        scores = {metric: np.zeros((num_nodes, k), dtype=np.float32) for metric in SIMILARITY_METRICS}
+        shared = {metric: np.zeros((num_nodes, k), dtype=np.int32) for metric in SIMILARITY_METRICS}
+
+        for lo in range(0, num_nodes, block_rows):
+            inter = (profiles[lo:lo + block_rows] @ transposed).toarray()
+            rows = np.arange(inter.shape[0])
+            inter[rows, rows + lo] = 0
+            size_a = sizes[lo:lo + block_rows, None]
+            with np.errstate(invalid='ignore', divide='ignore'):
+                metric_scores = {
+                    'jaccard': inter / (size_a + sizes - inter),
+                    'overlap': inter / np.minimum(size_a, sizes)
+                }
+            # Column of the k-th best score after an ascending partition
+            kth = num_nodes - min(k, num_nodes)
+            unrelated = inter == 0
+            for metric, score in metric_scores.items():
+                # Pairs without a shared term are never neighbors
+                score[unrelated] = -1
+                threshold = np.partition(score, kth, axis=1)[:, kth]
+                # Everything at or above the k-th best score, then exact
+                # ordering (ties by node position) on those few candidates
+                cand_rows, cand_cols = np.nonzero((score >= threshold[:, None]) & (score >= 0))
+                cand_scores = score[cand_rows, cand_cols]
+                order = np.lexsort((cand_cols, -cand_scores, cand_rows))
+                cand_rows, cand_cols, cand_scores = cand_rows[order], cand_cols[order], cand_scores[order]
+                rank = np.arange(len(order)) - np.searchsorted(cand_rows, cand_rows, side='left')
+                keep = rank < k
+                out_rows, out_rank, out_cols = cand_rows[keep] + lo, rank[keep], cand_cols[keep]
+                neighbors[metric][out_rows, out_rank] = out_cols
+                scores[metric][out_rows, out_rank] = cand_scores[keep]
+                shared[metric][out_rows, out_rank] = inter[out_rows - lo, out_cols]
+
+        return cls(neighbors, scores, shared, version)
+
+    def save(self, path: Path) -> None:
+        """Write the table as one .npz file (replaced atomically)."""
+        arrays = {'version': np.array(self.version)}
+        for metric in SIMILARITY_METRICS:
+            arrays[f'{metric}_neighbors'] = self.neighbors[metric]
+            arrays[f'{metric}_scores'] = self.scores[metric]
+            arrays[f'{metric}_shared'] = self.shared[metric]
+        tmp_path = Path(f"{path}.tmp")
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path, version: Optional[str] = None) -> Optional['SimilarityTable']:
+        """
+        Read a saved table.
+
+        Args:
+            path: .npz file
+            version: Expected dataset version; a table for another version is ignored
+
+        Returns:
+            The table, or None if the file is missing, unreadable or stale
+        """
+        try:
+            with np.load(path) as data:
+                saved_version = str(data['version'])
+                if version is not None and saved_version != version:
+                    logger.info(f"Ignoring similarity table for version {saved_version}")
+                    return None
+                return cls(
+                    {metric: data[f'{metric}_neighbors'] for metric in SIMILARITY_METRICS},
+                    {metric: data[f'{metric}_scores'] for metric in SIMILARITY_METRICS},
+                    {metric: data[f'{metric}_shared'] for metric in SIMILARITY_METRICS},
+                    saved_version
+                )
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def similar(self, node_pos: int, metric: str, limit: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Most similar diseases to one disease.
+
+        Returns:
+            (neighbor positions, scores, shared term counts), best first
+
+        Raises:
+            ValueError: For an unknown metric
+        """
+        if metric not in SIMILARITY_METRICS:
+            raise ValueError(f"Unknown metric '{metric}'. Expected one of: {', '.join(SIMILARITY_METRICS)}")
+        neighbors = self.neighbors[metric][node_pos]
+        count = int(np.count_nonzero(neighbors >= 0))
+        if limit is not None and limit > 0:
+            count = min(count, limit)
+        return neighbors[:count], self.scores[metric][node_pos, :count], self.shared[metric][node_pos, :count]
+
+
+class SimilarityIndex:
+    """
+    Similarity table of one snapshot: the one saved by data_processor.py
+    when it matches the loaded data, otherwise computed on first use.
+    """
+
+    def __init__(self, network: LoadedNetwork, path: Optional[Path] = None, version: str = ''):
+        """
+        Args:
+            network: Loaded network
+            path: File or directory the network was loaded from
+            version: Dataset version of the loaded network
+        """
+        self.network = network
+        self.version = version
+        self._table = SimilarityTable.load(similarity_path(path), version) if path is not None else None
+        self._lock = threading.Lock()
+
+    @property
+    def precomputed(self) -> bool:
+        return self._table is not None
+
+    def table(self) -> SimilarityTable:
+        """The table, computing it if none was saved for this version."""
+        with self._lock:
+            if self._table is None:
+                logger.info("No similarity table for the loaded data; computing it")
+                self._table = SimilarityTable.compute(self.network, version=self.version)
+            return self._table
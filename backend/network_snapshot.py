@@ -0,0 +1,168 @@
+"""
+Immutable snapshot of loaded network data and every index built on it.
+The server holds one snapshot reference; a reload builds a complete new
+snapshot off the request path and replaces the reference in a single
+assignment, so a request that started on the old snapshot finishes on it.
+"""
+
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from network_format import LoadedNetwork, JsonNetwork, StringTable, load_network, dataset_version
+from network_delta import NetworkDelta, PatchedNetwork, delta_path
+from network_index import NetworkIndex
+from edge_store import EdgeStore
+from network_stats import NetworkStatistics
+from term_index import TermIndex
+from search_index import SearchIndex
+from response_encoding import FragmentEncoder
+from network_analytics import NetworkAnalytics
+from network_paths import PathFinder
+from network_similarity import SimilarityIndex
+from network_coarsening import LevelOfDetail
+
+logger = logging.getLogger(__name__)
+
+
+class NetworkSnapshot:
+    """A loaded network with its indexes. Never modified after construction."""
+
+    def __init__(
+        self,
+        network: LoadedNetwork,
+        path: Optional[Path] = None,
+        version: str = "empty",
+        arrays: Optional[Dict[str, np.ndarray]] = None,
+        edge_fragments: Optional[Dict[Tuple[str, ...], StringTable]] = None
+    ):
+        """
+        Build all indexes over a loaded network.
+
+        Args:
+            network: Loaded network (JSON or columnar)
+            path: File or directory the network was loaded from
+            version: Dataset version (see dataset_version)
+            arrays: Prebuilt index arrays from shared_arrays() of a snapshot
+                of the same data, used instead of building them
+            edge_fragments: Pre-encoded edge tables per field projection
+        """
+        def component(prefix: str) -> Optional[Dict[str, np.ndarray]]:
+            if arrays is None:
+                return None
+            return {key[len(prefix) + 1:]: value for key, value in arrays.items() if key.startswith(prefix + '.')}
+
+        self.network = network
+        self.path = path
+        self.version = version
+        self.loaded = path is not None
+        self.loaded_at = time.time()
+        self.index = NetworkIndex(network, component('index'))
+        self.edge_store = EdgeStore(self.index, component('edges'))
+        self.stats = NetworkStatistics.from_edge_store(self.edge_store)
+        self.gene_index = TermIndex(
+            network.gene_offsets, network.gene_ids, network.gene_terms, component('genes')
+        )
+        self.pathway_index = TermIndex(
+            network.pathway_offsets, network.pathway_ids, network.pathway_terms, component('pathways')
+        )
+        self.search_index = SearchIndex(self.index.nodes, self.index.degrees)
+        self.fragments = FragmentEncoder(network, edge_fragments)
+        # Computed on first use, then kept for the snapshot's lifetime
+        self.analytics = NetworkAnalytics(self.index)
+        self.paths = PathFinder(self.index)
+        self.similarity = SimilarityIndex(network, path, version)
+        self.level_of_detail = LevelOfDetail(self.edge_store, self.analytics)
+
+    def shared_arrays(self) -> Dict[str, np.ndarray]:
+        """Every edge-sized index array, keyed '<component>.<name>', for the arrays argument."""
+        components = {
+            'index': self.index, 'edges': self.edge_store,
+            'genes': self.gene_index, 'pathways': self.pathway_index
+        }
+        return {
+            f"{prefix}.{name}": value
+            for prefix, component in components.items()
+            for name, value in component.shared_arrays().items()
+        }
+
+    @classmethod
+    def empty(cls) -> 'NetworkSnapshot':
+        """Snapshot served before any data is loaded."""
+        return cls(JsonNetwork({"nodes": [], "edges": []}))
+
+    @classmethod
+    def load(cls, path: Path, previous: Optional['NetworkSnapshot'] = None) -> 'NetworkSnapshot':
+        """
+        Load a processed network file or directory and index it.
+
+        Args:
+            path: File or directory to load
+            previous: Snapshot currently served. If the delta file next to
+                path leads from its version to the version on disk, the
+                delta is applied to it instead of parsing the whole output.
+        """
+        # Version first: if the files change while loading, the next
+        # check sees a different version and loads again
+        version = dataset_version(path)
+        if previous is not None and previous.loaded:
+            delta = NetworkDelta.load(delta_path(path))
+            if delta is not None and delta.base_version == previous.version and delta.version == version:
+                logger.info(
+                    f"Applying delta: {len(delta.upserted)} edges upserted, {len(delta.removed)} removed"
+                )
+                return cls(PatchedNetwork(previous.network, delta), path=Path(path), version=version)
+        return cls(load_network(path), path=Path(path), version=version)
+
+
+class DataWatcher:
+    """Background thread that polls processed data and triggers reloads."""
+
+    def __init__(
+        self,
+        resolve_path: Callable[[], Path],
+        current_version: Callable[[], str],
+        reload: Callable[[], bool],
+        interval: float,
+        latest_version: Optional[Callable[[], Optional[str]]] = None
+    ):
+        """
+        Args:
+            resolve_path: Returns the file or directory to watch
+            current_version: Returns the version of the served snapshot
+            reload: Loads and swaps in a new snapshot
+            interval: Seconds between checks
+            latest_version: Returns the version to serve, or None to skip a
+                check (default: the dataset_version of the watched files)
+        """
+        self.resolve_path = resolve_path
+        self.latest_version = latest_version or (lambda: dataset_version(self.resolve_path()))
+        self.current_version = current_version
+        self.reload = reload
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="network-data-watcher", daemon=True)
+        # Version that failed to load; not retried until the files change again
+        self._failed_version: Optional[str] = None
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=self.interval + 1)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                version = self.latest_version()
+            except OSError:
+                # Missing, or mid-swap by the processor; check again later
+                continue
+            if version is not None and version != self.current_version() and version != self._failed_version:
+                logger.info(f"Processed network data changed (version {version}), reloading")
+                self._failed_version = None if self.reload() else version
@@ -0,0 +1,175 @@
+"""
+Weight and interpretability statistics for the disease network.
+Shared by the API server and data_processor.py so both report identical
+numbers; the server computes them once per loaded dataset.
+"""
+
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_HISTOGRAM_BINS = 50
+HISTOGRAM_SCALES = ('linear', 'log')
+
+
+class NetworkStatistics:
+    """Precomputed summary statistics over edge weights."""
+
+    def __init__(
+        self,
+        weights: Iterable[float],
+        interpretability_counts: Dict[str, int],
+        num_nodes: int = 0,
+        presorted: bool = False
+    ):
+        """
+        Compute statistics from raw edge attributes.
+
+        Args:
+            weights: Weight of every edge, in any order
+            interpretability_counts: Number of edges per interpretability label
+            num_nodes: Number of nodes in the network
+            presorted: Weights are already ascending after any NaNs (as a
+                reversed EdgeStore column is), so they are used without a sorted copy
+        """
+        weights = np.asarray(weights, dtype=np.float64)
+        self.num_nodes = num_nodes
+        self.num_edges = len(weights)
+        # NaN weights are ignored, as pandas does
+        if presorted:
+            self.sorted_weights = weights[int(np.count_nonzero(np.isnan(weights))):]
+        else:
+            self.sorted_weights = np.sort(weights[~np.isnan(weights)])
+        self.interpretability_counts = dict(interpretability_counts)
+
+        if len(self.sorted_weights):
+            self.weight_min = float(self.sorted_weights[0])
+            self.weight_max = float(self.sorted_weights[-1])
+            self.weight_mean = float(self.sorted_weights.mean())
+        else:
+            self.weight_min = self.weight_max = self.weight_mean = 0
+
+        self._histograms: Dict[Tuple[int, str], Dict[str, Any]] = {}
+        self.histogram(DEFAULT_HISTOGRAM_BINS)
+        self._summary = self._build_summary()
+
+    @classmethod
+    def from_edge_store(cls, edge_store) -> 'NetworkStatistics':
+        """Build statistics from the columns of an EdgeStore."""
+        counts = np.bincount(edge_store.interp_code, minlength=len(edge_store.interp_codes))
+        # Descending with NaNs last, so reversed it is ascending after the NaNs
+        return cls(
+            edge_store.weight[::-1],
+            {label: int(counts[code]) for label, code in edge_store.interp_codes.items()},
+            num_nodes=edge_store.num_nodes,
+            presorted=True
+        )
+
+    def quantile(self, q: float) -> float:
+        """
+        Weight quantile with linear interpolation (pandas' default).
+
+        Args:
+            q: Quantile in [0, 1]
+
+        Returns:
+            Interpolated weight, or 0 for an empty network
+        """
+        weights = self.sorted_weights
+        if not len(weights):
+            return 0
+        # Weights are already sorted, so this is O(1) per quantile
+        k = (len(weights) - 1) * q
+        f = int(np.floor(k))
+        c = min(f + 1, len(weights) - 1)
+        return float(weights[f] + (weights[c] - weights[f]) * (k - f))
+
+    def quantiles(self, qs: List[float]) -> Dict[str, float]:
+        """Several quantiles keyed by their string form."""
+        return {str(q): self.quantile(q) for q in qs}
+
+    def interpretable_count(self, label: str) -> int:
+        """Number of edges carrying an interpretability label."""
+        return self.interpretability_counts.get(label, 0)
+
+    def histogram(self, bins: int = DEFAULT_HISTOGRAM_BINS, scale: str = 'linear') -> Dict[str, Any]:
+        """
+        Fixed-bin weight histogram, memoized per (bins, scale).
+
+        Args:
+            bins: Number of equal-width bins
+            scale: 'linear' bins, or 'log' for equal width in log10(weight)
+
+        Returns:
+            Dictionary with bin 'edges' (bins + 1 values) and 'counts'
+        """
+        key = (bins, scale)
+        cached = self._histograms.get(key)
+        if cached is not None:
+            return cached
+
+        weights = self.sorted_weights
+        if scale == 'log':
+            weights = weights[weights > 0]
+        if not len(weights):
+            result = {'bins': bins, 'scale': scale, 'edges': [], 'counts': []}
+        else:
+            low, high = float(weights[0]), float(weights[-1])
+            if scale == 'log':
+                edges = np.logspace(np.log10(low), np.log10(high), bins + 1)
+            else:
+                edges = np.linspace(low, high, bins + 1)
+            # Weights are sorted, so bin boundaries are binary searches.
+            # The outer bins are pinned to cover min and max exactly, since
+            # logspace endpoints can drift by an ulp.
+            boundaries = np.searchsorted(weights, edges, side='left')
+            boundaries[0] = 0
+            boundaries[-1] = len(weights)
+            result = {
+                'bins': bins,
+                'scale': scale,
+                'edges': edges.tolist(),
+                'counts': np.diff(boundaries).tolist()
+            }
+
+        self._histograms[key] = result
+        return result
+
+    def summary(self, extra_quantiles: Optional[List[float]] = None) -> Dict[str, Any]:
+        """
+        Statistics in the /stats response format.
+
+        Args:
+            extra_quantiles: Additional quantiles to report
+
+        Returns:
+            Dictionary with counts, weight range, percentiles and interpretability
+        """
+        if not extra_quantiles:
+            return self._summary
+        return {**self._summary, "weight_quantiles": self.quantiles(extra_quantiles)}
+
+    def _build_summary(self) -> Dict[str, Any]:
+        """Assemble the cached base summary."""
+        yes = self.interpretable_count('YES')
+        no = self.interpretable_count('NO')
+        total = self.num_edges
+
+        return {
+            "total_nodes": self.num_nodes,
+            "total_edges": total,
+            "weight_range": {
+                "min": self.weight_min,
+                "max": self.weight_max
+            },
+            "weight_mean": self.weight_mean,
+            "weight_percentiles": {
+                "50th": self.quantile(0.5),
+                "75th": self.quantile(0.75),
+                "90th": self.quantile(0.9)
+            },
+            "interpretable_count": yes,
+            "uninterpretable_count": no,
+            "interpretable_percentage": f"{(yes / total * 100):.1f}%" if total else "0%",
+            "uninterpretable_percentage": f"{(no / total * 100):.1f}%" if total else "0%"
+        }
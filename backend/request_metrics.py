@@ -0,0 +1,386 @@
+"""
+Request metrics and on-demand profiling for the API.
+An ASGI middleware times every request and records per-endpoint latency
+and response size histograms. Handlers add the time spent in each phase
+(filtering, serialization, compression) and their cache outcome to the
+current request through phase() and record_cache(). Everything is
+exposed in the Prometheus text format by MetricsRegistry.render(). When
+enabled, a request sent with an X-Profile header is sampled by a
+background thread and its stacks written in the folded format that
+flamegraph.pl, speedscope and inferno read.
+"""
+
+import bisect
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import anyio
+
+logger = logging.getLogger(__name__)
+
+# Bucket upper bounds (seconds) for request, phase and load durations
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+# Bucket upper bounds for response bodies (bytes) and result sizes (items)
+SIZE_BUCKETS = tuple(float(4 ** exponent) for exponent in range(4, 15))
+COUNT_BUCKETS = (1.0, 10.0, 100.0, 1_000.0, 10_000.0, 100_000.0, 1_000_000.0)
+
+# Endpoint label of requests that matched no route (keeps label values bounded)
+UNMATCHED = "unmatched"
+
+DEFAULT_PROFILE_INTERVAL_MS = 2.0
+# Stack frames in these files are a thread waiting for work, not doing it
+_IDLE_FILES = ('threading.py', 'selectors.py', 'queue.py', 'base_events.py')
+
+
+LabelSet = Tuple[Tuple[str, str], ...]
+
+
+def format_labels(labels: LabelSet) -> str:
+    """Prometheus label block, e.g. '{endpoint="/network",phase="filter"}'."""
+    if not labels:
+        return ''
+    pairs = (
+        name + '="' + value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+        for name, value in labels
+    )
+    return '{' + ','.join(pairs) + '}'
+
+
+def format_value(value: float) -> str:
+    """Sample value without losing precision (e.g. Unix timestamps)."""
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Histogram:
+    """Cumulative-bucket histogram of one labelled series (not locked; see MetricsRegistry)."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def lines(self, name: str, labels: LabelSet) -> Iterator[str]:
+        """Exposition lines: cumulative _bucket series, then _sum and _count."""
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            cumulative += count
+            le = '+Inf' if bound == float('inf') else f'{bound:g}'
+            yield f"{name}_bucket{format_labels(labels + (('le', le),))} {cumulative}"
+        yield f"{name}_sum{format_labels(labels)} {self.sum:.6f}"
+        yield f"{name}_count{format_labels(labels)} {self.count}"
+
+
+@dataclass
+class MetricFamily:
+    """All series of one metric name."""
+    kind: str
+    help: str
+    buckets: Optional[Tuple[float, ...]] = None
+    series: Dict[LabelSet, object] = field(default_factory=dict)
+
+
+class MetricsRegistry:
+    """Thread-safe counters, gauges and histograms, rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self._families: Dict[str, MetricFamily] = {}
+        self._lock = threading.Lock()
+
+    def _family(self, name: str, kind: str, help: str, buckets: Optional[Sequence[float]] = None) -> MetricFamily:
+        family = self._families.get(name)
+        if family is None:
+            family = self._families[name] = MetricFamily(kind, help, tuple(buckets) if buckets else None)
+        return family
+
+    def counter(self, name: str, help: str, labels: Dict[str, str] = None, amount: float = 1) -> None:
+        """Increase a counter."""
+        key = tuple(sorted((labels or {}).items()))
+        with self._lock:
+            series = self._family(name, 'counter', help).series
+            series[key] = series.get(key, 0) + amount
+
+    def gauge(self, name: str, help: str, value: float, labels: Dict[str, str] = None) -> None:
+        """Set a gauge."""
+        key = tuple(sorted((labels or {}).items()))
+        with self._lock:
+            self._family(name, 'gauge', help).series[key] = value
+
+    def observe(
+        self,
+        name: str,
+        help: str,
+        value: float,
+        labels: Dict[str, str] = None,
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> None:
+        """Add an observation to a histogram."""
+        key = tuple(sorted((labels or {}).items()))
+        with self._lock:
+            family = self._family(name, 'histogram', help, buckets)
+            histogram = family.series.get(key)
+            if histogram is None:
+                histogram = family.series[key] = Histogram(family.buckets)
+            histogram.observe(value)
+
+    def render(self, extra: Sequence[Tuple[str, str, str, Dict[LabelSet, float]]] = ()) -> str:
+        """
+        Prometheus text exposition of every metric.
+
+        Args:
+            extra: (name, kind, help, {labels: value}) families computed at
+                scrape time (e.g. cache counters kept elsewhere)
+        """
+        out: List[str] = []
+        with self._lock:
+            families = [
+                (name, family.kind, family.help, dict(family.series)) for name, family in self._families.items()
+            ]
+            for name, kind, help_text, series in families + list(extra):
+                out.append(f"# HELP {name} {help_text}")
+                out.append(f"# TYPE {name} {kind}")
+                for labels, value in sorted(series.items()):
+                    if isinstance(value, Histogram):
+                        out.extend(value.lines(name, labels))
+                    else:
+                        out.append(f"{name}{format_labels(labels)} {format_value(value)}")
+        return '\n'.join(out) + '\n'
+
+
+@dataclass
+class RequestTimings:
+    """What handlers report about the request being served."""
+    phases: Dict[str, float] = field(default_factory=dict)
+    cache: Optional[str] = None
+    result_items: Optional[int] = None
+    profiling: bool = False
+
+
+# Set by the middleware for the duration of each request. Worker threads
+# started through run_in_threadpool see the same object, as anyio copies
+# the context into them.
+_current: ContextVar[Optional[RequestTimings]] = ContextVar('request_timings', default=None)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Add the time spent in the block to a phase of the current request."""
+    timings = _current.get()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timings is not None:
+            timings.phases[name] = timings.phases.get(name, 0.0) + time.perf_counter() - start
+
+
+def record_cache(outcome: str) -> None:
+    """Record the response cache outcome (hit/miss/not_modified) of the current request."""
+    timings = _current.get()
+    if timings is not None:
+        timings.cache = outcome
+
+
+def profiling() -> bool:
+    """Whether the current request is being profiled (and should bypass caches)."""
+    timings = _current.get()
+    return timings is not None and timings.profiling
+
+
+def record_result_items(count: int) -> None:
+    """Record how many elements (e.g. edges) the current request returned."""
+    timings = _current.get()
+    if timings is not None:
+        timings.result_items = count
+
+
+class StackSampler:
+    """
+    Samples the Python stacks of every busy thread at a fixed interval.
+
+    Under concurrent load the samples include other requests running at the
+    same time, which is usually what is wanted when looking for hot paths.
+    """
+
+    def __init__(self, interval: float):
+        """
+        Args:
+            interval: Seconds between samples
+        """
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> 'StackSampler':
+        self._thread.start()
+        return self
+
+    def stop(self, wait: bool = True) -> None:
+        """Stop sampling; with wait, also until the sampler thread has exited."""
+        self._stop.set()
+        if wait:
+            self._thread.join()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.samples += 1
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                # Leaf frame waiting on a lock, queue or selector: idle thread
+                if stack and stack[0].split(' (')[1].startswith(_IDLE_FILES):
+                    continue
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def folded(self) -> str:
+        """Stacks in the folded format ('root;...;leaf count' per line)."""
+        return ''.join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request latency, response size, phase times
+    and cache outcomes per endpoint, and running the sampling profiler for
+    requests that ask for it.
+    """
+
+    def __init__(
+        self,
+        app,
+        registry: MetricsRegistry,
+        profile_dir: Optional[Path] = None,
+        profile_token: Optional[str] = None,
+        profile_interval_ms: float = DEFAULT_PROFILE_INTERVAL_MS
+    ):
+        """
+        Args:
+            app: Wrapped ASGI application
+            registry: Where metrics are recorded
+            profile_dir: Directory for profiles; None disables profiling
+            profile_token: When set, the X-Profile header must carry this value
+            profile_interval_ms: Sampling interval of the profiler
+        """
+        self.app = app
+        self.registry = registry
+        self.profile_dir = profile_dir
+        self.profile_token = profile_token
+        self.profile_interval = profile_interval_ms / 1000
+
+    def _profile_requested(self, scope) -> bool:
+        if self.profile_dir is None:
+            return False
+        for name, value in scope.get('headers', ()):
+            if name == b'x-profile':
+                value = value.decode('latin-1')
+                return value == self.profile_token if self.profile_token else value not in ('', '0')
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings(profiling=self._profile_requested(scope))
+        token = _current.set(timings)
+        status = 500
+        size = 0
+        sampler = None
+        profile_path = None
+        if timings.profiling:
+            safe_path = re.sub(r'[^A-Za-z0-9]+', '_', scope['path']).strip('_') or 'root'
+            profile_path = self.profile_dir / f"{time.strftime('%Y%m%d-%H%M%S')}-{time.time_ns() % 10**9:09d}-{safe_path}.folded"
+            sampler = StackSampler(self.profile_interval).start()
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message['type'] == 'http.response.start':
+                status = message['status']
+                if profile_path is not None:
+                    message = {
+                        **message,
+                        'headers': list(message.get('headers', [])) + [(b'x-profile-file', profile_path.name.encode())]
+                    }
+            elif message['type'] == 'http.response.body':
+                size += len(message.get('body', b''))
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            _current.reset(token)
+            route = scope.get('route')
+            endpoint = getattr(route, 'path', None) or UNMATCHED
+            self._record(scope['method'], endpoint, status, elapsed, size, timings)
+            if sampler is not None:
+                # Stop sampling now, but join the thread and write the file
+                # in a worker thread: both block, and this runs on the event loop
+                sampler.stop(wait=False)
+                await anyio.to_thread.run_sync(self._finish_profile, profile_path, sampler)
+
+    def _record(
+        self, method: str, endpoint: str, status: int, elapsed: float, size: int, timings: RequestTimings
+    ) -> None:
+        labels = {'endpoint': endpoint, 'method': method}
+        registry = self.registry
+        registry.counter("http_requests_total", "Requests served", {**labels, 'status': str(status)})
+        registry.observe("http_request_duration_seconds", "Time to send the complete response", elapsed, labels)
+        registry.observe(
+            "http_response_size_bytes", "Response body size as sent (after compression)", size, labels, SIZE_BUCKETS
+        )
+        for name, seconds in timings.phases.items():
+            registry.observe(
+                "http_request_phase_seconds",
+                "Time spent per request phase (filter, serialize, layout, compress; build is the total of an uncached build)",
+                seconds, {'endpoint': endpoint, 'phase': name}
+            )
+        if timings.cache is not None:
+            registry.counter(
+                "http_cache_requests_total", "Response cache outcomes per endpoint",
+                {'endpoint': endpoint, 'result': timings.cache}
+            )
+        if timings.result_items is not None:
+            registry.observe(
+                "http_result_items", "Elements (e.g. edges) returned per request",
+                timings.result_items, {'endpoint': endpoint}, COUNT_BUCKETS
+            )
+
+    def _finish_profile(self, path: Path, sampler: StackSampler) -> None:
+        sampler.stop()
+        self._write_profile(path, sampler)
+
+    def _write_profile(self, path: Path, sampler: StackSampler) -> None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(sampler.folded(), encoding='utf-8')
+            logger.info(f"Wrote profile with {sampler.samples} samples to {path}")
+        except OSError as e:
+            logger.error(f"Could not write profile {path}: {e}")
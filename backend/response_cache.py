@@ -0,0 +1,113 @@
+"""
+Response cache for repeated API queries.
+Stores pre-serialized response bodies in an LRU bounded by total bytes,
+keyed by dataset version and normalized query parameters, and derives
+ETags from the same key so conditional GETs can be answered with 304
+without rebuilding the response.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Any, Hashable, Optional
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Clients may reuse a response but must revalidate it; revalidation is a
+# cheap 304 as long as the dataset has not changed
+CACHE_CONTROL = "public, max-age=0, must-revalidate"
+
+
+@dataclass
+class CachedResponse:
+    """A serialized (possibly compressed) response body and its ETag."""
+    body: bytes
+    etag: str
+    encoding: Optional[str] = None
+
+
+def make_etag(version: str, key: Hashable, weak: bool = False) -> str:
+    """
+    ETag for a query against a dataset version.
+
+    Weak ETags are for bodies that are equivalent, but not byte-identical,
+    each time they are rebuilt.
+    """
+    digest = hashlib.blake2b(f"{version}|{key!r}".encode('utf-8'), digest_size=12).hexdigest()
+    return f'W/"{digest}"' if weak else f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header value matches an ETag."""
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(',')]
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    opaque = etag.removeprefix('W/')
+    return '*' in candidates or any(value.removeprefix('W/') == opaque for value in candidates)
+
+
+class ResponseCache:
+    """Thread-safe LRU of serialized responses, bounded by total body size."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Args:
+            max_bytes: Upper bound on the summed size of cached bodies
+        """
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        """Look up a response, marking it most recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Hashable, entry: CachedResponse) -> None:
+        """Store a response, evicting least recently used entries to fit."""
+        size = len(entry.body)
+        if size > self.max_bytes:
+            # Too large to cache without evicting everything else
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size_bytes -= len(previous.body)
+            while self._entries and self.size_bytes + size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size_bytes -= len(evicted.body)
+                self.evictions += 1
+            self._entries[key] = entry
+            self.size_bytes += size
+
+    def clear(self) -> None:
+        """Drop every entry (e.g. when the dataset is reloaded)."""
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self.size_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
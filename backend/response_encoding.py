@@ -0,0 +1,174 @@
+"""
+JSON encoding and compression for API responses.
+Network responses are assembled from per-node and per-edge JSON fragments
+that are encoded once with orjson and reused by every later request, then
+compressed with brotli (when installed) or gzip according to the client's
+Accept-Encoding header.
+"""
+
+import gzip
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import orjson
+
+try:
+    import brotli
+except ImportError:
+    # brotli is optional; gzip is always available
+    brotli = None
+
+from network_format import LoadedNetwork, StringTable, StringTableWriter, EDGE_FIELDS, EDGE_VIEWS, edge_field_set
+
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_SIZE = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def dumps(payload: Any) -> bytes:
+    """Encode a payload as compact UTF-8 JSON."""
+    return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def encode_array(fragments: Iterable[bytes]) -> bytes:
+    """JSON array from already-encoded elements."""
+    return b'[' + b','.join(fragments) + b']'
+
+
+def encode_object(fields: Iterable[Tuple[str, bytes]]) -> bytes:
+    """JSON object from field names and already-encoded values, in order."""
+    return b'{' + b','.join(dumps(name) + b':' + value for name, value in fields) + b'}'
+
+
+def supported_encodings() -> Tuple[str, ...]:
+    """Content codings the server can produce, most preferred first."""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Pick a content coding from an Accept-Encoding header.
+
+    Args:
+        accept_encoding: Header value, e.g. "gzip, deflate, br;q=0.9"
+
+    Returns:
+        'br' or 'gzip', or None to send the body uncompressed
+    """
+    if not accept_encoding:
+        return None
+    weights = {}
+    for item in accept_encoding.split(','):
+        coding, _, params = item.partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[coding.strip().lower()] = quality
+
+    best, best_quality = None, 0.0
+    for coding in supported_encodings():
+        quality = weights.get(coding, weights.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def compress_body(body: bytes, encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+    """
+    Compress a body with a negotiated coding.
+
+    Returns:
+        (body, coding actually applied or None)
+    """
+    if encoding is None or len(body) < MIN_COMPRESS_SIZE:
+        return body, None
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY), 'br'
+    # Fixed mtime so identical bodies compress to identical bytes
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0), 'gzip'
+
+
+class FragmentEncoder:
+    """
+    Per-node and per-edge JSON fragments of a loaded network, encoded on first use.
+
+    Edge fragments are kept for the named views (EDGE_VIEWS), so a slim
+    response is a join of ready-made fragments rather than a copy of each
+    full edge with fields stripped. Other `fields=` projections are encoded
+    per request: each memoized projection costs a list as long as the edge
+    count, and clients can ask for arbitrarily many. Projections can also
+    be encoded for every edge up front into a string table
+    (write_edge_table) that several server processes map and read instead
+    of encoding their own.
+    """
+
+    def __init__(self, network: LoadedNetwork, shared_edges: Optional[Dict[Tuple[str, ...], StringTable]] = None):
+        """
+        Args:
+            network: Loaded network (JSON or columnar)
+            shared_edges: Pre-encoded edge tables per field projection
+        """
+        self.network = network
+        self._nodes: List[Optional[bytes]] = [None] * len(network.nodes)
+        self._edges: Dict[Tuple[str, ...], List[Optional[bytes]]] = {}
+        self._shared_edges = shared_edges or {}
+        self._memoized_fields = {edge_field_set(fields) for fields in EDGE_VIEWS.values()}
+
+    def node(self, pos: int) -> bytes:
+        """Encoded node dict at a node position."""
+        fragment = self._nodes[pos]
+        if fragment is None:
+            fragment = self._nodes[pos] = dumps(self.network.nodes[pos])
+        return fragment
+
+    def _edge_table(self, fields: Tuple[str, ...]) -> List[Optional[bytes]]:
+        table = self._edges.get(fields)
+        if table is None:
+            table = self._edges[fields] = [None] * self.network.num_edges
+        return table
+
+    def edge(self, pos: int, fields: Tuple[str, ...] = EDGE_FIELDS, memoize: bool = True) -> bytes:
+        """
+        Encoded edge dict at an edge position, restricted to the given fields.
+
+        Args:
+            pos: Edge position
+            fields: Data fields to include, normalized by edge_field_set
+            memoize: Keep the fragment for later requests (named views
+                only). Streaming exports pass False so a full scan does not
+                pin every edge in memory; fragments that are already encoded
+                are still reused.
+        """
+        shared = self._shared_edges.get(fields)
+        if shared is not None:
+            return shared.raw(pos)
+        memoize = memoize and fields in self._memoized_fields
+        table = self._edge_table(fields) if memoize else self._edges.get(fields)
+        fragment = table[pos] if table is not None else None
+        if fragment is None:
+            fragment = dumps(self.network.edge(pos, fields))
+            if memoize:
+                table[pos] = fragment
+        return fragment
+
+    def write_edge_table(self, fields: Tuple[str, ...], directory: Path, name: str, batch_size: int = 10_000) -> None:
+        """Encode one projection of every edge into a string table (name.bin + name.offsets.npy)."""
+        table = StringTableWriter(directory, name)
+        for lo in range(0, self.network.num_edges, batch_size):
+            hi = min(lo + batch_size, self.network.num_edges)
+            table.append_encoded([self.edge(pos, fields, memoize=False) for pos in range(lo, hi)])
+        table.close()
+
+    def nodes(self, positions: np.ndarray) -> bytes:
+        """JSON array of the nodes at the given positions."""
+        return encode_array(self.node(pos) for pos in np.asarray(positions).tolist())
+
+    def edges(self, positions: np.ndarray, fields: Tuple[str, ...] = EDGE_FIELDS) -> bytes:
+        """JSON array of the edges at the given positions."""
+        return encode_array(self.edge(pos, fields) for pos in np.asarray(positions).tolist())
@@ -0,0 +1,166 @@
+"""
+Disease search index for type-ahead queries.
+Built once at load time over node labels (as produced by
+extract_disease_name) and node IDs. Substring candidates come from trigram
+posting lists (one- and two-character queries have their own posting
+lists of every character and character pair), and misspelled queries fall
+back to trigram similarity.
+"""
+
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+
+# Minimum share of the keyword's trigrams a label must contain to be a
+# fuzzy match (coverage rather than Jaccard, so long labels are not
+# penalized for type-ahead prefixes)
+FUZZY_THRESHOLD = 0.5
+
+# Match tiers, best first
+MATCH_EXACT = 'exact'
+MATCH_PREFIX = 'prefix'
+MATCH_WORD = 'word_prefix'
+MATCH_SUBSTRING = 'substring'
+MATCH_FUZZY = 'fuzzy'
+_TIERS = {MATCH_EXACT: 0, MATCH_PREFIX: 1, MATCH_WORD: 2, MATCH_SUBSTRING: 3, MATCH_FUZZY: 4}
+
+
+def trigrams(text: str) -> set:
+    """Set of character trigrams in a string."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def short_grams(text: str) -> set:
+    """Set of single characters and character pairs in a string."""
+    return set(text) | {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def _postings(grams_per_node: List[set]) -> Dict[str, np.ndarray]:
+    """Invert per-node gram sets into sorted node-position arrays."""
+    postings: Dict[str, List[int]] = {}
+    for pos, grams in enumerate(grams_per_node):
+        for gram in grams:
+            postings.setdefault(gram, []).append(pos)
+    return {gram: np.array(nodes, dtype=np.int64) for gram, nodes in postings.items()}
+
+
+class SearchIndex:
+    """Trigram index over disease labels and IDs with ranked matching."""
+
+    def __init__(self, nodes: List[Dict[str, Any]], degrees: np.ndarray):
+        """
+        Build the index.
+
+        Args:
+            nodes: Node dicts ({'data': {'id', 'label'}})
+            degrees: Edge count per node position, used to rank ties
+        """
+        self.nodes = nodes
+        self.degrees = np.asarray(degrees, dtype=np.int64)
+        self.labels = [node['data']['label'].lower() for node in nodes]
+        self.ids = [node['data']['id'].lower() for node in nodes]
+
+        # Substring candidates: trigrams of label and ID
+        self._substring_postings = _postings([
+            trigrams(label) | trigrams(node_id) for label, node_id in zip(self.labels, self.ids)
+        ])
+        # One- and two-character queries: the postings are the matches
+        self._short_postings = _postings([
+            short_grams(label) | short_grams(node_id) for label, node_id in zip(self.labels, self.ids)
+        ])
+        # Fuzzy matching: trigrams of the space-padded label
+        self._fuzzy_postings = _postings([trigrams(f"  {label} ") for label in self.labels])
+
+    def _substring_matches(self, keyword: str) -> List[int]:
+        """Positions of nodes whose label or ID contains the keyword."""
+        if not keyword:
+            return list(range(len(self.nodes)))
+        if len(keyword) < 3:
+            posting = self._short_postings.get(keyword)
+            return posting.tolist() if posting is not None else []
+        postings = []
+        for gram in trigrams(keyword):
+            posting = self._substring_postings.get(gram)
+            if posting is None:
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+        candidates = postings[0]
+        for posting in postings[1:]:
+            candidates = np.intersect1d(candidates, posting, assume_unique=True)
+        # Trigrams only narrow the candidates; confirm the full substring
+        return [
+            pos for pos in candidates.tolist()
+            if keyword in self.labels[pos] or keyword in self.ids[pos]
+        ]
+
+    def _tier(self, keyword: str, pos: int) -> str:
+        label = self.labels[pos]
+        if label == keyword:
+            return MATCH_EXACT
+        if label.startswith(keyword):
+            return MATCH_PREFIX
+        if f" {keyword}" in label or self.ids[pos].startswith(keyword):
+            return MATCH_WORD
+        return MATCH_SUBSTRING
+
+    def _fuzzy_matches(self, keyword: str, exclude: set) -> List[Tuple[int, float]]:
+        """(position, similarity) of nodes with similar labels, best first."""
+        grams = trigrams(f"  {keyword} ")
+        postings = [self._fuzzy_postings[gram] for gram in grams if gram in self._fuzzy_postings]
+        if not postings:
+            return []
+        shared = np.bincount(np.concatenate(postings), minlength=len(self.nodes))
+        similarity = shared / len(grams)
+        candidates = np.flatnonzero(similarity >= FUZZY_THRESHOLD)
+        # Best similarity first, then most connected
+        order = np.lexsort((-self.degrees[candidates], -similarity[candidates]))
+        return [
+            (int(pos), float(similarity[pos]))
+            for pos in candidates[order].tolist() if pos not in exclude
+        ]
+
+    def search(self, keyword: str, limit: Optional[int] = None, fuzzy: bool = True) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Ranked disease search.
+
+        Substring matches are ranked exact > label prefix > word prefix >
+        substring, then by edge count. Fuzzy matches fill the remaining
+        slots when enabled: when substring matches are fewer than the
+        limit, or, without a limit, when there are none.
+
+        Args:
+            keyword: Search keyword
+            limit: Maximum number of results
+            fuzzy: Add trigram-similarity matches for misspelled queries
+
+        Returns:
+            (results, total number of matches before the limit)
+        """
+        keyword = keyword.lower()
+        matches = self._substring_matches(keyword)
+        tiers = {pos: self._tier(keyword, pos) for pos in matches}
+        matches.sort(key=lambda pos: (_TIERS[tiers[pos]], -self.degrees[pos], self.labels[pos]))
+
+        ranked = [(pos, tiers[pos], 1.0) for pos in matches]
+        short = len(ranked) < limit if limit is not None else not ranked
+        if fuzzy and short:
+            ranked.extend(
+                (pos, MATCH_FUZZY, similarity)
+                for pos, similarity in self._fuzzy_matches(keyword, set(matches))
+            )
+
+        total = len(ranked)
+        if limit is not None and limit > 0:
+            ranked = ranked[:limit]
+
+        results = [
+            {
+                **self.nodes[pos]['data'],
+                'edge_count': int(self.degrees[pos]),
+                'match': tier,
+                'score': round(score, 4)
+            }
+            for pos, tier, score in ranked
+        ]
+        return results, total
@@ -0,0 +1,73 @@
+"""
+Multi-worker launcher for the API server.
+Loads and indexes the processed network once, publishes it as a shared
+snapshot (see shared_snapshot.py), then starts uvicorn with several worker
+processes that each memory-map that snapshot instead of loading their own
+copy, so memory stays flat as workers are added.
+
+    python serve.py --workers 8 --shared-dir /dev/shm/daviz-network
+
+A reload handled by any worker publishes the new version, and the other
+workers attach to it within SHARED_POLL_INTERVAL seconds.
+"""
+
+import argparse
+import logging
+import os
+from typing import List, Optional
+
+from network_format import EDGE_VIEWS
+from shared_snapshot import DEFAULT_FRAGMENT_VIEWS
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# A tmpfs where available, so the snapshot stays off disk and out of the
+# (often bind-mounted) data directory
+DEFAULT_SHARED_DIR = "/dev/shm/daviz-network" if os.path.isdir("/dev/shm") else "data/shared_snapshot"
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Run the API with several workers sharing one network snapshot")
+    parser.add_argument('--host', default='0.0.0.0', help="Bind address")
+    parser.add_argument('--port', type=int, default=8000, help="Bind port")
+    parser.add_argument('--workers', type=int,
+                        default=int(os.environ.get('WEB_CONCURRENCY', 0)) or os.cpu_count() or 1,
+                        help="Worker processes (default: $WEB_CONCURRENCY, else one per CPU)")
+    parser.add_argument('--shared-dir', default=os.environ.get('SHARED_SNAPSHOT_DIR', DEFAULT_SHARED_DIR),
+                        help="Directory for the shared snapshot; a tmpfs such as /dev/shm keeps it "
+                             f"off disk (default: $SHARED_SNAPSHOT_DIR, else {DEFAULT_SHARED_DIR})")
+    parser.add_argument('--fragment-views', nargs='*', choices=list(EDGE_VIEWS), default=list(DEFAULT_FRAGMENT_VIEWS),
+                        help="Edge views to pre-encode for every edge (none: encode on demand per worker)")
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    return args
+
+
+def main(argv: Optional[List[str]] = None):
+    """Publish the shared snapshot, then run uvicorn."""
+    args = parse_args(argv)
+    # Read by main.py in every worker
+    os.environ['SHARED_SNAPSHOT_DIR'] = args.shared_dir
+    os.environ['SHARED_FRAGMENT_VIEWS'] = ','.join(args.fragment_views)
+
+    import uvicorn
+    import main as api
+
+    # Build once here, so workers start by attaching; the snapshot is
+    # dropped again as this process only supervises the workers. Workers
+    # follow the store's current version, so POST /reload on any of them
+    # reaches all of them
+    if api.load_network_data():
+        api.snapshot = api.NetworkSnapshot.empty()
+    else:
+        logger.warning("No network data published; workers will try to load it themselves")
+
+    logger.info(f"Starting {args.workers} workers on {args.host}:{args.port}")
+    uvicorn.run("main:app", host=args.host, port=args.port, workers=args.workers)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,220 @@
+"""
+Network snapshots shared between server processes.
+One process loads the processed data, builds every index and writes the
+network columns, the edge-sized index arrays and pre-encoded edge
+fragments into a directory named after the dataset version. Every worker
+memory-maps that directory read-only instead of loading and indexing the
+data itself, so the pages are held once by the operating system however
+many workers serve them. Putting the directory on a tmpfs (e.g. /dev/shm)
+keeps it off disk.
+
+Only per-node structures (ID lookups, the search index) and caches filled
+on demand (analytics, path graphs, layouts) remain per worker.
+
+The version last loaded by any process is recorded in a marker file. Every
+worker polls it (see DataWatcher), so a reload handled by one worker is
+picked up by the others within a poll interval.
+"""
+
+import json
+import logging
+import os
+import shutil
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional, Sequence
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: no advisory locks; concurrent builders each write their own
+    # temporary directory and the first to finish wins
+    fcntl = None
+
+from network_format import ColumnarNetwork, StringTable, EDGE_VIEWS, dataset_version, write_columnar_network
+from network_snapshot import NetworkSnapshot
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FILE = 'snapshot.json'
+SNAPSHOT_FORMAT = 'daviz-shared-snapshot'
+SNAPSHOT_VERSION = 1
+LOCK_FILE = '.lock'
+CURRENT_FILE = 'CURRENT'
+
+# Edge projections encoded up front; the frontend requests the slim view
+DEFAULT_FRAGMENT_VIEWS = ('slim', 'full')
+# Dataset versions kept after publishing a new one (the previous version
+# stays for workers that have not reloaded yet)
+KEEP_VERSIONS = 2
+
+
+class SharedSnapshotStore:
+    """Versioned snapshot directories under one root, built once and mapped by every process."""
+
+    def __init__(self, root: Path, fragment_views: Sequence[str] = DEFAULT_FRAGMENT_VIEWS):
+        """
+        Args:
+            root: Directory holding one subdirectory per dataset version
+            fragment_views: Edge views (see EDGE_VIEWS) to pre-encode for every edge
+
+        Raises:
+            ValueError: For an unknown view
+        """
+        unknown = [view for view in fragment_views if view not in EDGE_VIEWS]
+        if unknown:
+            raise ValueError(f"Unknown edge views: {', '.join(unknown)} (use {'/'.join(EDGE_VIEWS)})")
+        self.root = Path(root)
+        self.fragment_views = tuple(fragment_views)
+
+    def version_dir(self, version: str) -> Path:
+        return self.root / version
+
+    @contextmanager
+    def _lock(self) -> Iterator[None]:
+        """Exclusive lock across processes while a snapshot is built and published."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        if fcntl is None:
+            yield
+            return
+        with open(self.root / LOCK_FILE, 'w') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def current_version(self) -> Optional[str]:
+        """Dataset version most recently loaded by any process, or None."""
+        try:
+            return (self.root / CURRENT_FILE).read_text(encoding='utf-8').strip() or None
+        except OSError:
+            return None
+
+    def _mark_current(self, version: str) -> None:
+        """Record the version every worker should serve."""
+        if self.current_version() == version:
+            return
+        tmp = self.root / f".{CURRENT_FILE}.{os.getpid()}.tmp"
+        tmp.write_text(version, encoding='utf-8')
+        os.replace(tmp, self.root / CURRENT_FILE)
+
+    def attach(self, data_path: Path, version: str) -> Optional[NetworkSnapshot]:
+        """
+        Map the published snapshot of a dataset version.
+
+        Args:
+            data_path: File or directory the data was loaded from (reported
+                by the snapshot and used to find the similarity table)
+            version: Dataset version (see dataset_version)
+
+        Returns:
+            The snapshot, or None if that version has not been published
+        """
+        directory = self.version_dir(version)
+        try:
+            with open(directory / SNAPSHOT_FILE, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get('format') != SNAPSHOT_FORMAT or meta.get('version') != SNAPSHOT_VERSION:
+            return None
+
+        network = ColumnarNetwork(directory / 'network')
+        arrays = {
+            key: np.load(directory / 'arrays' / f"{key}.npy", mmap_mode='r') for key in meta['arrays']
+        }
+        edge_fragments = {
+            tuple(fields): StringTable(directory / 'fragments', view)
+            for view, fields in meta['fragments'].items()
+        }
+        return NetworkSnapshot(network, Path(data_path), version, arrays, edge_fragments)
+
+    def publish(self, snap: NetworkSnapshot) -> Path:
+        """
+        Write a snapshot's data, index arrays and edge fragments.
+
+        The directory is written under a temporary name and renamed into
+        place, so processes attaching concurrently never see a partial one.
+
+        Returns:
+            The version directory
+        """
+        final = self.version_dir(snap.version)
+        tmp = self.root / f".{snap.version}.{os.getpid()}.tmp"
+        if tmp.exists():
+            shutil.rmtree(tmp)
+        for name in ('network', 'arrays', 'fragments'):
+            (tmp / name).mkdir(parents=True)
+
+        start = time.perf_counter()
+        write_columnar_network(snap.network, tmp / 'network')
+        arrays = snap.shared_arrays()
+        for key, value in arrays.items():
+            np.save(tmp / 'arrays' / f"{key}.npy", np.ascontiguousarray(value))
+        fragments = {}
+        for view in self.fragment_views:
+            fields = EDGE_VIEWS[view]
+            snap.fragments.write_edge_table(fields, tmp / 'fragments', view)
+            fragments[view] = list(fields)
+        with open(tmp / SNAPSHOT_FILE, 'w', encoding='utf-8') as f:
+            json.dump({
+                'format': SNAPSHOT_FORMAT,
+                'version': SNAPSHOT_VERSION,
+                'dataset_version': snap.version,
+                'data_path': str(snap.path),
+                'arrays': sorted(arrays),
+                'fragments': fragments
+            }, f, indent=2)
+
+        try:
+            os.replace(tmp, final)
+        except OSError:
+            # Already published by another process
+            shutil.rmtree(tmp, ignore_errors=True)
+        logger.info(f"Published shared snapshot {snap.version} to {final} in {time.perf_counter() - start:.1f}s")
+        return final
+
+    def prune(self, current: str) -> None:
+        """Remove all but the newest KEEP_VERSIONS versions, and leftover temporary directories."""
+        versions = []
+        for entry in self.root.iterdir():
+            if not entry.is_dir():
+                continue
+            if entry.name.startswith('.'):
+                # Temporary directory of a build that did not finish
+                shutil.rmtree(entry, ignore_errors=True)
+            elif entry.name != current:
+                versions.append(entry)
+        versions.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+        for entry in versions[KEEP_VERSIONS - 1:]:
+            # Processes still mapping these files keep them until they reload
+            shutil.rmtree(entry, ignore_errors=True)
+            logger.info(f"Removed shared snapshot {entry.name}")
+
+    def load(self, data_path: Path, previous: Optional[NetworkSnapshot] = None) -> NetworkSnapshot:
+        """
+        Attach to the snapshot of the data on disk, building and publishing
+        it first if no process has yet, and mark it as the current version.
+
+        Args:
+            data_path: Processed network file or directory
+            previous: Snapshot currently served (see NetworkSnapshot.load)
+        """
+        snap = self.attach(data_path, dataset_version(data_path))
+        if snap is None:
+            with self._lock():
+                # Another process may have published it while we waited
+                snap = self.attach(data_path, dataset_version(data_path))
+                if snap is None:
+                    built = NetworkSnapshot.load(data_path, previous=previous)
+                    self.publish(built)
+                    self.prune(built.version)
+                    # Serve from the shared files, so the private copy just
+                    # built is released
+                    snap = self.attach(data_path, built.version) or built
+        self._mark_current(snap.version)
+        return snap
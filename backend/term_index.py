@@ -0,0 +1,122 @@
+"""
+Inverted index from gene and pathway terms to the edges that carry them.
+Built at load time by transposing the per-edge CSR term lists, so term
+queries are answered by posting-list intersection instead of edge scans.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+QUERY_MODES = ('and', 'or')
+
+
+class TermIndex:
+    """Posting lists (sorted edge positions) per vocabulary term."""
+
+    # Posting arrays, which server processes attached to a shared snapshot
+    # map instead of building
+    SHARED_ARRAYS = ('postings', 'posting_offsets')
+
+    def __init__(
+        self,
+        offsets: np.ndarray,
+        term_ids: np.ndarray,
+        terms: List[str],
+        arrays: Optional[Dict[str, np.ndarray]] = None
+    ):
+        """
+        Build posting lists from CSR term lists.
+
+        Args:
+            offsets: Per-edge offsets into term_ids (num_edges + 1 values)
+            term_ids: Concatenated term ids of all edges
+            terms: Vocabulary, term name per id
+            arrays: Prebuilt SHARED_ARRAYS for these lists (see shared_arrays)
+        """
+        self.terms = terms
+        self.term_ids: Dict[str, int] = {term: term_id for term_id, term in enumerate(terms)}
+        # Case-insensitive fallback; several terms may share a lowercase form
+        self._folded: Dict[str, List[int]] = {}
+        for term_id, term in enumerate(terms):
+            self._folded.setdefault(term.lower(), []).append(term_id)
+
+        if arrays is not None:
+            self.postings = arrays['postings']
+            self.posting_offsets = arrays['posting_offsets']
+            return
+
+        offsets = np.asarray(offsets, dtype=np.int64)
+        term_ids = np.asarray(term_ids, dtype=np.int64)
+        num_edges = len(offsets) - 1
+        edge_of_item = np.repeat(np.arange(num_edges, dtype=np.int64), np.diff(offsets))
+
+        # Sort items by term; the stable sort keeps edges ascending per term
+        order = np.argsort(term_ids, kind='stable')
+        sorted_terms = term_ids[order]
+        sorted_edges = edge_of_item[order]
+        # Drop repeats of a term within one edge
+        keep = np.ones(len(order), dtype=bool)
+        keep[1:] = (sorted_terms[1:] != sorted_terms[:-1]) | (sorted_edges[1:] != sorted_edges[:-1])
+
+        self.postings = sorted_edges[keep]
+        counts = np.bincount(sorted_terms[keep], minlength=len(terms))
+        self.posting_offsets = np.concatenate([np.zeros(1, dtype=np.int64), np.cumsum(counts)])
+
+    def shared_arrays(self) -> Dict[str, np.ndarray]:
+        """The SHARED_ARRAYS, for attaching other processes to this index."""
+        return {name: getattr(self, name) for name in self.SHARED_ARRAYS}
+
+    def resolve(self, term: str) -> List[int]:
+        """Term ids matching a name, exactly or else case-insensitively."""
+        term_id = self.term_ids.get(term)
+        if term_id is not None:
+            return [term_id]
+        return self._folded.get(term.lower(), [])
+
+    def posting(self, term_id: int) -> np.ndarray:
+        """Sorted edge positions carrying a term."""
+        return self.postings[self.posting_offsets[term_id]:self.posting_offsets[term_id + 1]]
+
+    def frequency(self, term_id: int) -> int:
+        """Number of edges carrying a term."""
+        return int(self.posting_offsets[term_id + 1] - self.posting_offsets[term_id])
+
+    def query(self, terms: List[str], mode: str = 'and') -> Optional[np.ndarray]:
+        """
+        Edge positions matching all ('and') or any ('or') of the terms.
+
+        Args:
+            terms: Term names
+            mode: 'and' or 'or'
+
+        Returns:
+            Sorted edge positions, or None if no term is known
+        """
+        postings = []
+        unknown = False
+        for term in terms:
+            ids = self.resolve(term)
+            if not ids:
+                unknown = True
+            elif len(ids) == 1:
+                postings.append(self.posting(ids[0]))
+            else:
+                # Case-insensitive matches of one name count as the same term
+                postings.append(np.unique(np.concatenate([self.posting(i) for i in ids])))
+
+        if not postings:
+            return None
+        if mode == 'and' and unknown:
+            return np.empty(0, dtype=np.int64)
+        if mode == 'or':
+            return np.unique(np.concatenate(postings))
+
+        # Intersect shortest lists first so intermediate results stay small
+        postings.sort(key=len)
+        result = postings[0]
+        for posting in postings[1:]:
+            if not len(result):
+                break
+            result = np.intersect1d(result, posting, assume_unique=True)
+        return result
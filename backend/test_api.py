@@ -34,6 +34,20 @@ def test_stats():
         print(f"Error: {e}\n")
         return False
 
+def test_histogram():
+    """Test weight histogram endpoint."""
+    print("Testing /stats/histogram endpoint...")
+    try:
+        params = {"bins": 20, "scale": "log"}
+        response = requests.get(f"{BASE_URL}/stats/histogram", params=params)
+        print(f"Status: {response.status_code}")
+        data = response.json()
+        print(f"{len(data['counts'])} bins covering {sum(data['counts'])} edges\n")
+        return response.status_code == 200
+    except Exception as e:
+        print(f"Error: {e}\n")
+        return False
+
 def test_network_filtered():
     """Test network endpoint with filters."""
     print("Testing /network endpoint with filters...")
@@ -52,6 +66,102 @@ def test_network_filtered():
         print(f"Error: {e}\n")
         return False
 
+def test_network_pagination():
+    """Test cursor pagination on the network endpoint."""
+    print("Testing /network cursor pagination...")
+    try:
+        params = {"min_weight": 30000, "limit": 3, "view": "slim"}
+        first = requests.get(f"{BASE_URL}/network", params=params).json()
+        cursor = first["metadata"]["next_cursor"]
+        response = requests.get(f"{BASE_URL}/network", params={**params, "cursor": cursor})
+        print(f"Status: {response.status_code}")
+        second = response.json()
+        first_ids = {edge["data"]["id"] for edge in first["edges"]}
+        overlap = first_ids & {edge["data"]["id"] for edge in second["edges"]}
+        print(f"Page sizes: {len(first['edges'])}, {len(second['edges'])}; overlap: {len(overlap)}\n")
+        return response.status_code == 200 and not overlap
+    except Exception as e:
+        print(f"Error: {e}\n")
+        return False
+
+def test_network_layout():
+    """Test server-side layout endpoint."""
+    print("Testing /network/layout endpoint...")
+    try:
+        params = {"algorithm": "force", "min_weight": 30000, "limit": 20}
+        network = requests.get(f"{BASE_URL}/network", params={**params, "view": "slim"}).json()
+        response = requests.get(f"{BASE_URL}/network/layout", params=params)
+        print(f"Status: {response.status_code}")
+        data = response.json()
+        node_ids = {node["data"]["id"] for node in network["nodes"]}
+        print(f"Positioned {len(data['positions'])} nodes in {data['metadata']['iterations']} iterations\n")
+        return response.status_code == 200 and set(data["positions"]) == node_ids
+    except Exception as e:
+        print(f"Error: {e}\n")
+        return False
+
+def test_coarse_network():
+    """Test level-of-detail endpoint."""
+    print("Testing /network/coarse endpoint...")
+    try:
+        response = requests.get(f"{BASE_URL}/network/coarse", params={"grouping": "community", "level": 0})
+        print(f"Status: {response.status_code}")
+        data = response.json()
+        print(f"Level 0 of {data['metadata']['levels']}: {len(data['nodes'])} supernodes, {len(data['edges'])} edges")
+        largest = data["nodes"][0]["data"]
+        expanded = requests.get(
+            f"{BASE_URL}/network/coarse", params={"grouping": "community", "level": 0, "expand": largest["id"]}
+        ).json()
+        print(f"Expanding {largest['id']} ({largest['size']} diseases): {len(expanded['nodes'])} supernodes\n")
+        return (
+            response.status_code == 200
+            and sum(node["data"]["size"] for node in data["nodes"]) == sum(node["data"]["size"] for node in expanded["nodes"])
+            and len(expanded["nodes"]) > len(data["nodes"])
+        )
+    except Exception as e:
+        print(f"Error: {e}\n")
+        return False
+
+def test_analytics():
+    """Test centrality and neighborhood endpoints."""
+    print("Testing /analytics endpoints...")
+    try:
+        response = requests.get(f"{BASE_URL}/analytics/centrality", params={"metric": "pagerank", "limit": 5})
+        print(f"Status: {response.status_code}")
+        hubs = response.json()["nodes"]
+        print(f"Top hub: {hubs[0]['label']} (PageRank {hubs[0]['pagerank']:.4f})")
+        neighborhood = requests.get(f"{BASE_URL}/analytics/neighborhood/{hubs[0]['id']}", params={"k": 2}).json()
+        print(f"2-hop neighborhood: {len(neighborhood['nodes'])} nodes, {len(neighborhood['edges'])} edges\n")
+        return response.status_code == 200 and len(hubs) == 5
+    except Exception as e:
+        print(f"Error: {e}\n")
+        return False
+
+def test_paths():
+    """Test path query endpoint."""
+    print("Testing /path endpoint...")
+    try:
+        params = {"from": "Bipolar_disorder--None", "to": "Asthma--None", "k": 3}
+        response = requests.get(f"{BASE_URL}/path", params=params)
+        print(f"Status: {response.status_code}")
+        paths = response.json()["paths"]
+        for path in paths:
+            print(f"{' -> '.join(path['labels'])} (cost {path['cost']:.3f})")
+        print()
+        costs = [path["cost"] for path in paths]
+        # A disease to itself is one zero-cost path, however often it is asked
+        # (repeated queries switch to a memoized shortest-path tree)
+        same = {"from": "Asthma--None", "to": "Asthma--None", "k": 3}
+        self_paths = [requests.get(f"{BASE_URL}/path", params={**same, "budget_ms": 1000 + i}).json()["paths"] for i in range(5)]
+        print(f"Asthma to itself: {[len(p) for p in self_paths]} path(s)\n")
+        return (
+            response.status_code == 200 and costs == sorted(costs)
+            and all(len(p) == 1 and p[0]["cost"] == 0 for p in self_paths)
+        )
+    except Exception as e:
+        print(f"Error: {e}\n")
+        return False
+
 def test_search():
     """Test search endpoint."""
     print("Testing /search endpoint...")
@@ -84,6 +194,81 @@ def test_disease_detail():
         print(f"Error: {e}\n")
         return False
 
+def test_subgraph():
+    """Test ego-network subgraph endpoint."""
+    print("Testing /subgraph endpoint...")
+    try:
+        params = {"seeds": "Bipolar_disorder--None,Asthma--None", "hops": 2, "max_nodes": 30}
+        response = requests.get(f"{BASE_URL}/subgraph", params=params)
+        print(f"Status: {response.status_code}")
+        data = response.json()
+        print(f"Subgraph: {data['metadata']['total_nodes']} nodes, {data['metadata']['total_edges']} edges")
+        print(f"Truncated by node budget: {data['metadata']['truncated']}\n")
+        node_ids = {node["data"]["id"] for node in data["nodes"]}
+        return (
+            response.status_code == 200
+            and len(node_ids) <= 30
+            and {"Bipolar_disorder--None", "Asthma--None"} <= node_ids
+            and all(edge["data"]["source"] in node_ids and edge["data"]["target"] in node_ids for edge in data["edges"])
+        )
+    except Exception as e:
+        print(f"Error: {e}\n")
+        return False
+
+def test_similar_diseases():
+    """Test similar disease endpoint."""
+    print("Testing /disease/{id}/similar endpoint...")
+    try:
+        disease_id = "Bipolar_disorder--None"
+        response = requests.get(f"{BASE_URL}/disease/{disease_id}/similar", params={"limit": 5})
+        print(f"Status: {response.status_code}")
+        results = response.json()["results"]
+        for result in results:
+            print(f"{result['label']}: {result['score']:.3f} ({result['shared_terms']} shared terms)")
+        print()
+        scores = [result["score"] for result in results]
+        return response.status_code == 200 and scores == sorted(scores, reverse=True)
+    except Exception as e:
+        print(f"Error: {e}\n")
+        return False
+
+def test_batch():
+    """Test batch lookup endpoint."""
+    print("Testing /batch endpoint...")
+    try:
+        edge_id = requests.get(f"{BASE_URL}/network", params={"limit": 1}).json()["edges"][0]["data"]["id"]
+        body = {"edges": [edge_id, "missing__edge"], "diseases": ["Bipolar_disorder--None", "Missing--None"]}
+        response = requests.post(f"{BASE_URL}/batch", json=body)
+        print(f"Status: {response.status_code}")
+        data = response.json()
+        print(f"Found {data['metadata']['found_edges']} edges, {data['metadata']['found_diseases']} diseases")
+        print(f"Errors: {data['errors']}\n")
+        return (
+            response.status_code == 200
+            and edge_id in data["edges"]
+            and "Bipolar_disorder--None" in data["diseases"]
+            and "missing__edge" in data["errors"]["edges"]
+            and "Missing--None" in data["errors"]["diseases"]
+        )
+    except Exception as e:
+        print(f"Error: {e}\n")
+        return False
+
+def test_metrics():
+    """Test Prometheus metrics endpoint."""
+    print("Testing /metrics endpoint...")
+    try:
+        response = requests.get(f"{BASE_URL}/metrics")
+        print(f"Status: {response.status_code}")
+        requests_seen = [
+            line for line in response.text.splitlines() if line.startswith("http_requests_total{")
+        ]
+        print(f"{len(requests_seen)} request counters, e.g. {requests_seen[:2]}\n")
+        return response.status_code == 200 and len(requests_seen) > 0
+    except Exception as e:
+        print(f"Error: {e}\n")
+        return False
+
 def main():
     """Run all tests."""
     print("=" * 60)
@@ -94,9 +279,19 @@ def main():
     tests = [
         ("Health Check", test_health),
         ("Statistics", test_stats),
+        ("Weight Histogram", test_histogram),
         ("Network with Filters", test_network_filtered),
+        ("Network Pagination", test_network_pagination),
+        ("Network Layout", test_network_layout),
+        ("Coarse Network", test_coarse_network),
+        ("Analytics", test_analytics),
+        ("Paths", test_paths),
         ("Search", test_search),
-        ("Disease Detail", test_disease_detail)
+        ("Disease Detail", test_disease_detail),
+        ("Subgraph", test_subgraph),
+        ("Similar Diseases", test_similar_diseases),
+        ("Batch Lookups", test_batch),
+        ("Metrics", test_metrics)
     ]
     
     results = []
@@ -1,4 +1,4 @@
-import { useState, useEffect, useRef } from 'react'
+import { useState, useEffect, useRef, useMemo } from 'react'
 import NetworkVisualization from './components/NetworkVisualization'
 import DetailPanel from './components/DetailPanel'
 import FilterPanel from './components/FilterPanel'
@@ -89,6 +89,13 @@ function App() {
     applyFilters()
   }, [filters.minWeight, filters.interpretability, filters.limit])
 
+  // Memoized so the layout effect only refetches when a filter changes
+  const layoutParams = useMemo(() => ({
+    min_weight: filters.minWeight,
+    limit: filters.limit,
+    ...(filters.interpretability !== 'all' && { interpretability: filters.interpretability })
+  }), [filters.minWeight, filters.interpretability, filters.limit])
+
   const handleElementSelect = (element) => {
     setSelectedElement(element)
   }
@@ -221,6 +228,7 @@ function App() {
         <div className="main-content">
           <NetworkVisualization
             data={filteredData}
+            layoutParams={layoutParams}
             loading={loading}
             onElementSelect={handleElementSelect}
             focusNodeId={focusNodeId}
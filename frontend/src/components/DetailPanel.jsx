@@ -25,7 +25,17 @@ const DetailPanel = ({ element }) => {
 
   useEffect(() => {
     if (element?.type === 'edge') {
-      setEdgeDetails(element)
+      if (element.sharedGenes === undefined) {
+        // Slim network data: fetch genes, pathways and reason for this edge.
+        // Selecting another element aborts the request, so a slow response
+        // never overwrites the details of the current selection
+        const controller = new AbortController()
+        setEdgeDetails(null)
+        fetchEdgeDetails(element, controller.signal)
+        return () => controller.abort()
+      } else {
+        setEdgeDetails(element)
+      }
     } else {
       setEdgeDetails(null)
     }
@@ -35,21 +45,25 @@ const DetailPanel = ({ element }) => {
     setVisibleConnections(INITIAL_CONNECTIONS)
   }, [element?.id, element?.type])
 
-  const fetchEdgeDetails = async (edgeId) => {
+  const fetchEdgeDetails = async (edge, signal) => {
     try {
       setLoading(true)
-      const response = await getEdgeDetails(edgeId)
+      const response = await getEdgeDetails(edge.id, { signal })
       const edgeData = response.edge.data
       setEdgeDetails({
-        ...element,
+        ...edge,
         sharedGenes: edgeData.shared_genes || [],
         sharedPathways: edgeData.filtered_pathways || [],
         reason: edgeData.reason_gpt4o || ''
       })
     } catch (err) {
-      console.error('Failed to fetch edge details:', err)
+      if (!signal.aborted) {
+        console.error('Failed to fetch edge details:', err)
+      }
     } finally {
-      setLoading(false)
+      if (!signal.aborted) {
+        setLoading(false)
+      }
     }
   }
 
@@ -1,7 +1,14 @@
 import { useEffect, useRef, useState } from 'react'
 import cytoscape from 'cytoscape'
+import { getNetworkLayout } from '../services/api'
 import './NetworkVisualization.css'
 
+// Layouts computed by the backend and applied as Cytoscape 'preset' positions
+const SERVER_LAYOUTS = {
+  'server-force': 'force',
+  'server-spectral': 'spectral'
+}
+
 const getCyStyle = (isDarkMode) => {
   const colors = {
     success: isDarkMode ? '#56c271' : '#3da65a',
@@ -120,10 +127,10 @@ const getCyStyle = (isDarkMode) => {
   ]
 }
 
-const NetworkVisualization = ({ data, loading, onElementSelect, focusNodeId }) => {
+const NetworkVisualization = ({ data, layoutParams, loading, onElementSelect, focusNodeId }) => {
   const containerRef = useRef(null)
   const cyRef = useRef(null)
-  const [layoutName, setLayoutName] = useState('circle')
+  const [layoutName, setLayoutName] = useState('server-force')
   const [isDarkMode, setIsDarkMode] = useState(
     window.matchMedia && window.matchMedia('(prefers-color-scheme: dark)').matches
   )
@@ -163,7 +170,7 @@ const NetworkVisualization = ({ data, loading, onElementSelect, focusNodeId }) =
       elements: data,
       style: getCyStyle(isDarkMode),
       layout: {
-        name: layoutName,
+        name: SERVER_LAYOUTS[layoutName] ? 'preset' : layoutName,
         idealEdgeLength: 250,
         nodeRepulsion: 12000,
         edgeElasticity: 0.25,
@@ -247,9 +254,10 @@ const NetworkVisualization = ({ data, loading, onElementSelect, focusNodeId }) =
         targetId: edge.target().id(),
         weight: edge.data('weight'),
         interpretable: edge.data('interpretable'),
-        sharedGenes: edge.data('shared_genes') || [],
-        sharedPathways: edge.data('filtered_pathways') || [],
-        reason: edge.data('reason_gpt4o') || ''
+        // Absent in slim network data; DetailPanel loads them on demand
+        sharedGenes: edge.data('shared_genes'),
+        sharedPathways: edge.data('filtered_pathways'),
+        reason: edge.data('reason_gpt4o')
       })
     }
 
@@ -283,24 +291,46 @@ const NetworkVisualization = ({ data, loading, onElementSelect, focusNodeId }) =
     
     cy.add(data)
     
-    const layoutOptions = {
-      name: layoutName,
-      animate: 'end',
-      animationDuration: 500,
-      fit: true,
-      padding: 50,
-      randomize: false
+    let cancelled = false
+
+    const runLayout = (layoutOptions) => {
+      const layout = cy.layout({
+        animate: 'end',
+        animationDuration: 500,
+        fit: true,
+        padding: 50,
+        randomize: false,
+        ...layoutOptions
+      })
+      layout.run()
+      
+      layout.one('layoutstop', () => {
+        setTimeout(() => {
+          cy.fit(null, 50)
+        }, 100)
+      })
     }
-    
-    const layout = cy.layout(layoutOptions)
-    layout.run()
-    
-    layout.one('layoutstop', () => {
-      setTimeout(() => {
-        cy.fit(null, 50)
-      }, 100)
-    })
-  }, [data, layoutName])
+
+    const algorithm = SERVER_LAYOUTS[layoutName]
+    if (algorithm) {
+      // Positions are computed (and cached) by the backend for the same filters
+      getNetworkLayout(algorithm, layoutParams)
+        .then(({ positions }) => {
+          if (cancelled) return
+          runLayout({ name: 'preset', positions: (node) => positions[node.id()] })
+        })
+        .catch((err) => {
+          console.error('Failed to fetch layout:', err)
+          if (!cancelled) runLayout({ name: 'circle' })
+        })
+    } else {
+      runLayout({ name: layoutName })
+    }
+
+    return () => {
+      cancelled = true
+    }
+  }, [data, layoutName, layoutParams])
 
   useEffect(() => {
     if (!cyRef.current || !focusNodeId) return
@@ -394,6 +424,8 @@ const NetworkVisualization = ({ data, loading, onElementSelect, focusNodeId }) =
             onChange={(e) => handleLayoutChange(e.target.value)}
             disabled={loading || !data}
           >
+            <option value="server-force">Force-directed</option>
+            <option value="server-spectral">Spectral</option>
             <option value="circle">Circle</option>
             <option value="grid">Grid</option>
             <option value="random">Random</option>
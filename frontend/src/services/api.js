@@ -28,6 +28,9 @@ api.interceptors.response.use(
     return response.data
   },
   error => {
+    if (axios.isCancel(error)) {
+      return Promise.reject(error)
+    }
     console.error('API Response Error:', error.response?.data || error.message)
     const message = error.response?.data?.detail || error.message || 'Request failed'
     return Promise.reject(new Error(message))
@@ -40,10 +43,36 @@ api.interceptors.response.use(
  * @param {number} params.min_weight - Minimum weight threshold
  * @param {string} params.interpretability - Interpretability filter ('YES' or 'NO')
  * @param {number} params.limit - Maximum edge count
+ * @param {string} params.view - Edge fields ('slim' by default; details come from getEdgeDetails)
  * @returns {Promise<Object>} Network data (Cytoscape format)
  */
 export const getNetworkData = async (params = {}) => {
-  return api.get('/network', { params })
+  return api.get('/network', { params: { view: 'slim', ...params } })
+}
+
+/**
+ * Get server-computed node positions for a filtered network
+ * @param {string} algorithm - Layout algorithm ('force' or 'spectral')
+ * @param {Object} params - Same filters as getNetworkData (min_weight, interpretability, limit)
+ * @returns {Promise<Object>} Map of node ID to {x, y} (`positions`) and metadata
+ */
+export const getNetworkLayout = async (algorithm, params = {}) => {
+  return api.get('/network/layout', { params: { ...params, algorithm } })
+}
+
+/**
+ * Get the network collapsed into supernodes (level of detail)
+ * @param {Object} params - Query parameters
+ * @param {string} params.grouping - 'community' (Louvain levels) or 'disease' (name before '--')
+ * @param {number} params.level - Zoom level, 0 being the coarsest (default: finest with at most 50 supernodes)
+ * @param {string[]} params.expand - Supernode IDs to show as their members at a finer level
+ * @param {number} params.max_nodes - Maximum supernode count
+ * @returns {Promise<Object>} Supernodes and aggregated edges (Cytoscape format)
+ */
+export const getCoarseNetwork = async ({ expand = [], ...params } = {}) => {
+  return api.get('/network/coarse', {
+    params: { ...params, ...(expand.length ? { expand: expand.join(',') } : {}) }
+  })
 }
 
 /**
@@ -58,10 +87,47 @@ export const getDiseaseEdges = async (diseaseId) => {
 /**
  * Get detailed information for a specific edge
  * @param {string} edgeId - Edge ID
+ * @param {Object} options - Request options
+ * @param {AbortSignal} options.signal - Aborts the request (e.g. when the selection changes)
  * @returns {Promise<Object>} Edge details
  */
-export const getEdgeDetails = async (edgeId) => {
-  return api.get(`/edge/${edgeId}`)
+export const getEdgeDetails = async (edgeId, { signal } = {}) => {
+  return api.get(`/edge/${edgeId}`, { signal })
+}
+
+/**
+ * Get details of many edges and diseases in one request
+ * @param {Object} ids - IDs to look up
+ * @param {string[]} ids.edges - Edge IDs
+ * @param {string[]} ids.diseases - Disease IDs
+ * @param {boolean} includeEdges - Include each disease's edge list
+ * @returns {Promise<Object>} Details keyed by ID (`edges`, `diseases`) and per-ID `errors`
+ */
+export const getBatchDetails = async ({ edges = [], diseases = [] }, includeEdges = true) => {
+  return api.post('/batch', { edges, diseases, include_edges: includeEdges })
+}
+
+/**
+ * Get disease pairs sharing genes
+ * @param {string[]} symbols - Gene symbols
+ * @param {Object} params - Query parameters (mode, min_weight, limit)
+ * @returns {Promise<Object>} Matching nodes and edges
+ */
+export const getGeneEdges = async (symbols, params = {}) => {
+  return api.get(`/gene/${encodeURIComponent(symbols.join(','))}`, { params })
+}
+
+/**
+ * Get disease pairs sharing pathway terms
+ * @param {string[]} terms - Pathway terms
+ * @param {Object} params - Query parameters (mode, min_weight, limit)
+ * @returns {Promise<Object>} Matching nodes and edges
+ */
+export const getPathwayEdges = async (terms, params = {}) => {
+  return api.get('/pathway', {
+    params: { ...params, term: terms },
+    paramsSerializer: { indexes: null }
+  })
 }
 
 /**
@@ -71,10 +137,11 @@ export const getEdgeDetails = async (edgeId) => {
  * @returns {Promise<Array>} List of matching diseases
  */
 export const searchDiseases = async (keyword, limit = 10) => {
+  // Ranked and truncated server-side, so only `limit` results are sent
   const response = await api.get('/search', { 
-    params: { keyword } 
+    params: { keyword, limit } 
   })
-  return response.results.slice(0, limit)
+  return response.results
 }
 
 /**
@@ -85,6 +152,16 @@ export const getStatistics = async () => {
   return api.get('/stats')
 }
 
+/**
+ * Get weight distribution histogram
+ * @param {number} bins - Number of bins
+ * @param {string} scale - Bin spacing ('linear' or 'log')
+ * @returns {Promise<Object>} Bin edges and counts
+ */
+export const getWeightHistogram = async (bins = 50, scale = 'linear') => {
+  return api.get('/stats/histogram', { params: { bins, scale } })
+}
+
 /**
  * Health check
  * @returns {Promise<Object>} Health status